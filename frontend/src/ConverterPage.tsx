@@ -64,7 +64,12 @@ import HoverPopover from 'material-ui-popup-state/HoverPopover';
 import PopupState, { bindHover, bindPopover, bindTrigger } from 'material-ui-popup-state';
 import { stat } from '@tauri-apps/plugin-fs';
 import { client } from './client';
-import { ConflictPolicy, ConversionMode, ConversionRequest, MoveFileRequest } from './libresvip_tauri_pb';
+import { ConflictPolicy, ConversionMode, ConversionRequest, MoveFileRequest, MoveFileResponse, MoveFilesEntry, MoveFilesRequest } from './libresvip_tauri_pb';
+
+// finished groups are moved in chunks while the conversion goes on, so
+// none waits in staging long enough for the server to evict it
+const MOVE_FILES_CHUNK_SIZE = 16;
+const MOVE_FILES_CHUNK_DELAY_MS = 2000;
 
 export const ConverterPage = () => {
   const { t } = useTranslation();
@@ -131,96 +136,124 @@ export const ConverterPage = () => {
     }
   )(i18n.language)]);
 
-  const moveFile = async (request: MoveFileRequest) => {
-    for await (const res of client.moveFile(request)) {
-      if (res.completed){
-        let taskUpdated = {
-          success: res.success,
-          outputPath: res.outputPath,
-          error: res.errorMessage,
-        };
-        updateConversionTask(res.groupId, taskUpdated);
-        if (taskUpdated.outputPath !== null && revealFileOnFinish) {
-          revealItemInDir(taskUpdated.outputPath);
-        }
+  const handleMoveResult = async (res: MoveFileResponse) => {
+    if (res.completed){
+      let taskUpdated = {
+        success: res.success,
+        outputPath: res.outputPath,
+        error: res.errorMessage,
+      };
+      updateConversionTask(res.groupId, taskUpdated);
+      if (taskUpdated.outputPath !== null && revealFileOnFinish) {
+        revealItemInDir(taskUpdated.outputPath);
+      }
+      increaseFinishedCount();
+    } else {
+      if (
+        res.conflictPolicy === ConflictPolicy.SKIP
+      ) {
+        updateConversionTask(res.groupId, {
+          success: true,
+          warning: t("converter.skip_file"),
+        });
         increaseFinishedCount();
       } else {
-        if (
-          request.conflictPolicy === ConflictPolicy.SKIP
-        ) {
-          updateConversionTask(res.groupId, {
-            success: true,
-            warning: t("converter.skip_file"),
-          });
-          increaseFinishedCount();
-        } else {
-          let shouldOverwrite = await ask(
-            t("converter.overwrite_file", {
-              "file": res.outputPath,
-            }),
-            {
-              kind: "warning",
-              title: "LibreSVIP",
-              okLabel: t("window.ok"),
-              cancelLabel: t("window.cancel"),
-            }
-          );
-          if (shouldOverwrite) {
-            let task = conversionTasks.find((t) => t.id === res.groupId);
-            if (task) {
-              await moveFile({
-                groupId: res.groupId,
-                forceOverwrite: true,
-                outputDir: outputDirectory,
-                stem: task.outputStem,
-                outputFormat: outputFormat ?? "",
-                conflictPolicy: {
-                  "rename": ConflictPolicy.RENAME,
-                  "overwrite": ConflictPolicy.OVERWRITE,
-                  "prompt": ConflictPolicy.PROMPT,
-                  "skip": ConflictPolicy.SKIP,
-                  }[conflictPolicy],
-                "$typeName": "LibreSVIP.MoveFileRequest",
-              })
-            } else {
-              updateConversionTask(res.groupId, {
-                success: true,
-                warning: t("converter.skip_file"),
-              });
-              increaseFinishedCount();
-            }
+        let shouldOverwrite = await ask(
+          t("converter.overwrite_file", {
+            "file": res.outputPath,
+          }),
+          {
+            kind: "warning",
+            title: "LibreSVIP",
+            okLabel: t("window.ok"),
+            cancelLabel: t("window.cancel"),
+          }
+        );
+        if (shouldOverwrite) {
+          let task = conversionTasks.find((t) => t.id === res.groupId);
+          if (task) {
+            await moveFile({
+              groupId: res.groupId,
+              forceOverwrite: true,
+              outputDir: outputDirectory,
+              stem: task.outputStem,
+              outputFormat: outputFormat ?? "",
+              conflictPolicy: {
+                "rename": ConflictPolicy.RENAME,
+                "overwrite": ConflictPolicy.OVERWRITE,
+                "prompt": ConflictPolicy.PROMPT,
+                "skip": ConflictPolicy.SKIP,
+                }[conflictPolicy],
+              "$typeName": "LibreSVIP.MoveFileRequest",
+            })
+          } else {
+            updateConversionTask(res.groupId, {
+              success: true,
+              warning: t("converter.skip_file"),
+            });
+            increaseFinishedCount();
           }
         }
       }
     }
   }
 
+  const moveFile = async (request: MoveFileRequest) => {
+    for await (const res of client.moveFile(request)) {
+      await handleMoveResult(res);
+    }
+  }
+
+  const moveFiles = async (request: MoveFilesRequest) => {
+    for await (const res of client.moveFiles(request)) {
+      await handleMoveResult(res);
+    }
+  }
+
   const startConversion = async (request: ConversionRequest) => {
+    let entries: MoveFilesEntry[] = [];
+    let firstEntryTime = 0;
+    const flushEntries = async () => {
+      if (entries.length === 0) {
+        return;
+      }
+      const chunk = entries;
+      entries = [];
+      await moveFiles({
+        entries: chunk,
+        forceOverwrite: false,
+        outputDir: outputDirectory,
+        conflictPolicy: {
+          "rename": ConflictPolicy.RENAME,
+          "overwrite": ConflictPolicy.OVERWRITE,
+          "prompt": ConflictPolicy.PROMPT,
+          "skip": ConflictPolicy.SKIP,
+        }[conflictPolicy],
+        "$typeName": "LibreSVIP.MoveFilesRequest",
+      });
+    }
     for await (const res of client.convert(request)) {
       let taskUpdated = {
         running: res.running,
         success: res.completed,
         error: res.errorMessage,
-        warning: res.warningMessages.join("\n"),
+        warning: res.skipped ? t("converter.skip_file") : res.warningMessages.join("\n"),
       }
       updateConversionTask(res.groupId, taskUpdated);
       if (!taskUpdated.running) {
         let task = conversionTasks.find((t) => t.id === res.groupId);
         if (task) {
           if (task.success !== false) {
-            await moveFile({
+            if (entries.length === 0) {
+              firstEntryTime = Date.now();
+            }
+            entries.push({
               groupId: task.id,
-              forceOverwrite: false,
-              outputDir: outputDirectory,
               stem: task.outputStem,
               outputFormat: outputFormat ?? "",
-              conflictPolicy: {
-                "rename": ConflictPolicy.RENAME,
-                "overwrite": ConflictPolicy.OVERWRITE,
-                "prompt": ConflictPolicy.PROMPT,
-                "skip": ConflictPolicy.SKIP,
-              }[conflictPolicy],
-              "$typeName": "LibreSVIP.MoveFileRequest",
+              targetId: "",
+              parts: [],
+              "$typeName": "LibreSVIP.MoveFilesEntry",
             });
           } else {
             showMessage(
@@ -231,7 +264,16 @@ export const ConverterPage = () => {
           }
         }
       }
+      // progress events keep arriving while groups convert, so a chunk
+      // never waits much longer than its delay
+      if (
+        entries.length >= MOVE_FILES_CHUNK_SIZE ||
+        (entries.length > 0 && Date.now() - firstEntryTime >= MOVE_FILES_CHUNK_DELAY_MS)
+      ) {
+        await flushEntries();
+      }
     }
+    await flushEntries();
   }
 
   function CustomFieldTemplate(props: FieldTemplateProps) {
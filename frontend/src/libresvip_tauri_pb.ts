@@ -10,7 +10,7 @@ import type { Message } from "@bufbuild/protobuf";
  * Describes the file libresvip_tauri.proto.
  */
 export const file_libresvip_tauri: GenFile = /*@__PURE__*/
-  fileDesc("ChVsaWJyZXN2aXBfdGF1cmkucHJvdG8SCUxpYnJlU1ZJUCKpAQoRTHlyaWNzUmVwbGFjZW1lbnQSKgoEbW9kZRgBIAEoDjIcLkxpYnJlU1ZJUC5MeXJpY3NSZXBsYWNlTW9kZRITCgtyZXBsYWNlbWVudBgCIAEoCRIUCgxwYXR0ZXJuX21haW4YAyABKAkSFgoOcGF0dGVybl9wcmVmaXgYBCABKAkSFgoOcGF0dGVybl9zdWZmaXgYBSABKAkSDQoFZmxhZ3MYBiABKAUiWgoWTHlyaWNzUmVwbGFjZW1lbnRHcm91cBITCgtwcmVzZXRfbmFtZRgBIAEoCRIrCgVydWxlcxgCIAMoCzIcLkxpYnJlU1ZJUC5MeXJpY3NSZXBsYWNlbWVudCL6AQoKUGx1Z2luSW5mbxISCgppZGVudGlmaWVyGAEgASgJEgwKBG5hbWUYAiABKAkSDwoHdmVyc2lvbhgDIAEoCRITCgtkZXNjcmlwdGlvbhgEIAEoCRIOCgZhdXRob3IYBSABKAkSDwoHd2Vic2l0ZRgGIAEoCRITCgtqc29uX3NjaGVtYRgHIAEoCRITCgtmaWxlX2Zvcm1hdBgIIAEoCRIQCghzdWZmaXhlcxgJIAMoCRITCgtpY29uX2Jhc2U2NBgKIAEoCRIWCg51aV9qc29uX3NjaGVtYRgLIAEoCRIaChJkZWZhdWx0X2pzb25fdmFsdWUYDCABKAkiUwoSUGx1Z2luSW5mb3NSZXF1ZXN0EisKCGNhdGVnb3J5GAEgASgOMhkuTGlicmVTVklQLlBsdWdpbkNhdGVnb3J5EhAKCGxhbmd1YWdlGAIgASgJIjwKE1BsdWdpbkluZm9zUmVzcG9uc2USJQoGdmFsdWVzGAEgAygLMhUuTGlicmVTVklQLlBsdWdpbkluZm8iNwoPQ29udmVyc2lvbkdyb3VwEhAKCGdyb3VwX2lkGAEgASgJEhIKCmZpbGVfcGF0aHMYAiADKAkiugMKEUNvbnZlcnNpb25SZXF1ZXN0EhQKDGlucHV0X2Zvcm1hdBgBIAEoCRIVCg1vdXRwdXRfZm9ybWF0GAIgASgJEicKBG1vZGUYAyABKA4yGS5MaWJyZVNWSVAuQ29udmVyc2lvbk1vZGUSFwoPbWF4X3RyYWNrX2NvdW50GAQgASgFEioKBmdyb3VwcxgFIAMoCzIaLkxpYnJlU1ZJUC5Db252ZXJzaW9uR3JvdXASFQoNaW5wdXRfb3B0aW9ucxgGIAEoCRIWCg5vdXRwdXRfb3B0aW9ucxgHIAEoCRJPChJtaWRkbGV3YXJlX29wdGlvbnMYCCADKAsyMy5MaWJyZVNWSVAuQ29udmVyc2lvblJlcXVlc3QuTWlkZGxld2FyZU9wdGlvbnNFbnRyeRIQCghsYW5ndWFnZRgJIAEoCRI+ChNseXJpY19yZXBsYWNlX3J1bGVzGAogAygLMiEuTGlicmVTVklQLkx5cmljc1JlcGxhY2VtZW50R3JvdXAaOAoWTWlkZGxld2FyZU9wdGlvbnNFbnRyeRILCgNrZXkYASABKAkSDQoFdmFsdWUYAiABKAk6AjgBIn8KFlNpbmdsZUNvbnZlcnNpb25SZXN1bHQSEAoIZ3JvdXBfaWQYASABKAkSDwoHcnVubmluZxgCIAEoCBIRCgljb21wbGV0ZWQYAyABKAgSFQoNZXJyb3JfbWVzc2FnZRgEIAEoCRIYChB3YXJuaW5nX21lc3NhZ2VzGAUgAygJIhAKDlZlcnNpb25SZXF1ZXN0IiIKD1ZlcnNpb25SZXNwb25zZRIPCgd2ZXJzaW9uGAEgASgJIqkBCg9Nb3ZlRmlsZVJlcXVlc3QSEAoIZ3JvdXBfaWQYASABKAkSEgoKb3V0cHV0X2RpchgCIAEoCRIMCgRzdGVtGAMgASgJEhUKDW91dHB1dF9mb3JtYXQYBCABKAkSMgoPY29uZmxpY3RfcG9saWN5GAUgASgOMhkuTGlicmVTVklQLkNvbmZsaWN0UG9saWN5EhcKD2ZvcmNlX292ZXJ3cml0ZRgGIAEoCCKoAQoQTW92ZUZpbGVSZXNwb25zZRIQCghncm91cF9pZBgBIAEoCRITCgtvdXRwdXRfcGF0aBgCIAEoCRIyCg9jb25mbGljdF9wb2xpY3kYAyABKA4yGS5MaWJyZVNWSVAuQ29uZmxpY3RQb2xpY3kSEQoJY29tcGxldGVkGAQgASgIEg8KB3N1Y2Nlc3MYBSABKAgSFQoNZXJyb3JfbWVzc2FnZRgGIAEoCSo3Cg5QbHVnaW5DYXRlZ29yeRIJCgVJTlBVVBAAEgoKBk9VVFBVVBABEg4KCk1JRERMRVdBUkUQAioyCg5Db252ZXJzaW9uTW9kZRIKCgZESVJFQ1QQABIJCgVTUExJVBABEgkKBU1FUkdFEAIqQQoOQ29uZmxpY3RQb2xpY3kSCAoEU0tJUBAAEgoKBlBST01QVBABEg0KCU9WRVJXUklURRACEgoKBlJFTkFNRRADKkwKEUx5cmljc1JlcGxhY2VNb2RlEggKBEZVTEwQABIOCgpBTFBIQUJFVElDEAESEgoOTk9OX0FMUEhBQkVUSUMQAhIJCgVSRUdFWBADMrECCgpDb252ZXJzaW9uEkwKC1BsdWdpbkluZm9zEh0uTGlicmVTVklQLlBsdWdpbkluZm9zUmVxdWVzdBoeLkxpYnJlU1ZJUC5QbHVnaW5JbmZvc1Jlc3BvbnNlEkwKB0NvbnZlcnQSHC5MaWJyZVNWSVAuQ29udmVyc2lvblJlcXVlc3QaIS5MaWJyZVNWSVAuU2luZ2xlQ29udmVyc2lvblJlc3VsdDABEkAKB1ZlcnNpb24SGS5MaWJyZVNWSVAuVmVyc2lvblJlcXVlc3QaGi5MaWJyZVNWSVAuVmVyc2lvblJlc3BvbnNlEkUKCE1vdmVGaWxlEhouTGlicmVTVklQLk1vdmVGaWxlUmVxdWVzdBobLkxpYnJlU1ZJUC5Nb3ZlRmlsZVJlc3BvbnNlMAFiBnByb3RvMw");
+  fileDesc("ChVsaWJyZXN2aXBfdGF1cmkucHJvdG8SCUxpYnJlU1ZJUCKpAQoRTHlyaWNzUmVwbGFjZW1lbnQSKgoEbW9kZRgBIAEoDjIcLkxpYnJlU1ZJUC5MeXJpY3NSZXBsYWNlTW9kZRITCgtyZXBsYWNlbWVudBgCIAEoCRIUCgxwYXR0ZXJuX21haW4YAyABKAkSFgoOcGF0dGVybl9wcmVmaXgYBCABKAkSFgoOcGF0dGVybl9zdWZmaXgYBSABKAkSDQoFZmxhZ3MYBiABKAUiWgoWTHlyaWNzUmVwbGFjZW1lbnRHcm91cBITCgtwcmVzZXRfbmFtZRgBIAEoCRIrCgVydWxlcxgCIAMoCzIcLkxpYnJlU1ZJUC5MeXJpY3NSZXBsYWNlbWVudCL6AQoKUGx1Z2luSW5mbxISCgppZGVudGlmaWVyGAEgASgJEgwKBG5hbWUYAiABKAkSDwoHdmVyc2lvbhgDIAEoCRITCgtkZXNjcmlwdGlvbhgEIAEoCRIOCgZhdXRob3IYBSABKAkSDwoHd2Vic2l0ZRgGIAEoCRITCgtqc29uX3NjaGVtYRgHIAEoCRITCgtmaWxlX2Zvcm1hdBgIIAEoCRIQCghzdWZmaXhlcxgJIAMoCRITCgtpY29uX2Jhc2U2NBgKIAEoCRIWCg51aV9qc29uX3NjaGVtYRgLIAEoCRIaChJkZWZhdWx0X2pzb25fdmFsdWUYDCABKAkiaAoSUGx1Z2luSW5mb3NSZXF1ZXN0EisKCGNhdGVnb3J5GAEgASgOMhkuTGlicmVTVklQLlBsdWdpbkNhdGVnb3J5EhAKCGxhbmd1YWdlGAIgASgJEhMKC2lkZW50aWZpZXJzGAMgAygJIjwKE1BsdWdpbkluZm9zUmVzcG9uc2USJQoGdmFsdWVzGAEgAygLMhUuTGlicmVTVklQLlBsdWdpbkluZm8iRQoPQ29udmVyc2lvbkdyb3VwEhAKCGdyb3VwX2lkGAEgASgJEhIKCmZpbGVfcGF0aHMYAiADKAkSDAoEc3RlbRgDIAEoCSJQCgxPdXRwdXRUYXJnZXQSEQoJdGFyZ2V0X2lkGAEgASgJEhUKDW91dHB1dF9mb3JtYXQYAiABKAkSFgoOb3V0cHV0X29wdGlvbnMYAyABKAkihQUKEUNvbnZlcnNpb25SZXF1ZXN0EhQKDGlucHV0X2Zvcm1hdBgBIAEoCRIVCg1vdXRwdXRfZm9ybWF0GAIgASgJEicKBG1vZGUYAyABKA4yGS5MaWJyZVNWSVAuQ29udmVyc2lvbk1vZGUSFwoPbWF4X3RyYWNrX2NvdW50GAQgASgFEioKBmdyb3VwcxgFIAMoCzIaLkxpYnJlU1ZJUC5Db252ZXJzaW9uR3JvdXASFQoNaW5wdXRfb3B0aW9ucxgGIAEoCRIWCg5vdXRwdXRfb3B0aW9ucxgHIAEoCRJPChJtaWRkbGV3YXJlX29wdGlvbnMYCCADKAsyMy5MaWJyZVNWSVAuQ29udmVyc2lvblJlcXVlc3QuTWlkZGxld2FyZU9wdGlvbnNFbnRyeRIQCghsYW5ndWFnZRgJIAEoCRI+ChNseXJpY19yZXBsYWNlX3J1bGVzGAogAygLMiEuTGlicmVTVklQLkx5cmljc1JlcGxhY2VtZW50R3JvdXASFQoNY29udmVyc2lvbl9pZBgLIAEoCRIoCgdvdXRwdXRzGAwgAygLMhcuTGlicmVTVklQLk91dHB1dFRhcmdldBIPCgdwcm9maWxlGA0gASgIEi8KCHByaW9yaXR5GA4gASgOMh0uTGlicmVTVklQLkNvbnZlcnNpb25Qcmlvcml0eRISCgpvdXRwdXRfZGlyGA8gASgJEjIKD2NvbmZsaWN0X3BvbGljeRgQIAEoDjIZLkxpYnJlU1ZJUC5Db25mbGljdFBvbGljeRo4ChZNaWRkbGV3YXJlT3B0aW9uc0VudHJ5EgsKA2tleRgBIAEoCRINCgV2YWx1ZRgCIAEoCToCOAEiRwoLU3RhZ2VUaW1pbmcSDQoFc3RhZ2UYASABKAkSFAoMd2FsbF9zZWNvbmRzGAIgASgBEhMKC2NwdV9zZWNvbmRzGAMgASgBIoEDChZTaW5nbGVDb252ZXJzaW9uUmVzdWx0EhAKCGdyb3VwX2lkGAEgASgJEg8KB3J1bm5pbmcYAiABKAgSEQoJY29tcGxldGVkGAMgASgIEhUKDWVycm9yX21lc3NhZ2UYBCABKAkSGAoQd2FybmluZ19tZXNzYWdlcxgFIAMoCRIRCgljYW5jZWxsZWQYBiABKAgSEQoJdGFyZ2V0X2lkGAcgASgJEhIKCnBhcnRfY291bnQYCCABKAUSEgoKcGFydF9pbmRleBgJIAEoBRInCgd0aW1pbmdzGAogAygLMhYuTGlicmVTVklQLlN0YWdlVGltaW5nEhMKC2lucHV0X2J5dGVzGAsgASgDEhQKDG91dHB1dF9ieXRlcxgMIAEoAxIQCghwcm9ncmVzcxgNIAEoARIXCg9lbGFwc2VkX3NlY29uZHMYDiABKAESDQoFc3RhZ2UYDyABKAkSEwoLb3V0cHV0X3BhdGgYECABKAkSDwoHc2tpcHBlZBgRIAEoCCIQCg5WZXJzaW9uUmVxdWVzdCI6Cg9WZXJzaW9uUmVzcG9uc2USDwoHdmVyc2lvbhgBIAEoCRIWCg5wbHVnaW5zX2xvYWRlZBgCIAEoCCLLAQoPTW92ZUZpbGVSZXF1ZXN0EhAKCGdyb3VwX2lkGAEgASgJEhIKCm91dHB1dF9kaXIYAiABKAkSDAoEc3RlbRgDIAEoCRIVCg1vdXRwdXRfZm9ybWF0GAQgASgJEjIKD2NvbmZsaWN0X3BvbGljeRgFIAEoDjIZLkxpYnJlU1ZJUC5Db25mbGljdFBvbGljeRIXCg9mb3JjZV9vdmVyd3JpdGUYBiABKAgSEQoJdGFyZ2V0X2lkGAcgASgJEg0KBXBhcnRzGAggAygFIuQBChBNb3ZlRmlsZVJlc3BvbnNlEhAKCGdyb3VwX2lkGAEgASgJEhMKC291dHB1dF9wYXRoGAIgASgJEjIKD2NvbmZsaWN0X3BvbGljeRgDIAEoDjIZLkxpYnJlU1ZJUC5Db25mbGljdFBvbGljeRIRCgljb21wbGV0ZWQYBCABKAgSDwoHc3VjY2VzcxgFIAEoCBIVCg1lcnJvcl9tZXNzYWdlGAYgASgJEhEKCXRhcmdldF9pZBgHIAEoCRInCgd0aW1pbmdzGAggAygLMhYuTGlicmVTVklQLlN0YWdlVGltaW5nImkKDk1vdmVGaWxlc0VudHJ5EhAKCGdyb3VwX2lkGAEgASgJEgwKBHN0ZW0YAiABKAkSFQoNb3V0cHV0X2Zvcm1hdBgDIAEoCRIRCgl0YXJnZXRfaWQYBCABKAkSDQoFcGFydHMYBSADKAUinwEKEE1vdmVGaWxlc1JlcXVlc3QSKgoHZW50cmllcxgBIAMoCzIZLkxpYnJlU1ZJUC5Nb3ZlRmlsZXNFbnRyeRISCgpvdXRwdXRfZGlyGAIgASgJEjIKD2NvbmZsaWN0X3BvbGljeRgDIAEoDjIZLkxpYnJlU1ZJUC5Db25mbGljdFBvbGljeRIXCg9mb3JjZV9vdmVyd3JpdGUYBCABKAgiQwoXQ2FuY2VsQ29udmVyc2lvblJlcXVlc3QSFQoNY29udmVyc2lvbl9pZBgBIAEoCRIRCglncm91cF9pZHMYAiADKAkiLQoYQ2FuY2VsQ29udmVyc2lvblJlc3BvbnNlEhEKCWdyb3VwX2lkcxgBIAMoCSI4ChFHZXRQcm9maWxlUmVxdWVzdBIQCghncm91cF9pZBgBIAEoCRIRCgl0YXJnZXRfaWQYAiABKAkifQoSR2V0UHJvZmlsZVJlc3BvbnNlEhAKCGdyb3VwX2lkGAEgASgJEhEKCXRhcmdldF9pZBgCIAEoCRINCgVmb3VuZBgDIAEoCBIOCgZwc3RhdHMYBCABKAwSDgoGcmVwb3J0GAUgASgJEhMKC2FsbG9jYXRpb25zGAYgASgJKjcKDlBsdWdpbkNhdGVnb3J5EgkKBUlOUFVUEAASCgoGT1VUUFVUEAESDgoKTUlERExFV0FSRRACKjIKDkNvbnZlcnNpb25Nb2RlEgoKBkRJUkVDVBAAEgkKBVNQTElUEAESCQoFTUVSR0UQAipBCg5Db25mbGljdFBvbGljeRIICgRTS0lQEAASCgoGUFJPTVBUEAESDQoJT1ZFUldSSVRFEAISCgoGUkVOQU1FEAMqMwoSQ29udmVyc2lvblByaW9yaXR5EgoKBk5PUk1BTBAAEgcKA0xPVxABEggKBEhJR0gQAipMChFMeXJpY3NSZXBsYWNlTW9kZRIICgRGVUxMEAASDgoKQUxQSEFCRVRJQxABEhIKDk5PTl9BTFBIQUJFVElDEAISCQoFUkVHRVgQAzKiBAoKQ29udmVyc2lvbhJMCgtQbHVnaW5JbmZvcxIdLkxpYnJlU1ZJUC5QbHVnaW5JbmZvc1JlcXVlc3QaHi5MaWJyZVNWSVAuUGx1Z2luSW5mb3NSZXNwb25zZRJMCgdDb252ZXJ0EhwuTGlicmVTVklQLkNvbnZlcnNpb25SZXF1ZXN0GiEuTGlicmVTVklQLlNpbmdsZUNvbnZlcnNpb25SZXN1bHQwARJACgdWZXJzaW9uEhkuTGlicmVTVklQLlZlcnNpb25SZXF1ZXN0GhouTGlicmVTVklQLlZlcnNpb25SZXNwb25zZRJFCghNb3ZlRmlsZRIaLkxpYnJlU1ZJUC5Nb3ZlRmlsZVJlcXVlc3QaGy5MaWJyZVNWSVAuTW92ZUZpbGVSZXNwb25zZTABElsKEENhbmNlbENvbnZlcnNpb24SIi5MaWJyZVNWSVAuQ2FuY2VsQ29udmVyc2lvblJlcXVlc3QaIy5MaWJyZVNWSVAuQ2FuY2VsQ29udmVyc2lvblJlc3BvbnNlEkcKCU1vdmVGaWxlcxIbLkxpYnJlU1ZJUC5Nb3ZlRmlsZXNSZXF1ZXN0GhsuTGlicmVTVklQLk1vdmVGaWxlUmVzcG9uc2UwARJJCgpHZXRQcm9maWxlEhwuTGlicmVTVklQLkdldFByb2ZpbGVSZXF1ZXN0Gh0uTGlicmVTVklQLkdldFByb2ZpbGVSZXNwb25zZWIGcHJvdG8z");
 
 /**
  * @generated from message LibreSVIP.LyricsReplacement
@@ -163,6 +163,14 @@ export type PluginInfosRequest = Message<"LibreSVIP.PluginInfosRequest"> & {
    * @generated from field: string language = 2;
    */
   language: string;
+
+  /**
+   * only these plugins, each imported on demand; every plugin of the
+   * category when empty
+   *
+   * @generated from field: repeated string identifiers = 3;
+   */
+  identifiers: string[];
 };
 
 /**
@@ -202,6 +210,14 @@ export type ConversionGroup = Message<"LibreSVIP.ConversionGroup"> & {
    * @generated from field: repeated string file_paths = 2;
    */
   filePaths: string[];
+
+  /**
+   * file name of the outputs written to ConversionRequest.output_dir,
+   * without suffix; the stem of the first file when empty
+   *
+   * @generated from field: string stem = 3;
+   */
+  stem: string;
 };
 
 /**
@@ -211,6 +227,35 @@ export type ConversionGroup = Message<"LibreSVIP.ConversionGroup"> & {
 export const ConversionGroupSchema: GenMessage<ConversionGroup> = /*@__PURE__*/
   messageDesc(file_libresvip_tauri, 5);
 
+/**
+ * @generated from message LibreSVIP.OutputTarget
+ */
+export type OutputTarget = Message<"LibreSVIP.OutputTarget"> & {
+  /**
+   * defaults to output_format, must be unique within a request
+   *
+   * @generated from field: string target_id = 1;
+   */
+  targetId: string;
+
+  /**
+   * @generated from field: string output_format = 2;
+   */
+  outputFormat: string;
+
+  /**
+   * @generated from field: string output_options = 3;
+   */
+  outputOptions: string;
+};
+
+/**
+ * Describes the message LibreSVIP.OutputTarget.
+ * Use `create(OutputTargetSchema)` to create a new message.
+ */
+export const OutputTargetSchema: GenMessage<OutputTarget> = /*@__PURE__*/
+  messageDesc(file_libresvip_tauri, 6);
+
 /**
  * @generated from message LibreSVIP.ConversionRequest
  */
@@ -264,6 +309,47 @@ export type ConversionRequest = Message<"LibreSVIP.ConversionRequest"> & {
    * @generated from field: repeated LibreSVIP.LyricsReplacementGroup lyric_replace_rules = 10;
    */
   lyricReplaceRules: LyricsReplacementGroup[];
+
+  /**
+   * @generated from field: string conversion_id = 11;
+   */
+  conversionId: string;
+
+  /**
+   * when set, every group is loaded once and dumped to each target;
+   * output_format and output_options are then ignored
+   *
+   * @generated from field: repeated LibreSVIP.OutputTarget outputs = 12;
+   */
+  outputs: OutputTarget[];
+
+  /**
+   * profile every group, the reports are fetched with GetProfile
+   *
+   * @generated from field: bool profile = 13;
+   */
+  profile: boolean;
+
+  /**
+   * share of the server given to this conversion while others are running
+   *
+   * @generated from field: LibreSVIP.ConversionPriority priority = 14;
+   */
+  priority: ConversionPriority;
+
+  /**
+   * when set, outputs are written to this directory as they are done
+   * instead of being staged for MoveFile; conflicts with existing files are
+   * resolved by conflict_policy, which cannot be PROMPT
+   *
+   * @generated from field: string output_dir = 15;
+   */
+  outputDir: string;
+
+  /**
+   * @generated from field: LibreSVIP.ConflictPolicy conflict_policy = 16;
+   */
+  conflictPolicy: ConflictPolicy;
 };
 
 /**
@@ -271,7 +357,36 @@ export type ConversionRequest = Message<"LibreSVIP.ConversionRequest"> & {
  * Use `create(ConversionRequestSchema)` to create a new message.
  */
 export const ConversionRequestSchema: GenMessage<ConversionRequest> = /*@__PURE__*/
-  messageDesc(file_libresvip_tauri, 6);
+  messageDesc(file_libresvip_tauri, 7);
+
+/**
+ * @generated from message LibreSVIP.StageTiming
+ */
+export type StageTiming = Message<"LibreSVIP.StageTiming"> & {
+  /**
+   * load, merge, middleware:<identifier>, split, dump or move
+   *
+   * @generated from field: string stage = 1;
+   */
+  stage: string;
+
+  /**
+   * @generated from field: double wall_seconds = 2;
+   */
+  wallSeconds: number;
+
+  /**
+   * @generated from field: double cpu_seconds = 3;
+   */
+  cpuSeconds: number;
+};
+
+/**
+ * Describes the message LibreSVIP.StageTiming.
+ * Use `create(StageTimingSchema)` to create a new message.
+ */
+export const StageTimingSchema: GenMessage<StageTiming> = /*@__PURE__*/
+  messageDesc(file_libresvip_tauri, 8);
 
 /**
  * @generated from message LibreSVIP.SingleConversionResult
@@ -301,6 +416,79 @@ export type SingleConversionResult = Message<"LibreSVIP.SingleConversionResult">
    * @generated from field: repeated string warning_messages = 5;
    */
   warningMessages: string[];
+
+  /**
+   * @generated from field: bool cancelled = 6;
+   */
+  cancelled: boolean;
+
+  /**
+   * @generated from field: string target_id = 7;
+   */
+  targetId: string;
+
+  /**
+   * SPLIT groups stream a running result per written part before the
+   * result for the whole group, which sets part_count as well
+   *
+   * @generated from field: int32 part_count = 8;
+   */
+  partCount: number;
+
+  /**
+   * @generated from field: int32 part_index = 9;
+   */
+  partIndex: number;
+
+  /**
+   * @generated from field: repeated LibreSVIP.StageTiming timings = 10;
+   */
+  timings: StageTiming[];
+
+  /**
+   * @generated from field: int64 input_bytes = 11;
+   */
+  inputBytes: bigint;
+
+  /**
+   * @generated from field: int64 output_bytes = 12;
+   */
+  outputBytes: bigint;
+
+  /**
+   * progress events are running results for the whole group, without a
+   * target_id, sent at most once per progress interval while it converts
+   *
+   * @generated from field: double progress = 13;
+   */
+  progress: number;
+
+  /**
+   * @generated from field: double elapsed_seconds = 14;
+   */
+  elapsedSeconds: number;
+
+  /**
+   * load, merge, middleware:<identifier>, split or dump
+   *
+   * @generated from field: string stage = 15;
+   */
+  stage: string;
+
+  /**
+   * where the output, or the part, was written with ConversionRequest.output_dir
+   *
+   * @generated from field: string output_path = 16;
+   */
+  outputPath: string;
+
+  /**
+   * set along with completed when ConflictPolicy.SKIP kept the existing
+   * file at output_path instead of writing the output
+   *
+   * @generated from field: bool skipped = 17;
+   */
+  skipped: boolean;
 };
 
 /**
@@ -308,7 +496,7 @@ export type SingleConversionResult = Message<"LibreSVIP.SingleConversionResult">
  * Use `create(SingleConversionResultSchema)` to create a new message.
  */
 export const SingleConversionResultSchema: GenMessage<SingleConversionResult> = /*@__PURE__*/
-  messageDesc(file_libresvip_tauri, 7);
+  messageDesc(file_libresvip_tauri, 9);
 
 /**
  * @generated from message LibreSVIP.VersionRequest
@@ -321,7 +509,7 @@ export type VersionRequest = Message<"LibreSVIP.VersionRequest"> & {
  * Use `create(VersionRequestSchema)` to create a new message.
  */
 export const VersionRequestSchema: GenMessage<VersionRequest> = /*@__PURE__*/
-  messageDesc(file_libresvip_tauri, 8);
+  messageDesc(file_libresvip_tauri, 10);
 
 /**
  * @generated from message LibreSVIP.VersionResponse
@@ -331,6 +519,14 @@ export type VersionResponse = Message<"LibreSVIP.VersionResponse"> & {
    * @generated from field: string version = 1;
    */
   version: string;
+
+  /**
+   * set once every plugin has been imported; until then the server already
+   * answers, importing the plugins a request needs on demand
+   *
+   * @generated from field: bool plugins_loaded = 2;
+   */
+  pluginsLoaded: boolean;
 };
 
 /**
@@ -338,7 +534,7 @@ export type VersionResponse = Message<"LibreSVIP.VersionResponse"> & {
  * Use `create(VersionResponseSchema)` to create a new message.
  */
 export const VersionResponseSchema: GenMessage<VersionResponse> = /*@__PURE__*/
-  messageDesc(file_libresvip_tauri, 9);
+  messageDesc(file_libresvip_tauri, 11);
 
 /**
  * @generated from message LibreSVIP.MoveFileRequest
@@ -373,6 +569,19 @@ export type MoveFileRequest = Message<"LibreSVIP.MoveFileRequest"> & {
    * @generated from field: bool force_overwrite = 6;
    */
   forceOverwrite: boolean;
+
+  /**
+   * @generated from field: string target_id = 7;
+   */
+  targetId: string;
+
+  /**
+   * deliver only these parts of a SPLIT group, e.g. while later parts
+   * are still being written
+   *
+   * @generated from field: repeated int32 parts = 8;
+   */
+  parts: number[];
 };
 
 /**
@@ -380,7 +589,7 @@ export type MoveFileRequest = Message<"LibreSVIP.MoveFileRequest"> & {
  * Use `create(MoveFileRequestSchema)` to create a new message.
  */
 export const MoveFileRequestSchema: GenMessage<MoveFileRequest> = /*@__PURE__*/
-  messageDesc(file_libresvip_tauri, 10);
+  messageDesc(file_libresvip_tauri, 12);
 
 /**
  * @generated from message LibreSVIP.MoveFileResponse
@@ -415,6 +624,16 @@ export type MoveFileResponse = Message<"LibreSVIP.MoveFileResponse"> & {
    * @generated from field: string error_message = 6;
    */
   errorMessage: string;
+
+  /**
+   * @generated from field: string target_id = 7;
+   */
+  targetId: string;
+
+  /**
+   * @generated from field: repeated LibreSVIP.StageTiming timings = 8;
+   */
+  timings: StageTiming[];
 };
 
 /**
@@ -422,7 +641,187 @@ export type MoveFileResponse = Message<"LibreSVIP.MoveFileResponse"> & {
  * Use `create(MoveFileResponseSchema)` to create a new message.
  */
 export const MoveFileResponseSchema: GenMessage<MoveFileResponse> = /*@__PURE__*/
-  messageDesc(file_libresvip_tauri, 11);
+  messageDesc(file_libresvip_tauri, 13);
+
+/**
+ * @generated from message LibreSVIP.MoveFilesEntry
+ */
+export type MoveFilesEntry = Message<"LibreSVIP.MoveFilesEntry"> & {
+  /**
+   * @generated from field: string group_id = 1;
+   */
+  groupId: string;
+
+  /**
+   * @generated from field: string stem = 2;
+   */
+  stem: string;
+
+  /**
+   * @generated from field: string output_format = 3;
+   */
+  outputFormat: string;
+
+  /**
+   * @generated from field: string target_id = 4;
+   */
+  targetId: string;
+
+  /**
+   * @generated from field: repeated int32 parts = 5;
+   */
+  parts: number[];
+};
+
+/**
+ * Describes the message LibreSVIP.MoveFilesEntry.
+ * Use `create(MoveFilesEntrySchema)` to create a new message.
+ */
+export const MoveFilesEntrySchema: GenMessage<MoveFilesEntry> = /*@__PURE__*/
+  messageDesc(file_libresvip_tauri, 14);
+
+/**
+ * @generated from message LibreSVIP.MoveFilesRequest
+ */
+export type MoveFilesRequest = Message<"LibreSVIP.MoveFilesRequest"> & {
+  /**
+   * @generated from field: repeated LibreSVIP.MoveFilesEntry entries = 1;
+   */
+  entries: MoveFilesEntry[];
+
+  /**
+   * @generated from field: string output_dir = 2;
+   */
+  outputDir: string;
+
+  /**
+   * @generated from field: LibreSVIP.ConflictPolicy conflict_policy = 3;
+   */
+  conflictPolicy: ConflictPolicy;
+
+  /**
+   * @generated from field: bool force_overwrite = 4;
+   */
+  forceOverwrite: boolean;
+};
+
+/**
+ * Describes the message LibreSVIP.MoveFilesRequest.
+ * Use `create(MoveFilesRequestSchema)` to create a new message.
+ */
+export const MoveFilesRequestSchema: GenMessage<MoveFilesRequest> = /*@__PURE__*/
+  messageDesc(file_libresvip_tauri, 15);
+
+/**
+ * @generated from message LibreSVIP.CancelConversionRequest
+ */
+export type CancelConversionRequest = Message<"LibreSVIP.CancelConversionRequest"> & {
+  /**
+   * @generated from field: string conversion_id = 1;
+   */
+  conversionId: string;
+
+  /**
+   * cancel only these groups, or the whole conversion when empty
+   *
+   * @generated from field: repeated string group_ids = 2;
+   */
+  groupIds: string[];
+};
+
+/**
+ * Describes the message LibreSVIP.CancelConversionRequest.
+ * Use `create(CancelConversionRequestSchema)` to create a new message.
+ */
+export const CancelConversionRequestSchema: GenMessage<CancelConversionRequest> = /*@__PURE__*/
+  messageDesc(file_libresvip_tauri, 16);
+
+/**
+ * @generated from message LibreSVIP.CancelConversionResponse
+ */
+export type CancelConversionResponse = Message<"LibreSVIP.CancelConversionResponse"> & {
+  /**
+   * @generated from field: repeated string group_ids = 1;
+   */
+  groupIds: string[];
+};
+
+/**
+ * Describes the message LibreSVIP.CancelConversionResponse.
+ * Use `create(CancelConversionResponseSchema)` to create a new message.
+ */
+export const CancelConversionResponseSchema: GenMessage<CancelConversionResponse> = /*@__PURE__*/
+  messageDesc(file_libresvip_tauri, 17);
+
+/**
+ * @generated from message LibreSVIP.GetProfileRequest
+ */
+export type GetProfileRequest = Message<"LibreSVIP.GetProfileRequest"> & {
+  /**
+   * @generated from field: string group_id = 1;
+   */
+  groupId: string;
+
+  /**
+   * @generated from field: string target_id = 2;
+   */
+  targetId: string;
+};
+
+/**
+ * Describes the message LibreSVIP.GetProfileRequest.
+ * Use `create(GetProfileRequestSchema)` to create a new message.
+ */
+export const GetProfileRequestSchema: GenMessage<GetProfileRequest> = /*@__PURE__*/
+  messageDesc(file_libresvip_tauri, 18);
+
+/**
+ * @generated from message LibreSVIP.GetProfileResponse
+ */
+export type GetProfileResponse = Message<"LibreSVIP.GetProfileResponse"> & {
+  /**
+   * @generated from field: string group_id = 1;
+   */
+  groupId: string;
+
+  /**
+   * @generated from field: string target_id = 2;
+   */
+  targetId: string;
+
+  /**
+   * @generated from field: bool found = 3;
+   */
+  found: boolean;
+
+  /**
+   * cProfile statistics as written by pstats.Stats.dump_stats
+   *
+   * @generated from field: bytes pstats = 4;
+   */
+  pstats: Uint8Array;
+
+  /**
+   * functions sorted by cumulative time
+   *
+   * @generated from field: string report = 5;
+   */
+  report: string;
+
+  /**
+   * largest allocations traced at the peak memory usage
+   *
+   * @generated from field: string allocations = 6;
+   */
+  allocations: string;
+};
+
+/**
+ * Describes the message LibreSVIP.GetProfileResponse.
+ * Use `create(GetProfileResponseSchema)` to create a new message.
+ */
+export const GetProfileResponseSchema: GenMessage<GetProfileResponse> = /*@__PURE__*/
+  messageDesc(file_libresvip_tauri, 19);
 
 /**
  * @generated from enum LibreSVIP.PluginCategory
@@ -507,6 +906,32 @@ export enum ConflictPolicy {
 export const ConflictPolicySchema: GenEnum<ConflictPolicy> = /*@__PURE__*/
   enumDesc(file_libresvip_tauri, 2);
 
+/**
+ * @generated from enum LibreSVIP.ConversionPriority
+ */
+export enum ConversionPriority {
+  /**
+   * @generated from enum value: NORMAL = 0;
+   */
+  NORMAL = 0,
+
+  /**
+   * @generated from enum value: LOW = 1;
+   */
+  LOW = 1,
+
+  /**
+   * @generated from enum value: HIGH = 2;
+   */
+  HIGH = 2,
+}
+
+/**
+ * Describes the enum LibreSVIP.ConversionPriority.
+ */
+export const ConversionPrioritySchema: GenEnum<ConversionPriority> = /*@__PURE__*/
+  enumDesc(file_libresvip_tauri, 3);
+
 /**
  * @generated from enum LibreSVIP.LyricsReplaceMode
  */
@@ -536,7 +961,7 @@ export enum LyricsReplaceMode {
  * Describes the enum LibreSVIP.LyricsReplaceMode.
  */
 export const LyricsReplaceModeSchema: GenEnum<LyricsReplaceMode> = /*@__PURE__*/
-  enumDesc(file_libresvip_tauri, 3);
+  enumDesc(file_libresvip_tauri, 4);
 
 /**
  * @generated from service LibreSVIP.Conversion
@@ -574,6 +999,30 @@ export const Conversion: GenService<{
     input: typeof MoveFileRequestSchema;
     output: typeof MoveFileResponseSchema;
   },
+  /**
+   * @generated from rpc LibreSVIP.Conversion.CancelConversion
+   */
+  cancelConversion: {
+    methodKind: "unary";
+    input: typeof CancelConversionRequestSchema;
+    output: typeof CancelConversionResponseSchema;
+  },
+  /**
+   * @generated from rpc LibreSVIP.Conversion.MoveFiles
+   */
+  moveFiles: {
+    methodKind: "server_streaming";
+    input: typeof MoveFilesRequestSchema;
+    output: typeof MoveFileResponseSchema;
+  },
+  /**
+   * @generated from rpc LibreSVIP.Conversion.GetProfile
+   */
+  getProfile: {
+    methodKind: "unary";
+    input: typeof GetProfileRequestSchema;
+    output: typeof GetProfileResponseSchema;
+  },
 }> = /*@__PURE__*/
   serviceDesc(file_libresvip_tauri, 0);
 
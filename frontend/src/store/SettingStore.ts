@@ -136,7 +136,8 @@ export const useSettingStore = create<SettingState>()(
       loadInputFormatSchema: async (inputFormat, language) => {
         const response = await client.pluginInfos({
           category: PluginCategory.INPUT,
-          language: language
+          language: language,
+          identifiers: [inputFormat],
         })
         const plugin = response.values.find((v) => v.identifier === inputFormat);
         if (plugin) {
@@ -150,7 +151,8 @@ export const useSettingStore = create<SettingState>()(
       loadOutputFormatSchema: async (outputFormat, language) => {
         const response = await client.pluginInfos({
           category: PluginCategory.OUTPUT,
-          language: language
+          language: language,
+          identifiers: [outputFormat],
         })
         const plugin = response.values.find((v) => v.identifier === outputFormat);
         if (plugin) {
@@ -0,0 +1,418 @@
+"""Headless conversion of a directory tree.
+
+Every file under ``source`` that an input plugin reads, chosen by its
+suffix, is converted through ``convert_one_group`` on the same engine the
+server uses, and written to the same relative path under ``output_dir``::
+
+    python -m libresvip_tauri.batch projects exports --to mid
+    python -m libresvip_tauri.batch projects exports --to svp --from ustx --executor process --max-workers 8
+
+No server is started and nothing goes through Connect. Existing outputs
+are kept, replaced or written next to under a new name as set by
+``--conflict-policy``. The exit status is 1 if a file failed to convert.
+"""
+
+import argparse
+import asyncio
+import collections
+import dataclasses
+import os
+import pathlib
+import shutil
+import sys
+import time
+import traceback
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Mapping, Sequence
+from functools import partial
+from typing import Any
+
+os.environ.setdefault("LIBRESVIP_SETTINGS_BACKEND", "remote")
+
+from libresvip.core.config import LibreSVIPSettingsContainer, LibreSvipBaseUISettings
+from libresvip.extension.base import OptionsDict, ReadOnlyConverterMixin, SVSConverter, WriteOnlyConverterMixin
+from pydantic import ValidationError
+from upath import UPath
+
+from .config import ExecutorKind, server_config
+from .conversion import convert_one_group
+from .engine import ConversionEngine
+from .libresvip_tauri_pb import ConflictPolicy, ConversionGroup, ConversionMode
+from .pipeline import MiddlewarePipeline, build_pipeline
+from .project_cache import project_cache
+from .registry import plugin_registry
+from .scheduler import BatchScheduler, Emit
+from .staging import (
+    DIRECT_STAGING_PREFIX,
+    create_direct_staging,
+    part_destination,
+    place_output,
+    remove_staged,
+    staged_name,
+)
+
+_CONFLICT_POLICIES = {
+    "skip": ConflictPolicy.SKIP,
+    "overwrite": ConflictPolicy.OVERWRITE,
+    "rename": ConflictPolicy.RENAME,
+}
+
+
+@dataclasses.dataclass
+class BatchJob:
+    source: pathlib.Path
+    input_format: str
+    # split outputs are numbered from here
+    destination: pathlib.Path
+
+
+@dataclasses.dataclass
+class BatchResult:
+    job: BatchJob
+    completed: bool = False
+    # every output was kept where it already existed
+    skipped: bool = False
+    error_message: str = ""
+    input_bytes: int = 0
+    output_bytes: int = 0
+    output_paths: list[pathlib.Path] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass
+class BatchSummary:
+    converted: int = 0
+    skipped: int = 0
+    failed: list[BatchResult] = dataclasses.field(default_factory=list)
+    input_bytes: int = 0
+    output_bytes: int = 0
+    elapsed_seconds: float = 0.0
+
+    def add(self, result: BatchResult) -> None:
+        if not result.completed:
+            self.failed.append(result)
+        elif result.skipped:
+            self.skipped += 1
+        else:
+            self.converted += 1
+            self.input_bytes += result.input_bytes
+            self.output_bytes += result.output_bytes
+
+    def report(self) -> str:
+        elapsed = max(self.elapsed_seconds, 1e-9)
+        lines = [
+            f"{self.converted} converted, {self.skipped} skipped, {len(self.failed)} failed "
+            f"in {self.elapsed_seconds:.2f} s",
+            f"{self.converted / elapsed:.1f} files/s, "
+            f"{self.input_bytes / elapsed / 1e6:.2f} MB/s read, "
+            f"{self.output_bytes / elapsed / 1e6:.2f} MB/s written",
+        ]
+        for result in self.failed:
+            # the exception of a traceback is the last line that is not indented
+            error = [line for line in result.error_message.strip().splitlines() if not line[:1].isspace()]
+            lines.append(f"failed: {result.job.source}: {error[-1] if error else 'unknown error'}")
+        return "\n".join(lines)
+
+
+def input_formats(identifiers: Sequence[str] | None = None) -> dict[str, str]:
+    """Identifiers of the input plugins by the suffixes of the files they read, without the dot.
+
+    Raises ``KeyError`` for an identifier that is not a readable plugin.
+    """
+    readable = {
+        identifier: plugin
+        for identifier, plugin in sorted(plugin_registry.plugins("svs").items())
+        if not issubclass(plugin, WriteOnlyConverterMixin)
+    }
+    if identifiers:
+        readable = {identifier: readable[identifier] for identifier in identifiers}
+    formats: dict[str, str] = {}
+    for identifier, plugin in readable.items():
+        for suffix in plugin.info.suffixes:
+            # a suffix claimed by several plugins goes to the one named after it
+            if suffix.lower() not in formats or suffix.lower() == identifier:
+                formats[suffix.lower()] = identifier
+    return formats
+
+
+def suffix_format(path: pathlib.Path, formats: Mapping[str, str]) -> str | None:
+    return formats.get(path.suffix[1:].lower()) if path.suffix else None
+
+
+def find_inputs(
+    source: pathlib.Path, formats: Mapping[str, str], exclude: pathlib.Path | None = None
+) -> Iterator[tuple[pathlib.Path, str]]:
+    """Files under ``source`` read by one of ``formats``, in a stable order, with their input format."""
+    for dir_path, dir_names, file_names in os.walk(source):
+        parent = pathlib.Path(dir_path)
+        # outputs written into the tree being converted are not converted again
+        dir_names[:] = sorted(
+            name
+            for name in dir_names
+            if not name.startswith(DIRECT_STAGING_PREFIX) and parent / name != exclude
+        )
+        for file_name in sorted(file_names):
+            if (input_format := suffix_format(parent / file_name, formats)) is not None:
+                yield parent / file_name, input_format
+
+
+def destination(
+    source: pathlib.Path,
+    output_dir: pathlib.Path,
+    path: pathlib.Path,
+    input_format: str,
+    output_format: str,
+    qualified: bool = False,
+) -> pathlib.Path:
+    """Where the output of ``path`` goes, ``qualified`` by its input format when it shares its stem."""
+    relative = path.relative_to(source)
+    stem = f"{relative.stem}_{input_format}" if qualified else relative.stem
+    return output_dir / relative.parent / f"{stem}.{output_format}"
+
+
+def plan_jobs(
+    source: pathlib.Path,
+    output_dir: pathlib.Path,
+    inputs: Iterable[tuple[pathlib.Path, str]],
+    output_format: str,
+) -> list[BatchJob]:
+    jobs = [
+        BatchJob(path, input_format, destination(source, output_dir, path, input_format, output_format))
+        for path, input_format in inputs
+    ]
+    counts = collections.Counter(job.destination for job in jobs)
+    for job in jobs:
+        # inputs of several formats with the same stem would write to the same file
+        if counts[job.destination] > 1:
+            job.destination = destination(source, output_dir, job.source, job.input_format, output_format, True)
+    return jobs
+
+
+class BatchConverter:
+    """Converts files to one output format on a ``ConversionEngine``.
+
+    Outputs are staged in a temporary directory inside ``output_dir``
+    and renamed into place, resolving conflicts with existing files by
+    ``conflict_policy``. A ``max_track_count`` above 0 splits every
+    project into parts of at most that many tracks.
+    """
+
+    def __init__(
+        self,
+        engine: ConversionEngine,
+        settings: LibreSvipBaseUISettings,
+        output_dir: pathlib.Path,
+        output_plugin: SVSConverter,
+        output_options: OptionsDict,
+        input_options: Mapping[str, OptionsDict],
+        pipeline: MiddlewarePipeline,
+        conflict_policy: ConflictPolicy = ConflictPolicy.SKIP,
+        max_track_count: int = 0,
+        language: str = "en_US",
+    ) -> None:
+        self.engine = engine
+        self.settings = settings
+        self.output_dir = output_dir
+        self.output_plugin = output_plugin
+        self.output_options = output_options
+        self.input_options = input_options
+        self.pipeline = pipeline
+        self.conflict_policy = conflict_policy
+        self.max_track_count = max_track_count
+        self.mode = ConversionMode.SPLIT if max_track_count > 0 else ConversionMode.DIRECT
+        self.language = language
+        self._scheduler: BatchScheduler[tuple[int, BatchJob], BatchResult] = BatchScheduler(
+            engine, server_config.queue_size
+        )
+
+    async def run(self, jobs: Iterable[BatchJob]) -> AsyncIterator[BatchResult]:
+        """Convert ``jobs`` in parallel, yielding their results as they finish."""
+        fs = UPath(await asyncio.to_thread(create_direct_staging, self.output_dir))
+        try:
+            async for result in self._scheduler.run(enumerate(jobs), partial(self._process, fs)):
+                yield result
+        finally:
+            await asyncio.to_thread(shutil.rmtree, fs.path, True)
+
+    async def _process(self, fs: UPath, item: tuple[int, BatchJob], emit: Emit[BatchResult]) -> None:
+        index, job = item
+        await emit(await self._convert(fs, str(index), job))
+
+    async def _convert(self, fs: UPath, group_id: str, job: BatchJob) -> BatchResult:
+        result = BatchResult(job)
+        if (
+            self.conflict_policy == ConflictPolicy.SKIP
+            and self.mode != ConversionMode.SPLIT
+            and job.destination.exists()
+        ):
+            result.completed = result.skipped = True
+            return result
+        staged_path = fs / staged_name(group_id)
+        try:
+            result.input_bytes = job.source.stat().st_size
+            input_plugin = plugin_registry.svs(job.input_format)
+            converted = await self.engine.run(
+                self.settings,
+                convert_one_group,
+                fs,
+                self.mode,
+                self.max_track_count,
+                ConversionGroup(group_id=group_id, file_paths=[str(job.source)]),
+                input_plugin,
+                self.output_plugin,
+                self.input_options.get(job.input_format) or input_plugin.input_option_cls().model_dump(),
+                self.output_options,
+                self.pipeline,
+                self.language,
+            )
+            if not converted.completed:
+                result.error_message = converted.error_message
+                return result
+            result.output_bytes = converted.output_bytes
+            result.output_paths = await asyncio.to_thread(self._place, staged_path, job.destination)
+        except Exception:
+            result.error_message = traceback.format_exc()
+            return result
+        finally:
+            await asyncio.to_thread(remove_staged, staged_path)
+        result.completed = True
+        result.skipped = not result.output_paths
+        return result
+
+    def _place(self, staged_path: UPath, destination: pathlib.Path) -> list[pathlib.Path]:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        if not staged_path.is_dir():
+            output_paths = [place_output(pathlib.Path(staged_path.path), destination, self.conflict_policy)]
+        else:
+            output_paths = [
+                place_output(
+                    pathlib.Path(child.path), part_destination(destination, child.name), self.conflict_policy
+                )
+                for child in sorted(staged_path.iterdir(), key=lambda child: int(child.name))
+            ]
+        return [output_path for output_path in output_paths if output_path is not None]
+
+
+def _parse_options(value: str) -> tuple[str, str]:
+    identifier, _, options = value.partition("=")
+    return identifier, options or "{}"
+
+
+def _validate(option_cls: Any, options: str, parser: argparse.ArgumentParser, name: str) -> OptionsDict:
+    try:
+        return option_cls.model_validate_json(options).model_dump()
+    except ValidationError as e:
+        parser.error(f"invalid options of {name}: {e}")
+
+
+async def convert_tree(
+    converter: BatchConverter,
+    jobs: Sequence[BatchJob],
+    quiet: bool = False,
+    on_result: Callable[[BatchResult], None] | None = None,
+) -> BatchSummary:
+    summary = BatchSummary()
+    start = time.perf_counter()
+    async for result in converter.run(jobs):
+        summary.add(result)
+        if on_result is not None:
+            on_result(result)
+        if not quiet:
+            if not result.completed:
+                status = "failed"
+            elif result.skipped:
+                status = "skipped"
+            else:
+                status = "converted"
+            print(f"{status}: {result.job.source} -> {result.job.destination}", file=sys.stderr)
+    summary.elapsed_seconds = time.perf_counter() - start
+    return summary
+
+
+def build_converter(
+    args: argparse.Namespace, parser: argparse.ArgumentParser, engine: ConversionEngine
+) -> BatchConverter:
+    output_plugin = plugin_registry.svs(args.to)
+    if output_plugin is None or issubclass(output_plugin, ReadOnlyConverterMixin):
+        parser.error(f"{args.to} cannot be written")
+    input_options = {}
+    for identifier, options in map(_parse_options, args.input_options):
+        if (input_plugin := plugin_registry.svs(identifier)) is None:
+            parser.error(f"{identifier} cannot be read")
+        input_options[identifier] = _validate(input_plugin.input_option_cls, options, parser, identifier)
+    pipeline = build_pipeline(dict(map(_parse_options, args.middleware)))
+    if pipeline.unknown:
+        parser.error(f"unknown middleware {pipeline.unknown[0]}")
+    return BatchConverter(
+        engine,
+        LibreSvipBaseUISettings.model_construct(lyric_replace_rules={"default": []}),
+        args.output_dir.absolute(),
+        output_plugin,
+        _validate(output_plugin.output_option_cls, args.output_options, parser, args.to),
+        input_options,
+        pipeline,
+        _CONFLICT_POLICIES[args.conflict_policy],
+        args.max_track_count,
+        args.language,
+    )
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options shared with the other headless entry points."""
+    parser.add_argument("source", type=pathlib.Path, help="Directory to convert the files of, recursively")
+    parser.add_argument("output_dir", type=pathlib.Path, help="Directory the outputs are written to, mirroring the source tree")
+    parser.add_argument("--to", required=True, help="Output plugin")
+    parser.add_argument("--from", dest="inputs", nargs="*", help="Input plugins to convert the files of, all by default")
+    parser.add_argument("--input-options", action="append", default=[], metavar="ID=JSON", help="Options of an input plugin")
+    parser.add_argument("--output-options", default="{}", metavar="JSON", help="Options of the output plugin")
+    parser.add_argument("--middleware", action="append", default=[], metavar="ID[=JSON]", help="Middleware to process projects with, in order")
+    parser.add_argument("--max-track-count", type=int, default=0, help="Split projects into parts of at most this many tracks, 0 to not split")
+    parser.add_argument(
+        "--conflict-policy",
+        choices=list(_CONFLICT_POLICIES),
+        default="skip",
+        help="Keep, overwrite or write next to outputs that already exist",
+    )
+    parser.add_argument("--language", default="en_US", help="Language of warnings and errors")
+    parser.add_argument(
+        "--executor",
+        choices=[kind.value for kind in ExecutorKind],
+        default=server_config.executor.value,
+        help="Run conversions in a thread pool or a process pool",
+    )
+    parser.add_argument("--max-workers", type=int, default=server_config.max_workers, help="Maximum number of conversion workers")
+    parser.add_argument("--max-concurrency", type=int, default=server_config.max_concurrency, help="Maximum number of files converted at once")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+
+
+def create_engine(args: argparse.Namespace) -> ConversionEngine:
+    # every file is loaded once, cached projects would only hold memory
+    server_config.project_cache_max_bytes = project_cache.max_bytes = 0
+    return ConversionEngine(ExecutorKind(args.executor), args.max_workers, args.max_concurrency)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="LibreSVIP Tauri batch conversion")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    if not args.source.is_dir():
+        parser.error(f"{args.source} is not a directory")
+    try:
+        formats = input_formats(args.inputs)
+    except KeyError as e:
+        parser.error(f"{e.args[0]} cannot be read")
+    source = args.source.absolute()
+    engine = create_engine(args)
+    try:
+        converter = build_converter(args, parser, engine)
+        jobs = plan_jobs(
+            source, converter.output_dir, find_inputs(source, formats, converter.output_dir), args.to
+        )
+        with LibreSVIPSettingsContainer.state.override_context_sync(converter.settings):
+            summary = asyncio.run(convert_tree(converter, jobs, args.quiet))
+    finally:
+        engine.shutdown()
+    print(summary.report())
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
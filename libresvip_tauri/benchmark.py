@@ -0,0 +1,351 @@
+"""Benchmark of every pair of input and output plugins.
+
+Synthetic projects are written once with every plugin that can both read
+and write, then converted to every writable plugin through
+``convert_one_group``, the same call the server makes for a group::
+
+    python -m libresvip_tauri.benchmark --output results.json
+    python -m libresvip_tauri.benchmark --baseline results.json --output new.json
+
+With ``--baseline`` the exit status is 1 if a pair got slower or used
+more memory than ``--threshold`` allows, or stopped converting.
+"""
+
+import argparse
+import dataclasses
+import importlib.metadata
+import math
+import os
+import pathlib
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+os.environ.setdefault("LIBRESVIP_SETTINGS_BACKEND", "remote")
+
+from libresvip.core.compat import json
+from libresvip.core.config import LibreSVIPSettingsContainer, LibreSvipBaseUISettings
+from libresvip.extension.base import ReadOnlyConverterMixin, SVSConverter, WriteOnlyConverterMixin
+from libresvip.model.base import (
+    Note,
+    ParamCurve,
+    Params,
+    Points,
+    Project,
+    SingingTrack,
+    SongTempo,
+    TimeSignature,
+)
+from libresvip.model.point import Point
+from upath import UPath
+
+from .conversion import convert_one_group
+from .libresvip_tauri_pb import ConversionGroup, ConversionMode
+from .pipeline import MiddlewarePipeline
+from .project_cache import project_cache
+from .registry import plugin_registry
+from .staging import remove_staged
+
+_RESULTS_VERSION = 1
+
+_LYRICS = ("la", "a", "i", "u", "e", "o", "ka", "sa", "ta", "na")
+
+_TICKS_PER_NOTE = 480
+
+# pitch points are stored 1920 ticks ahead of the notes they bend
+_PITCH_OFFSET = 1920
+
+
+@dataclasses.dataclass
+class ProjectSize:
+    tracks: int = 2
+    notes: int = 100
+    pitch_points: int = 200
+
+
+@dataclasses.dataclass
+class PairResult:
+    input_format: str
+    output_format: str
+    completed: bool = False
+    error_message: str = ""
+    iterations: int = 0
+    latency_seconds: dict[str, float] = dataclasses.field(default_factory=dict)
+    notes_per_second: float = 0.0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    peak_memory_bytes: int = 0
+
+
+def synthetic_project(size: ProjectSize, seed: int = 0) -> Project:
+    """A project of ``size`` whose contents only depend on ``seed``."""
+    rng = random.Random(seed)
+    track_list = []
+    for track_index in range(size.tracks):
+        notes = [
+            Note(
+                start_pos=i * _TICKS_PER_NOTE,
+                length=_TICKS_PER_NOTE,
+                key_number=rng.randint(48, 72),
+                lyric=rng.choice(_LYRICS),
+            )
+            for i in range(size.notes)
+        ]
+        end = size.notes * _TICKS_PER_NOTE
+        step = max(end // max(size.pitch_points, 1), 1)
+        pitch_points = [Point.start_point()]
+        for x in range(0, end, step)[: size.pitch_points]:
+            key_number = notes[min(x // _TICKS_PER_NOTE, len(notes) - 1)].key_number
+            pitch_points.append(Point(x + _PITCH_OFFSET, key_number * 100 + rng.randint(-50, 50)))
+        pitch_points.append(Point.end_point())
+        track_list.append(
+            SingingTrack(
+                title=f"Track {track_index + 1}",
+                note_list=notes,
+                edited_params=Params(pitch=ParamCurve(points=Points(root=pitch_points))),
+            )
+        )
+    return Project(
+        song_tempo_list=[SongTempo(position=0, bpm=120)],
+        time_signature_list=[TimeSignature()],
+        track_list=track_list,
+    )
+
+
+def _percentile(values: list[float], q: float) -> float:
+    # linear interpolation between the closest ranks
+    values = sorted(values)
+    rank = (len(values) - 1) * q
+    low, high = math.floor(rank), math.ceil(rank)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def _latency(values: list[float]) -> dict[str, float]:
+    return {
+        "min": min(values),
+        "mean": sum(values) / len(values),
+        "p50": _percentile(values, 0.5),
+        "p90": _percentile(values, 0.9),
+        "p99": _percentile(values, 0.99),
+        "max": max(values),
+    }
+
+
+def _round_trip_plugins(
+    inputs: list[str] | None, outputs: list[str] | None
+) -> tuple[dict[str, SVSConverter], dict[str, SVSConverter]]:
+    plugins = plugin_registry.plugins("svs")
+    writable = {
+        identifier: plugin
+        for identifier, plugin in sorted(plugins.items())
+        if not issubclass(plugin, ReadOnlyConverterMixin)
+    }
+    # inputs are written by the plugin that reads them back
+    readable = {
+        identifier: plugin
+        for identifier, plugin in writable.items()
+        if not issubclass(plugin, WriteOnlyConverterMixin)
+    }
+    if inputs:
+        readable = {identifier: readable[identifier] for identifier in inputs}
+    if outputs:
+        writable = {identifier: writable[identifier] for identifier in outputs}
+    return readable, writable
+
+
+def _convert(
+    fs: UPath,
+    group: ConversionGroup,
+    input_plugin: SVSConverter,
+    output_plugin: SVSConverter,
+    language: str,
+) -> tuple[float, str, int]:
+    start = time.perf_counter()
+    result = convert_one_group(
+        fs,
+        ConversionMode.DIRECT,
+        0,
+        group,
+        input_plugin,
+        output_plugin,
+        input_plugin.input_option_cls().model_dump(),
+        output_plugin.output_option_cls().model_dump(),
+        MiddlewarePipeline(),
+        language,
+    )
+    elapsed = time.perf_counter() - start
+    remove_staged(fs / group.group_id)
+    return elapsed, "" if result.completed else result.error_message, result.output_bytes
+
+
+def bench_pair(
+    fs: UPath,
+    input_path: pathlib.Path,
+    input_plugin: SVSConverter,
+    output_plugin: SVSConverter,
+    note_count: int,
+    iterations: int,
+    warmup: int,
+    language: str,
+) -> PairResult:
+    result = PairResult(
+        input_plugin.name, output_plugin.name, input_bytes=input_path.stat().st_size
+    )
+    group = ConversionGroup(group_id="benchmark", file_paths=[str(input_path)])
+    for _ in range(warmup):
+        _, result.error_message, _ = _convert(fs, group, input_plugin, output_plugin, language)
+        if result.error_message:
+            return result
+    latencies = []
+    for _ in range(iterations):
+        elapsed, result.error_message, result.output_bytes = _convert(
+            fs, group, input_plugin, output_plugin, language
+        )
+        if result.error_message:
+            return result
+        latencies.append(elapsed)
+    # traced separately, tracemalloc slows down the timed runs
+    tracemalloc.start()
+    try:
+        _, result.error_message, _ = _convert(fs, group, input_plugin, output_plugin, language)
+        result.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    if result.error_message:
+        return result
+    result.completed = True
+    result.iterations = len(latencies)
+    if latencies:
+        result.latency_seconds = _latency(latencies)
+        result.notes_per_second = note_count / result.latency_seconds["p50"]
+    return result
+
+
+def run_benchmark(
+    size: ProjectSize,
+    iterations: int,
+    warmup: int,
+    language: str,
+    seed: int = 0,
+    inputs: list[str] | None = None,
+    outputs: list[str] | None = None,
+) -> dict[str, Any]:
+    # every iteration has to load its input
+    project_cache.max_bytes = 0
+    readable, writable = _round_trip_plugins(inputs, outputs)
+    project = synthetic_project(size, seed)
+    note_count = size.tracks * size.notes
+    pairs: list[PairResult] = []
+    with tempfile.TemporaryDirectory(prefix="libresvip-benchmark-") as work_dir:
+        input_dir = pathlib.Path(work_dir) / "inputs"
+        input_dir.mkdir()
+        fs = UPath(work_dir) / "outputs"
+        fs.mkdir()
+        for input_format, input_plugin in readable.items():
+            input_path = input_dir / f"input.{input_format}"
+            try:
+                input_plugin.dump(
+                    input_path,
+                    project.model_copy(deep=True),
+                    input_plugin.output_option_cls().model_dump(),
+                )
+            except Exception as e:
+                pairs.extend(
+                    PairResult(input_format, output_format, error_message=f"input not written: {e!r}")
+                    for output_format in writable
+                )
+                continue
+            for output_format, output_plugin in writable.items():
+                print(f"{input_format} -> {output_format}", file=sys.stderr)
+                try:
+                    pairs.append(
+                        bench_pair(
+                            fs, input_path, input_plugin, output_plugin, note_count, iterations, warmup, language
+                        )
+                    )
+                except Exception as e:
+                    pairs.append(PairResult(input_format, output_format, error_message=repr(e)))
+    return {
+        "version": _RESULTS_VERSION,
+        "libresvip_version": importlib.metadata.version("libresvip"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "size": dataclasses.asdict(size),
+        "iterations": iterations,
+        "warmup": warmup,
+        "seed": seed,
+        "pairs": [dataclasses.asdict(pair) for pair in pairs],
+    }
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Describe each pair that regressed against ``baseline`` by more than ``threshold``."""
+    previous = {
+        (pair["input_format"], pair["output_format"]): pair
+        for pair in baseline["pairs"]
+        if pair["completed"]
+    }
+    regressions = []
+    for pair in results["pairs"]:
+        name = f"{pair['input_format']} -> {pair['output_format']}"
+        if (before := previous.get((pair["input_format"], pair["output_format"]))) is None:
+            continue
+        if not pair["completed"]:
+            error = pair["error_message"].strip().splitlines()
+            regressions.append(f"{name}: no longer converts: {error[-1] if error else 'unknown error'}")
+            continue
+        for label, now, then in (
+            ("p50 latency", pair["latency_seconds"]["p50"], before["latency_seconds"]["p50"]),
+            ("peak memory", pair["peak_memory_bytes"], before["peak_memory_bytes"]),
+        ):
+            if then and now > then * (1 + threshold):
+                regressions.append(f"{name}: {label} {then:g} -> {now:g} (+{now / then - 1:.0%})")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="LibreSVIP Tauri conversion benchmark")
+    parser.add_argument("--tracks", type=int, default=ProjectSize.tracks, help="Singing tracks per project")
+    parser.add_argument("--notes", type=int, default=ProjectSize.notes, help="Notes per track")
+    parser.add_argument("--pitch-points", type=int, default=ProjectSize.pitch_points, help="Pitch points per track")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed conversions per pair")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed conversions per pair before the timed ones")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic project")
+    parser.add_argument("--language", default="en_US", help="Language of warnings and errors")
+    parser.add_argument("--inputs", nargs="*", help="Input plugins to benchmark, all by default")
+    parser.add_argument("--outputs", nargs="*", help="Output plugins to benchmark, all by default")
+    parser.add_argument("--output", type=pathlib.Path, help="File to write the results to as JSON")
+    parser.add_argument("--baseline", type=pathlib.Path, help="Results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Relative slowdown or memory growth reported as a regression")
+    args = parser.parse_args(argv)
+    size = ProjectSize(args.tracks, args.notes, args.pitch_points)
+    with LibreSVIPSettingsContainer.state.override_context_sync(
+        LibreSvipBaseUISettings.model_construct(lyric_replace_rules={"default": []})
+    ):
+        try:
+            results = run_benchmark(
+                size, args.iterations, args.warmup, args.language, args.seed, args.inputs, args.outputs
+            )
+        except KeyError as e:
+            parser.error(f"{e.args[0]} cannot be benchmarked as an input or output plugin")
+    output = json.dumps(results, indent=2)
+    if args.output is not None:
+        args.output.write_text(output, encoding="utf-8")
+    else:
+        print(output)
+    failed = [pair for pair in results["pairs"] if not pair["completed"]]
+    print(f"{len(results['pairs']) - len(failed)} pairs converted, {len(failed)} failed", file=sys.stderr)
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if regressions := compare(results, baseline, args.threshold):
+            print("\n".join(regressions), file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+import asyncio
+from collections.abc import Iterable
+
+from .conversion import CancelEvent
+from .engine import ConversionEngine
+
+
+class CancelScope:
+    """Cancellation state shared by the groups of one ``Convert`` stream."""
+
+    def __init__(self, engine: ConversionEngine) -> None:
+        self._engine = engine
+        self._all = False
+        self._group_ids: set[str] = set()
+        self._events: dict[str, CancelEvent] = {}
+        self._changed = asyncio.Event()
+
+    def is_cancelled(self, group_id: str) -> bool:
+        return self._all or group_id in self._group_ids
+
+    async def event(self, group_id: str) -> CancelEvent:
+        event = self._events[group_id] = await self._engine.create_event()
+        if self.is_cancelled(group_id):
+            self._engine.set_event(event)
+        return event
+
+    async def wait(self, group_id: str) -> None:
+        """Return once ``group_id`` is cancelled."""
+        while not self.is_cancelled(group_id):
+            await self._changed.wait()
+
+    def release(self, group_id: str) -> None:
+        self._events.pop(group_id, None)
+
+    def cancel(self, group_ids: Iterable[str] = ()) -> list[str]:
+        if group_ids := list(group_ids):
+            self._group_ids.update(group_ids)
+            targets = group_ids
+        else:
+            self._all = True
+            targets = list(self._events)
+        cancelled = []
+        for group_id in targets:
+            if event := self._events.get(group_id):
+                self._engine.set_event(event)
+            cancelled.append(group_id)
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+        return cancelled
@@ -0,0 +1,70 @@
+import dataclasses
+import enum
+import os
+
+
+class ExecutorKind(enum.Enum):
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+def _env_int(name: str) -> int | None:
+    if value := os.environ.get(name):
+        return int(value)
+    return None
+
+
+def _env_int_or(name: str, default: int) -> int:
+    # 0 is a setting of its own, often the one disabling a feature
+    if (value := _env_int(name)) is None:
+        return default
+    return value
+
+
+def _env_list(name: str, default: tuple[str, ...]) -> tuple[str, ...]:
+    # an empty value is an empty list rather than the default
+    if (value := os.environ.get(name)) is not None:
+        return tuple(item for item in value.split(",") if item)
+    return default
+
+
+@dataclasses.dataclass
+class ServerConfig:
+    executor: ExecutorKind = ExecutorKind.THREAD
+    max_workers: int | None = None
+    max_concurrency: int | None = None
+    queue_size: int = 64
+    spill_threshold: int = 4 * 1024 * 1024
+    memory_budget: int = 256 * 1024 * 1024
+    staging_ttl: int = 60 * 60
+    staging_max_bytes: int = 1024 * 1024 * 1024
+    warm_languages: tuple[str, ...] = ("en_US", "zh_CN")
+    # approximated by the size of the input files
+    project_cache_max_bytes: int = 32 * 1024 * 1024
+    profile: bool = False
+    progress_interval_ms: int = 500
+    # converted outputs are only cached on disk when this is set
+    output_cache_dir: str = ""
+    output_cache_max_bytes: int = 2 * 1024 * 1024 * 1024
+
+    @classmethod
+    def from_env(cls) -> "ServerConfig":
+        return cls(
+            executor=ExecutorKind(os.environ.get("LIBRESVIP_TAURI_EXECUTOR", ExecutorKind.THREAD.value)),
+            max_workers=_env_int("LIBRESVIP_TAURI_MAX_WORKERS"),
+            max_concurrency=_env_int("LIBRESVIP_TAURI_MAX_CONCURRENCY"),
+            queue_size=_env_int_or("LIBRESVIP_TAURI_QUEUE_SIZE", cls.queue_size),
+            spill_threshold=_env_int_or("LIBRESVIP_TAURI_SPILL_THRESHOLD", cls.spill_threshold),
+            memory_budget=_env_int_or("LIBRESVIP_TAURI_MEMORY_BUDGET", cls.memory_budget),
+            staging_ttl=_env_int_or("LIBRESVIP_TAURI_STAGING_TTL", cls.staging_ttl),
+            staging_max_bytes=_env_int_or("LIBRESVIP_TAURI_STAGING_MAX_BYTES", cls.staging_max_bytes),
+            warm_languages=_env_list("LIBRESVIP_TAURI_WARM_LANGUAGES", cls.warm_languages),
+            project_cache_max_bytes=_env_int_or("LIBRESVIP_TAURI_PROJECT_CACHE_MAX_BYTES", cls.project_cache_max_bytes),
+            profile=bool(_env_int("LIBRESVIP_TAURI_PROFILE")),
+            progress_interval_ms=_env_int_or("LIBRESVIP_TAURI_PROGRESS_INTERVAL_MS", cls.progress_interval_ms),
+            output_cache_dir=os.environ.get("LIBRESVIP_TAURI_OUTPUT_CACHE_DIR", cls.output_cache_dir),
+            output_cache_max_bytes=_env_int_or("LIBRESVIP_TAURI_OUTPUT_CACHE_MAX_BYTES", cls.output_cache_max_bytes),
+        )
+
+
+server_config = ServerConfig.from_env()
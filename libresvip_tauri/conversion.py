@@ -0,0 +1,368 @@
+import contextlib
+import dataclasses
+import pathlib
+import traceback
+from collections.abc import MutableMapping
+from typing import Protocol
+
+from libresvip.core.warning_types import CatchWarnings
+from libresvip.extension.base import OptionsDict, SVSConverter
+from libresvip.model.base import Project
+from libresvip.utils.translation import lazy_translation
+from upath import UPath
+
+from .libresvip_tauri_pb import ConversionGroup, ConversionMode, SingleConversionResult, StageTiming
+from .metrics import timed
+from .pipeline import MiddlewarePipeline
+from .project_cache import project_cache
+from .registry import plugin_registry
+from .staging import remove_staged, staged_name
+
+
+class CancelEvent(Protocol):
+    def is_set(self) -> bool: ...
+
+    def set(self) -> None: ...
+
+
+# stages a worker has finished for a group, counted under "loaded",
+# "merged", "processed" and "split"; read by ``progress.ProgressReporter``
+Progress = MutableMapping[str, int]
+
+
+def _advance(progress: Progress | None, stage: str) -> None:
+    if progress is not None:
+        progress[stage] = progress.get(stage, 0) + 1
+
+
+@dataclasses.dataclass
+class LoadedChild:
+    """One input of a ``MERGE`` group, loaded on its own worker."""
+
+    project: Project | None = None
+    warning_messages: list[str] = dataclasses.field(default_factory=list)
+    error_message: str = ""
+    cancelled: bool = False
+    timings: list[StageTiming] = dataclasses.field(default_factory=list)
+    input_bytes: int = 0
+
+
+def _load(
+    input_plugin: SVSConverter,
+    file_path: str,
+    input_options: OptionsDict,
+    timings: list[StageTiming],
+) -> tuple[Project, list[str], int]:
+    path = pathlib.Path(file_path)
+    with timed(timings, "load"):
+        project, warning_messages = project_cache.load(input_plugin, path, input_options)
+    return project, warning_messages, path.stat().st_size
+
+
+def _staged_bytes(path: UPath) -> int:
+    with contextlib.suppress(FileNotFoundError):
+        return path.fs.du(path.path)
+    return 0
+
+
+def load_child(
+    input_plugin: SVSConverter,
+    file_path: str,
+    input_options: OptionsDict,
+    language: str,
+    cancel_event: CancelEvent | None = None,
+) -> LoadedChild:
+    if cancel_event is not None and cancel_event.is_set():
+        return LoadedChild(cancelled=True)
+    lazy_translation.set(plugin_registry.translation(language))
+    child = LoadedChild()
+    try:
+        child.project, child.warning_messages, child.input_bytes = _load(
+            input_plugin, file_path, input_options, child.timings
+        )
+    except Exception:
+        child.error_message = traceback.format_exc()
+    return child
+
+
+def _cancelled_result(fs: UPath, result: SingleConversionResult) -> SingleConversionResult:
+    remove_staged(fs / staged_name(result.group_id, result.target_id))
+    result.completed = False
+    result.cancelled = True
+    return result
+
+
+def _prepare_project(
+    mode: ConversionMode,
+    group: ConversionGroup,
+    input_plugin: SVSConverter,
+    input_options: OptionsDict,
+    pipeline: MiddlewarePipeline,
+    result: SingleConversionResult,
+    cancel_event: CancelEvent | None,
+    children: list[LoadedChild] | None,
+    progress: Progress | None = None,
+) -> Project | None:
+    def cancelled() -> bool:
+        if cancel_event is not None and cancel_event.is_set():
+            result.cancelled = True
+        return result.cancelled
+
+    project = None
+    if children is not None:
+        # the inputs of a merge were loaded in parallel beforehand
+        for child in children:
+            result.warning_messages.extend(child.warning_messages)
+            result.timings.extend(child.timings)
+            result.input_bytes += child.input_bytes
+        with timed(result.timings, "merge"):
+            project = Project.merge_projects([child.project for child in children])
+        _advance(progress, "merged")
+    elif mode == ConversionMode.MERGE:
+        child_projects = []
+        for file_path in group.file_paths:
+            if cancelled():
+                return None
+            try:
+                child_project, warning_messages, input_bytes = _load(
+                    input_plugin, file_path, input_options, result.timings
+                )
+                child_projects.append(child_project)
+                result.warning_messages.extend(warning_messages)
+                result.input_bytes += input_bytes
+                _advance(progress, "loaded")
+            except Exception:
+                result.completed = False
+                result.error_message = traceback.format_exc()
+                project = None
+                break
+        else:
+            with timed(result.timings, "merge"):
+                project = Project.merge_projects(child_projects)
+            _advance(progress, "merged")
+    else:
+        if cancelled():
+            return None
+        file_path = group.file_paths[0]
+        try:
+            project, warning_messages, result.input_bytes = _load(
+                input_plugin, file_path, input_options, result.timings
+            )
+            result.warning_messages.extend(warning_messages)
+            _advance(progress, "loaded")
+        except Exception:
+            result.completed = False
+            result.error_message = traceback.format_exc()
+    if project is not None:
+        result.warning_messages.extend(pipeline.warning_messages)
+        for step in pipeline.steps:
+            if cancelled():
+                return None
+            try:
+                with timed(result.timings, f"middleware:{step.identifier}"), CatchWarnings() as w:
+                    project = step.process(project)
+                if w.output:
+                    result.warning_messages.append(w.output)
+                _advance(progress, "processed")
+            except Exception:
+                result.completed = False
+                result.error_message = traceback.format_exc()
+                project = None
+                break
+    return project
+
+
+def _dump_project(
+    fs: UPath,
+    mode: ConversionMode,
+    max_track_count: int,
+    project: Project,
+    output_plugin: SVSConverter,
+    output_options: OptionsDict,
+    result: SingleConversionResult,
+    cancel_event: CancelEvent | None,
+    progress: Progress | None = None,
+) -> SingleConversionResult:
+    def cancelled() -> bool:
+        return cancel_event is not None and cancel_event.is_set()
+
+    group_path = fs / staged_name(result.group_id, result.target_id)
+    if mode == ConversionMode.SPLIT:
+        group_path.mkdir(parents=True, exist_ok=True)
+        try:
+            with timed(result.timings, "split"):
+                sub_projects = project.split_tracks(max_track_count)
+        except Exception:
+            result.completed = False
+            result.error_message = traceback.format_exc()
+            return result
+        _advance(progress, "split")
+        with timed(result.timings, "dump"):
+            for i, sub_proj in enumerate(sub_projects):
+                if cancelled():
+                    return _cancelled_result(fs, result)
+                child_path = group_path / str(i)
+                try:
+                    with CatchWarnings() as w:
+                        output_plugin.dump(child_path, sub_proj, output_options)
+                    if w.output:
+                        result.warning_messages.append(w.output)
+                except Exception:
+                    result.completed = False
+                    result.error_message = traceback.format_exc()
+                    break
+            else:
+                result.completed = True
+    else:
+        if cancelled():
+            return _cancelled_result(fs, result)
+        child_path = group_path
+        try:
+            with timed(result.timings, "dump"):
+                output_plugin.dump(child_path, project, output_options)
+            result.completed = True
+        except Exception:
+            result.completed = False
+            result.error_message = traceback.format_exc()
+    if result.completed:
+        result.output_bytes = _staged_bytes(group_path)
+    return result
+
+
+def convert_one_group(
+    fs: UPath,
+    mode: ConversionMode,
+    max_track_count: int,
+    group: ConversionGroup,
+    input_plugin: SVSConverter,
+    output_plugin: SVSConverter,
+    input_options: OptionsDict,
+    output_options: OptionsDict,
+    pipeline: MiddlewarePipeline,
+    language: str,
+    cancel_event: CancelEvent | None = None,
+    target_id: str = "",
+    children: list[LoadedChild] | None = None,
+    progress: Progress | None = None,
+) -> SingleConversionResult:
+    lazy_translation.set(plugin_registry.translation(language))
+    result = SingleConversionResult(group_id=group.group_id, target_id=target_id, running=False)
+    project = _prepare_project(
+        mode, group, input_plugin, input_options, pipeline, result, cancel_event, children, progress
+    )
+    if result.cancelled:
+        return _cancelled_result(fs, result)
+    if project is None:
+        return result
+    return _dump_project(
+        fs, mode, max_track_count, project, output_plugin, output_options, result, cancel_event, progress
+    )
+
+
+def prepare_group(
+    mode: ConversionMode,
+    group: ConversionGroup,
+    input_plugin: SVSConverter,
+    input_options: OptionsDict,
+    pipeline: MiddlewarePipeline,
+    language: str,
+    cancel_event: CancelEvent | None = None,
+    children: list[LoadedChild] | None = None,
+    progress: Progress | None = None,
+) -> tuple[Project | None, SingleConversionResult]:
+    """Load a group and run the middlewares once for several output targets.
+
+    The result carries the warnings emitted so far; without a project it
+    also tells why, either an error message or ``cancelled``.
+    """
+    lazy_translation.set(plugin_registry.translation(language))
+    result = SingleConversionResult(group_id=group.group_id, running=False)
+    project = _prepare_project(
+        mode, group, input_plugin, input_options, pipeline, result, cancel_event, children, progress
+    )
+    return project, result
+
+
+def dump_target(
+    fs: UPath,
+    mode: ConversionMode,
+    max_track_count: int,
+    project: Project,
+    output_plugin: SVSConverter,
+    output_options: OptionsDict,
+    result: SingleConversionResult,
+    language: str,
+    cancel_event: CancelEvent | None = None,
+    copy_project: bool = False,
+) -> SingleConversionResult:
+    """Dump a project from ``prepare_group`` for the target named in ``result``.
+
+    Dumps of one project running in the same process at once must each
+    work on their own copy, as plugins may modify the project they dump.
+    """
+    lazy_translation.set(plugin_registry.translation(language))
+    if copy_project:
+        project = project.model_copy(deep=True)
+    return _dump_project(
+        fs, mode, max_track_count, project, output_plugin, output_options, result, cancel_event
+    )
+
+
+def prepare_parts(
+    mode: ConversionMode,
+    max_track_count: int,
+    group: ConversionGroup,
+    input_plugin: SVSConverter,
+    input_options: OptionsDict,
+    pipeline: MiddlewarePipeline,
+    language: str,
+    cancel_event: CancelEvent | None = None,
+    progress: Progress | None = None,
+) -> tuple[list[Project] | None, SingleConversionResult]:
+    """Like ``prepare_group``, then split the project into the parts of a ``SPLIT`` group."""
+    project, result = prepare_group(
+        mode, group, input_plugin, input_options, pipeline, language, cancel_event, None, progress
+    )
+    if project is None:
+        return None, result
+    try:
+        with timed(result.timings, "split"):
+            parts = project.split_tracks(max_track_count)
+        _advance(progress, "split")
+        return parts, result
+    except Exception:
+        result.error_message = traceback.format_exc()
+        return None, result
+
+
+def dump_part(
+    fs: UPath,
+    part: Project,
+    output_plugin: SVSConverter,
+    output_options: OptionsDict,
+    result: SingleConversionResult,
+    language: str,
+    cancel_event: CancelEvent | None = None,
+    copy_project: bool = False,
+) -> SingleConversionResult:
+    """Dump one part from ``prepare_parts`` for the group, target and part named in ``result``."""
+    if cancel_event is not None and cancel_event.is_set():
+        result.cancelled = True
+        return result
+    lazy_translation.set(plugin_registry.translation(language))
+    if copy_project:
+        part = part.model_copy(deep=True)
+    group_path = fs / staged_name(result.group_id, result.target_id)
+    group_path.mkdir(parents=True, exist_ok=True)
+    part_path = group_path / str(result.part_index)
+    try:
+        with timed(result.timings, "dump"), CatchWarnings() as w:
+            output_plugin.dump(part_path, part, output_options)
+        if w.output:
+            result.warning_messages.append(w.output)
+        result.completed = True
+        result.output_bytes = _staged_bytes(part_path)
+    except Exception:
+        result.completed = False
+        result.error_message = traceback.format_exc()
+    return result
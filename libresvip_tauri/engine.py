@@ -0,0 +1,165 @@
+import asyncio
+import contextlib
+import contextvars
+import multiprocessing
+import os
+import threading
+from collections.abc import AsyncIterator, Callable, MutableMapping
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.managers import SyncManager
+from functools import partial
+from typing import Any, TypeVar
+
+from libresvip.core.config import LibreSVIPSettingsContainer, LibreSvipBaseUISettings
+
+from .config import ExecutorKind, server_config
+from .conversion import CancelEvent
+from .fairness import FairQueue, FairStream, current_stream
+from .project_cache import project_cache
+
+T = TypeVar("T")
+
+
+def _init_worker(project_cache_max_bytes: int) -> None:
+    # plugin modules are imported as the calls sent to this worker need them
+    os.environ.setdefault("LIBRESVIP_SETTINGS_BACKEND", "remote")
+    # command line options are not seen by the spawned interpreter
+    project_cache.max_bytes = project_cache_max_bytes
+
+
+def _run_with_settings(
+    settings: LibreSvipBaseUISettings, func: Callable[..., T], *args: Any
+) -> T:
+    with LibreSVIPSettingsContainer.state.override_context_sync(settings):
+        return func(*args)
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[[], None]) -> None:
+    # the loop may already be closed when a worker finishes during shutdown
+    with contextlib.suppress(RuntimeError):
+        loop.call_soon_threadsafe(callback)
+
+
+class ConversionEngine:
+    def __init__(
+        self,
+        kind: ExecutorKind = ExecutorKind.THREAD,
+        max_workers: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> None:
+        self.kind = kind
+        self.max_concurrency = max_concurrency or max_workers or os.cpu_count() or 1
+        if kind == ExecutorKind.PROCESS:
+            self.max_workers = max_workers or os.cpu_count() or 1
+        else:
+            # the default of ThreadPoolExecutor
+            self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        # groups and the calls they make are both shared fairly between streams
+        self._slots = FairQueue(self.max_concurrency)
+        self._workers = FairQueue(self.max_workers)
+        self._default_stream = self.stream()
+        self._manager: SyncManager | None = None
+        self._executor: Executor
+        if kind == ExecutorKind.PROCESS:
+            self._mp_context = multiprocessing.get_context("spawn")
+            # started up front, spawning it would stall the first conversion
+            self._manager = self._mp_context.Manager()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self._mp_context,
+                initializer=_init_worker,
+                initargs=(server_config.project_cache_max_bytes,),
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="libresvip-convert",
+            )
+
+    @property
+    def is_process(self) -> bool:
+        return self.kind == ExecutorKind.PROCESS
+
+    def stream(self, weight: float = 1) -> FairStream:
+        """A stream whose share of the engine is proportional to ``weight``.
+
+        Groups and calls started from a task with the stream set as
+        ``fairness.current_stream`` count against it.
+        """
+        return FairStream(weight)
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._slots.slot(current_stream.get() or self._default_stream):
+            yield
+
+    async def create_event(self) -> CancelEvent:
+        if self._manager is not None:
+            # creating a proxy is a round trip to the manager process
+            return await asyncio.to_thread(self._manager.Event)
+        return threading.Event()
+
+    def set_event(self, event: CancelEvent) -> None:
+        """Set an event from ``create_event`` without waiting for the manager on the event loop."""
+        if self._manager is None:
+            event.set()
+            return
+        future = asyncio.get_running_loop().run_in_executor(None, event.set)
+        # the manager is gone at shutdown, and so are the workers to stop
+        future.add_done_callback(lambda future: future.cancelled() or future.exception())
+
+    async def create_progress(self) -> MutableMapping[str, int]:
+        """A mapping workers can report progress to, see ``conversion.Progress``."""
+        if self._manager is not None:
+            return await asyncio.to_thread(self._manager.dict)
+        return {}
+
+    async def run(
+        self,
+        settings: LibreSvipBaseUISettings,
+        func: Callable[..., T],
+        *args: Any,
+        cancel_event: CancelEvent | None = None,
+        on_cancel: Callable[[], None] | None = None,
+    ) -> T:
+        """Run ``func`` on a worker and wait for its result.
+
+        Calls wait for a free worker before being submitted, so the
+        executor's own queue never holds a backlog that calls of other
+        streams would have to wait behind.
+
+        If the caller is cancelled, a call that has not started yet is dropped;
+        a running one is asked to stop through ``cancel_event`` and
+        ``on_cancel`` is invoked once the worker has let go of it.
+        """
+        if self.is_process:
+            # settings overrides are process-local, so they travel with the call
+            call = partial(_run_with_settings, settings, func, *args)
+        else:
+            call = partial(contextvars.copy_context().run, func, *args)
+        try:
+            await self._workers.acquire(current_stream.get() or self._default_stream)
+        except asyncio.CancelledError:
+            if on_cancel is not None:
+                on_cancel()
+            raise
+        try:
+            future: Future[T] = self._executor.submit(call)
+        except BaseException:
+            self._workers.release()
+            raise
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda _: _call_soon(loop, self._workers.release))
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if cancel_event is not None:
+                self.set_event(cancel_event)
+            if on_cancel is not None:
+                future.add_done_callback(lambda _: on_cancel())
+            raise
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._manager is not None:
+            self._manager.shutdown()
@@ -0,0 +1,90 @@
+import asyncio
+import collections
+import contextlib
+import contextvars
+import weakref
+from collections.abc import AsyncIterator
+
+
+class FairStream:
+    """A source of work sharing a ``FairQueue`` with others, such as a ``Convert`` stream."""
+
+    def __init__(self, weight: float) -> None:
+        self.weight = weight
+
+
+# the stream work started from the current task belongs to
+current_stream: contextvars.ContextVar[FairStream | None] = contextvars.ContextVar(
+    "current_stream", default=None
+)
+
+
+class FairQueue:
+    """Shares ``size`` slots between streams in proportion to their weights.
+
+    Slots are handed out with stride scheduling: each grant advances the
+    stream's pass by ``1 / weight`` and a freed slot goes to the waiting
+    stream with the lowest pass. A stream that starts waiting catches up to
+    the pass of the last grant, so it neither jumps ahead of the others for
+    having been idle nor queues behind the backlog of a large batch.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._free = size
+        self._waiting: dict[FairStream, collections.deque[asyncio.Future[None]]] = {}
+        self._passes: weakref.WeakKeyDictionary[FairStream, float] = weakref.WeakKeyDictionary()
+        self._virtual_time = 0.0
+
+    def _activate(self, stream: FairStream) -> None:
+        self._passes[stream] = max(self._passes.get(stream, 0.0), self._virtual_time)
+
+    def _grant(self, stream: FairStream) -> None:
+        self._free -= 1
+        self._virtual_time = max(self._virtual_time, self._passes[stream])
+        self._passes[stream] = self._virtual_time + 1 / stream.weight
+
+    def _wake(self) -> None:
+        while self._free > 0 and self._waiting:
+            stream = min(self._waiting, key=self._passes.__getitem__)
+            waiters = self._waiting[stream]
+            waiter = waiters.popleft()
+            if not waiters:
+                del self._waiting[stream]
+            if not waiter.done():
+                self._grant(stream)
+                waiter.set_result(None)
+
+    async def acquire(self, stream: FairStream) -> None:
+        if self._free > 0 and not self._waiting:
+            self._activate(stream)
+            self._grant(stream)
+            return
+        if stream not in self._waiting:
+            self._activate(stream)
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(stream, collections.deque()).append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # granted just before being cancelled
+                self.release()
+            elif (waiters := self._waiting.get(stream)) is not None:
+                with contextlib.suppress(ValueError):
+                    waiters.remove(waiter)
+                if not waiters:
+                    del self._waiting[stream]
+            raise
+
+    def release(self) -> None:
+        self._free += 1
+        self._wake()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, stream: FairStream) -> AsyncIterator[None]:
+        await self.acquire(stream)
+        try:
+            yield
+        finally:
+            self.release()
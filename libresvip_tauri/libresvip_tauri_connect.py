@@ -14,7 +14,7 @@ from connectrpc.errors import ConnectError
 from connectrpc.method import IdempotencyLevel, MethodInfo
 from connectrpc.server import ConnectASGIApplication, Endpoint
 
-from .libresvip_tauri_pb import ConversionRequest, MoveFileRequest, MoveFileResponse, PluginInfosRequest, PluginInfosResponse, SingleConversionResult, VersionRequest, VersionResponse
+from .libresvip_tauri_pb import CancelConversionRequest, CancelConversionResponse, ConversionRequest, GetProfileRequest, GetProfileResponse, MoveFileRequest, MoveFileResponse, MoveFilesRequest, PluginInfosRequest, PluginInfosResponse, SingleConversionResult, VersionRequest, VersionResponse
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator, AsyncIterator, Iterable, Mapping
@@ -38,6 +38,15 @@ class Conversion(Protocol):
     def move_file(self, request: MoveFileRequest, ctx: RequestContext[MoveFileRequest, MoveFileResponse]) -> AsyncIterator[MoveFileResponse]:
         raise ConnectError(Code.UNIMPLEMENTED, 'Not implemented')
 
+    async def cancel_conversion(self, request: CancelConversionRequest, ctx: RequestContext[CancelConversionRequest, CancelConversionResponse]) -> CancelConversionResponse:
+        raise ConnectError(Code.UNIMPLEMENTED, 'Not implemented')
+
+    def move_files(self, request: MoveFilesRequest, ctx: RequestContext[MoveFilesRequest, MoveFileResponse]) -> AsyncIterator[MoveFileResponse]:
+        raise ConnectError(Code.UNIMPLEMENTED, 'Not implemented')
+
+    async def get_profile(self, request: GetProfileRequest, ctx: RequestContext[GetProfileRequest, GetProfileResponse]) -> GetProfileResponse:
+        raise ConnectError(Code.UNIMPLEMENTED, 'Not implemented')
+
 
 class ConversionASGIApplication(ConnectASGIApplication[Conversion]):
     def __init__(
@@ -92,6 +101,36 @@ class ConversionASGIApplication(ConnectASGIApplication[Conversion]):
                     ),
                     function=svc.move_file,
                 ),
+                "/LibreSVIP.Conversion/CancelConversion": Endpoint.unary(
+                    method=MethodInfo(
+                        name="CancelConversion",
+                        service_name="LibreSVIP.Conversion",
+                        input=CancelConversionRequest,
+                        output=CancelConversionResponse,
+                        idempotency_level=IdempotencyLevel.UNKNOWN,
+                    ),
+                    function=svc.cancel_conversion,
+                ),
+                "/LibreSVIP.Conversion/MoveFiles": Endpoint.server_stream(
+                    method=MethodInfo(
+                        name="MoveFiles",
+                        service_name="LibreSVIP.Conversion",
+                        input=MoveFilesRequest,
+                        output=MoveFileResponse,
+                        idempotency_level=IdempotencyLevel.UNKNOWN,
+                    ),
+                    function=svc.move_files,
+                ),
+                "/LibreSVIP.Conversion/GetProfile": Endpoint.unary(
+                    method=MethodInfo(
+                        name="GetProfile",
+                        service_name="LibreSVIP.Conversion",
+                        input=GetProfileRequest,
+                        output=GetProfileResponse,
+                        idempotency_level=IdempotencyLevel.UNKNOWN,
+                    ),
+                    function=svc.get_profile,
+                ),
             },
             interceptors=interceptors,
             read_max_bytes=read_max_bytes,
@@ -185,3 +224,63 @@ class ConversionClient(ConnectClient):
             headers=headers,
             timeout_ms=timeout_ms,
         )
+
+    async def cancel_conversion(
+        self,
+        request: CancelConversionRequest,
+        *,
+        headers: Headers | Mapping[str, str] | None = None, 
+        timeout_ms: int | None = None,
+    ) -> CancelConversionResponse:
+        return await self.execute_unary(
+            request=request,
+            method=MethodInfo(
+                name="CancelConversion",
+                service_name="LibreSVIP.Conversion",
+                input=CancelConversionRequest,
+                output=CancelConversionResponse,
+                idempotency_level=IdempotencyLevel.UNKNOWN,
+            ),
+            headers=headers,
+            timeout_ms=timeout_ms,
+        )
+
+    def move_files(
+        self,
+        request: MoveFilesRequest,
+        *,
+        headers: Headers | Mapping[str, str] | None = None, 
+        timeout_ms: int | None = None,
+    ) -> AsyncIterator[MoveFileResponse]:
+        return self.execute_server_stream(
+            request=request,
+            method=MethodInfo(
+                name="MoveFiles",
+                service_name="LibreSVIP.Conversion",
+                input=MoveFilesRequest,
+                output=MoveFileResponse,
+                idempotency_level=IdempotencyLevel.UNKNOWN,
+            ),
+            headers=headers,
+            timeout_ms=timeout_ms,
+        )
+
+    async def get_profile(
+        self,
+        request: GetProfileRequest,
+        *,
+        headers: Headers | Mapping[str, str] | None = None, 
+        timeout_ms: int | None = None,
+    ) -> GetProfileResponse:
+        return await self.execute_unary(
+            request=request,
+            method=MethodInfo(
+                name="GetProfile",
+                service_name="LibreSVIP.Conversion",
+                input=GetProfileRequest,
+                output=GetProfileResponse,
+                idempotency_level=IdempotencyLevel.UNKNOWN,
+            ),
+            headers=headers,
+            timeout_ms=timeout_ms,
+        )
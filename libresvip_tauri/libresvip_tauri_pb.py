@@ -203,7 +203,7 @@ class PluginInfo(Message[_PluginInfoFields]):
         ui_json_schema: str
         default_json_value: str
 
-_PluginInfosRequestFields: TypeAlias = Literal["category", "language"]
+_PluginInfosRequestFields: TypeAlias = Literal["category", "language", "identifiers"]
 
 class PluginInfosRequest(Message[_PluginInfosRequestFields]):
     """
@@ -220,9 +220,16 @@ class PluginInfosRequest(Message[_PluginInfosRequestFields]):
             ```proto
             string language = 2;
             ```
+        identifiers:
+            only these plugins, each imported on demand; every plugin of the
+            category when empty
+
+            ```proto
+            repeated string identifiers = 3;
+            ```
     """
 
-    __slots__ = ("category", "language")
+    __slots__ = ("category", "language", "identifiers")
 
     if TYPE_CHECKING:
 
@@ -231,11 +238,13 @@ class PluginInfosRequest(Message[_PluginInfosRequestFields]):
             *,
             category: PluginCategory | None = None,
             language: str = "",
+            identifiers: list[str] | None = None,
         ) -> None:
             pass
 
         category: PluginCategory
         language: str
+        identifiers: list[str]
 
 _PluginInfosResponseFields: TypeAlias = Literal["values"]
 
@@ -265,7 +274,7 @@ class PluginInfosResponse(Message[_PluginInfosResponseFields]):
 
         values: list[PluginInfo]
 
-_ConversionGroupFields: TypeAlias = Literal["group_id", "file_paths"]
+_ConversionGroupFields: TypeAlias = Literal["group_id", "file_paths", "stem"]
 
 class ConversionGroup(Message[_ConversionGroupFields]):
     """
@@ -282,9 +291,16 @@ class ConversionGroup(Message[_ConversionGroupFields]):
             ```proto
             repeated string file_paths = 2;
             ```
+        stem:
+            file name of the outputs written to ConversionRequest.output_dir,
+            without suffix; the stem of the first file when empty
+
+            ```proto
+            string stem = 3;
+            ```
     """
 
-    __slots__ = ("group_id", "file_paths")
+    __slots__ = ("group_id", "file_paths", "stem")
 
     if TYPE_CHECKING:
 
@@ -293,13 +309,57 @@ class ConversionGroup(Message[_ConversionGroupFields]):
             *,
             group_id: str = "",
             file_paths: list[str] | None = None,
+            stem: str = "",
         ) -> None:
             pass
 
         group_id: str
         file_paths: list[str]
+        stem: str
+
+_OutputTargetFields: TypeAlias = Literal["target_id", "output_format", "output_options"]
+
+class OutputTarget(Message[_OutputTargetFields]):
+    """
+    ```proto
+    message LibreSVIP.OutputTarget
+    ```
+
+    Attributes:
+        target_id:
+            defaults to output_format, must be unique within a request
+
+            ```proto
+            string target_id = 1;
+            ```
+        output_format:
+            ```proto
+            string output_format = 2;
+            ```
+        output_options:
+            ```proto
+            string output_options = 3;
+            ```
+    """
+
+    __slots__ = ("target_id", "output_format", "output_options")
+
+    if TYPE_CHECKING:
+
+        def __init__(
+            self,
+            *,
+            target_id: str = "",
+            output_format: str = "",
+            output_options: str = "",
+        ) -> None:
+            pass
+
+        target_id: str
+        output_format: str
+        output_options: str
 
-_ConversionRequestFields: TypeAlias = Literal["input_format", "output_format", "mode", "max_track_count", "groups", "input_options", "output_options", "middleware_options", "language", "lyric_replace_rules"]
+_ConversionRequestFields: TypeAlias = Literal["input_format", "output_format", "mode", "max_track_count", "groups", "input_options", "output_options", "middleware_options", "language", "lyric_replace_rules", "conversion_id", "outputs", "profile", "priority", "output_dir", "conflict_policy"]
 
 class ConversionRequest(Message[_ConversionRequestFields]):
     """
@@ -348,9 +408,44 @@ class ConversionRequest(Message[_ConversionRequestFields]):
             ```proto
             repeated LibreSVIP.LyricsReplacementGroup lyric_replace_rules = 10;
             ```
+        conversion_id:
+            ```proto
+            string conversion_id = 11;
+            ```
+        outputs:
+            when set, every group is loaded once and dumped to each target;
+            output_format and output_options are then ignored
+
+            ```proto
+            repeated LibreSVIP.OutputTarget outputs = 12;
+            ```
+        profile:
+            profile every group, the reports are fetched with GetProfile
+
+            ```proto
+            bool profile = 13;
+            ```
+        priority:
+            share of the server given to this conversion while others are running
+
+            ```proto
+            LibreSVIP.ConversionPriority priority = 14;
+            ```
+        output_dir:
+            when set, outputs are written to this directory as they are done
+            instead of being staged for MoveFile; conflicts with existing files are
+            resolved by conflict_policy, which cannot be PROMPT
+
+            ```proto
+            string output_dir = 15;
+            ```
+        conflict_policy:
+            ```proto
+            LibreSVIP.ConflictPolicy conflict_policy = 16;
+            ```
     """
 
-    __slots__ = ("input_format", "output_format", "mode", "max_track_count", "groups", "input_options", "output_options", "middleware_options", "language", "lyric_replace_rules")
+    __slots__ = ("input_format", "output_format", "mode", "max_track_count", "groups", "input_options", "output_options", "middleware_options", "language", "lyric_replace_rules", "conversion_id", "outputs", "profile", "priority", "output_dir", "conflict_policy")
 
     if TYPE_CHECKING:
 
@@ -367,6 +462,12 @@ class ConversionRequest(Message[_ConversionRequestFields]):
             middleware_options: dict[str, str] | None = None,
             language: str = "",
             lyric_replace_rules: list[LyricsReplacementGroup] | None = None,
+            conversion_id: str = "",
+            outputs: list[OutputTarget] | None = None,
+            profile: bool = False,
+            priority: ConversionPriority | None = None,
+            output_dir: str = "",
+            conflict_policy: ConflictPolicy | None = None,
         ) -> None:
             pass
 
@@ -380,8 +481,56 @@ class ConversionRequest(Message[_ConversionRequestFields]):
         middleware_options: dict[str, str]
         language: str
         lyric_replace_rules: list[LyricsReplacementGroup]
+        conversion_id: str
+        outputs: list[OutputTarget]
+        profile: bool
+        priority: ConversionPriority
+        output_dir: str
+        conflict_policy: ConflictPolicy
+
+_StageTimingFields: TypeAlias = Literal["stage", "wall_seconds", "cpu_seconds"]
+
+class StageTiming(Message[_StageTimingFields]):
+    """
+    ```proto
+    message LibreSVIP.StageTiming
+    ```
+
+    Attributes:
+        stage:
+            load, merge, middleware:<identifier>, split, dump or move
+
+            ```proto
+            string stage = 1;
+            ```
+        wall_seconds:
+            ```proto
+            double wall_seconds = 2;
+            ```
+        cpu_seconds:
+            ```proto
+            double cpu_seconds = 3;
+            ```
+    """
+
+    __slots__ = ("stage", "wall_seconds", "cpu_seconds")
+
+    if TYPE_CHECKING:
 
-_SingleConversionResultFields: TypeAlias = Literal["group_id", "running", "completed", "error_message", "warning_messages"]
+        def __init__(
+            self,
+            *,
+            stage: str = "",
+            wall_seconds: float = 0,
+            cpu_seconds: float = 0,
+        ) -> None:
+            pass
+
+        stage: str
+        wall_seconds: float
+        cpu_seconds: float
+
+_SingleConversionResultFields: TypeAlias = Literal["group_id", "running", "completed", "error_message", "warning_messages", "cancelled", "target_id", "part_count", "part_index", "timings", "input_bytes", "output_bytes", "progress", "elapsed_seconds", "stage", "output_path", "skipped"]
 
 class SingleConversionResult(Message[_SingleConversionResultFields]):
     """
@@ -410,9 +559,70 @@ class SingleConversionResult(Message[_SingleConversionResultFields]):
             ```proto
             repeated string warning_messages = 5;
             ```
+        cancelled:
+            ```proto
+            bool cancelled = 6;
+            ```
+        target_id:
+            ```proto
+            string target_id = 7;
+            ```
+        part_count:
+            SPLIT groups stream a running result per written part before the
+            result for the whole group, which sets part_count as well
+
+            ```proto
+            int32 part_count = 8;
+            ```
+        part_index:
+            ```proto
+            int32 part_index = 9;
+            ```
+        timings:
+            ```proto
+            repeated LibreSVIP.StageTiming timings = 10;
+            ```
+        input_bytes:
+            ```proto
+            int64 input_bytes = 11;
+            ```
+        output_bytes:
+            ```proto
+            int64 output_bytes = 12;
+            ```
+        progress:
+            progress events are running results for the whole group, without a
+            target_id, sent at most once per progress interval while it converts
+
+            ```proto
+            double progress = 13;
+            ```
+        elapsed_seconds:
+            ```proto
+            double elapsed_seconds = 14;
+            ```
+        stage:
+            load, merge, middleware:<identifier>, split or dump
+
+            ```proto
+            string stage = 15;
+            ```
+        output_path:
+            where the output, or the part, was written with ConversionRequest.output_dir
+
+            ```proto
+            string output_path = 16;
+            ```
+        skipped:
+            set along with completed when ConflictPolicy.SKIP kept the existing
+            file at output_path instead of writing the output
+
+            ```proto
+            bool skipped = 17;
+            ```
     """
 
-    __slots__ = ("group_id", "running", "completed", "error_message", "warning_messages")
+    __slots__ = ("group_id", "running", "completed", "error_message", "warning_messages", "cancelled", "target_id", "part_count", "part_index", "timings", "input_bytes", "output_bytes", "progress", "elapsed_seconds", "stage", "output_path", "skipped")
 
     if TYPE_CHECKING:
 
@@ -424,6 +634,18 @@ class SingleConversionResult(Message[_SingleConversionResultFields]):
             completed: bool = False,
             error_message: str = "",
             warning_messages: list[str] | None = None,
+            cancelled: bool = False,
+            target_id: str = "",
+            part_count: int = 0,
+            part_index: int = 0,
+            timings: list[StageTiming] | None = None,
+            input_bytes: int = 0,
+            output_bytes: int = 0,
+            progress: float = 0,
+            elapsed_seconds: float = 0,
+            stage: str = "",
+            output_path: str = "",
+            skipped: bool = False,
         ) -> None:
             pass
 
@@ -432,6 +654,18 @@ class SingleConversionResult(Message[_SingleConversionResultFields]):
         completed: bool
         error_message: str
         warning_messages: list[str]
+        cancelled: bool
+        target_id: str
+        part_count: int
+        part_index: int
+        timings: list[StageTiming]
+        input_bytes: int
+        output_bytes: int
+        progress: float
+        elapsed_seconds: float
+        stage: str
+        output_path: str
+        skipped: bool
 
 _VersionRequestFields: TypeAlias = NoReturn
 
@@ -451,7 +685,7 @@ class VersionRequest(Message[_VersionRequestFields]):
         ) -> None:
             pass
 
-_VersionResponseFields: TypeAlias = Literal["version"]
+_VersionResponseFields: TypeAlias = Literal["version", "plugins_loaded"]
 
 class VersionResponse(Message[_VersionResponseFields]):
     """
@@ -464,9 +698,16 @@ class VersionResponse(Message[_VersionResponseFields]):
             ```proto
             string version = 1;
             ```
+        plugins_loaded:
+            set once every plugin has been imported; until then the server already
+            answers, importing the plugins a request needs on demand
+
+            ```proto
+            bool plugins_loaded = 2;
+            ```
     """
 
-    __slots__ = ("version",)
+    __slots__ = ("version", "plugins_loaded")
 
     if TYPE_CHECKING:
 
@@ -474,12 +715,14 @@ class VersionResponse(Message[_VersionResponseFields]):
             self,
             *,
             version: str = "",
+            plugins_loaded: bool = False,
         ) -> None:
             pass
 
         version: str
+        plugins_loaded: bool
 
-_MoveFileRequestFields: TypeAlias = Literal["group_id", "output_dir", "stem", "output_format", "conflict_policy", "force_overwrite"]
+_MoveFileRequestFields: TypeAlias = Literal["group_id", "output_dir", "stem", "output_format", "conflict_policy", "force_overwrite", "target_id", "parts"]
 
 class MoveFileRequest(Message[_MoveFileRequestFields]):
     """
@@ -512,9 +755,20 @@ class MoveFileRequest(Message[_MoveFileRequestFields]):
             ```proto
             bool force_overwrite = 6;
             ```
+        target_id:
+            ```proto
+            string target_id = 7;
+            ```
+        parts:
+            deliver only these parts of a SPLIT group, e.g. while later parts
+            are still being written
+
+            ```proto
+            repeated int32 parts = 8 [packed = true];
+            ```
     """
 
-    __slots__ = ("group_id", "output_dir", "stem", "output_format", "conflict_policy", "force_overwrite")
+    __slots__ = ("group_id", "output_dir", "stem", "output_format", "conflict_policy", "force_overwrite", "target_id", "parts")
 
     if TYPE_CHECKING:
 
@@ -527,6 +781,8 @@ class MoveFileRequest(Message[_MoveFileRequestFields]):
             output_format: str = "",
             conflict_policy: ConflictPolicy | None = None,
             force_overwrite: bool = False,
+            target_id: str = "",
+            parts: list[int] | None = None,
         ) -> None:
             pass
 
@@ -536,8 +792,10 @@ class MoveFileRequest(Message[_MoveFileRequestFields]):
         output_format: str
         conflict_policy: ConflictPolicy
         force_overwrite: bool
+        target_id: str
+        parts: list[int]
 
-_MoveFileResponseFields: TypeAlias = Literal["group_id", "output_path", "conflict_policy", "completed", "success", "error_message"]
+_MoveFileResponseFields: TypeAlias = Literal["group_id", "output_path", "conflict_policy", "completed", "success", "error_message", "target_id", "timings"]
 
 class MoveFileResponse(Message[_MoveFileResponseFields]):
     """
@@ -570,9 +828,17 @@ class MoveFileResponse(Message[_MoveFileResponseFields]):
             ```proto
             string error_message = 6;
             ```
+        target_id:
+            ```proto
+            string target_id = 7;
+            ```
+        timings:
+            ```proto
+            repeated LibreSVIP.StageTiming timings = 8;
+            ```
     """
 
-    __slots__ = ("group_id", "output_path", "conflict_policy", "completed", "success", "error_message")
+    __slots__ = ("group_id", "output_path", "conflict_policy", "completed", "success", "error_message", "target_id", "timings")
 
     if TYPE_CHECKING:
 
@@ -585,6 +851,8 @@ class MoveFileResponse(Message[_MoveFileResponseFields]):
             completed: bool = False,
             success: bool = False,
             error_message: str = "",
+            target_id: str = "",
+            timings: list[StageTiming] | None = None,
         ) -> None:
             pass
 
@@ -594,6 +862,268 @@ class MoveFileResponse(Message[_MoveFileResponseFields]):
         completed: bool
         success: bool
         error_message: str
+        target_id: str
+        timings: list[StageTiming]
+
+_MoveFilesEntryFields: TypeAlias = Literal["group_id", "stem", "output_format", "target_id", "parts"]
+
+class MoveFilesEntry(Message[_MoveFilesEntryFields]):
+    """
+    ```proto
+    message LibreSVIP.MoveFilesEntry
+    ```
+
+    Attributes:
+        group_id:
+            ```proto
+            string group_id = 1;
+            ```
+        stem:
+            ```proto
+            string stem = 2;
+            ```
+        output_format:
+            ```proto
+            string output_format = 3;
+            ```
+        target_id:
+            ```proto
+            string target_id = 4;
+            ```
+        parts:
+            ```proto
+            repeated int32 parts = 5 [packed = true];
+            ```
+    """
+
+    __slots__ = ("group_id", "stem", "output_format", "target_id", "parts")
+
+    if TYPE_CHECKING:
+
+        def __init__(
+            self,
+            *,
+            group_id: str = "",
+            stem: str = "",
+            output_format: str = "",
+            target_id: str = "",
+            parts: list[int] | None = None,
+        ) -> None:
+            pass
+
+        group_id: str
+        stem: str
+        output_format: str
+        target_id: str
+        parts: list[int]
+
+_MoveFilesRequestFields: TypeAlias = Literal["entries", "output_dir", "conflict_policy", "force_overwrite"]
+
+class MoveFilesRequest(Message[_MoveFilesRequestFields]):
+    """
+    ```proto
+    message LibreSVIP.MoveFilesRequest
+    ```
+
+    Attributes:
+        entries:
+            ```proto
+            repeated LibreSVIP.MoveFilesEntry entries = 1;
+            ```
+        output_dir:
+            ```proto
+            string output_dir = 2;
+            ```
+        conflict_policy:
+            ```proto
+            LibreSVIP.ConflictPolicy conflict_policy = 3;
+            ```
+        force_overwrite:
+            ```proto
+            bool force_overwrite = 4;
+            ```
+    """
+
+    __slots__ = ("entries", "output_dir", "conflict_policy", "force_overwrite")
+
+    if TYPE_CHECKING:
+
+        def __init__(
+            self,
+            *,
+            entries: list[MoveFilesEntry] | None = None,
+            output_dir: str = "",
+            conflict_policy: ConflictPolicy | None = None,
+            force_overwrite: bool = False,
+        ) -> None:
+            pass
+
+        entries: list[MoveFilesEntry]
+        output_dir: str
+        conflict_policy: ConflictPolicy
+        force_overwrite: bool
+
+_CancelConversionRequestFields: TypeAlias = Literal["conversion_id", "group_ids"]
+
+class CancelConversionRequest(Message[_CancelConversionRequestFields]):
+    """
+    ```proto
+    message LibreSVIP.CancelConversionRequest
+    ```
+
+    Attributes:
+        conversion_id:
+            ```proto
+            string conversion_id = 1;
+            ```
+        group_ids:
+            cancel only these groups, or the whole conversion when empty
+
+            ```proto
+            repeated string group_ids = 2;
+            ```
+    """
+
+    __slots__ = ("conversion_id", "group_ids")
+
+    if TYPE_CHECKING:
+
+        def __init__(
+            self,
+            *,
+            conversion_id: str = "",
+            group_ids: list[str] | None = None,
+        ) -> None:
+            pass
+
+        conversion_id: str
+        group_ids: list[str]
+
+_CancelConversionResponseFields: TypeAlias = Literal["group_ids"]
+
+class CancelConversionResponse(Message[_CancelConversionResponseFields]):
+    """
+    ```proto
+    message LibreSVIP.CancelConversionResponse
+    ```
+
+    Attributes:
+        group_ids:
+            ```proto
+            repeated string group_ids = 1;
+            ```
+    """
+
+    __slots__ = ("group_ids",)
+
+    if TYPE_CHECKING:
+
+        def __init__(
+            self,
+            *,
+            group_ids: list[str] | None = None,
+        ) -> None:
+            pass
+
+        group_ids: list[str]
+
+_GetProfileRequestFields: TypeAlias = Literal["group_id", "target_id"]
+
+class GetProfileRequest(Message[_GetProfileRequestFields]):
+    """
+    ```proto
+    message LibreSVIP.GetProfileRequest
+    ```
+
+    Attributes:
+        group_id:
+            ```proto
+            string group_id = 1;
+            ```
+        target_id:
+            ```proto
+            string target_id = 2;
+            ```
+    """
+
+    __slots__ = ("group_id", "target_id")
+
+    if TYPE_CHECKING:
+
+        def __init__(
+            self,
+            *,
+            group_id: str = "",
+            target_id: str = "",
+        ) -> None:
+            pass
+
+        group_id: str
+        target_id: str
+
+_GetProfileResponseFields: TypeAlias = Literal["group_id", "target_id", "found", "pstats", "report", "allocations"]
+
+class GetProfileResponse(Message[_GetProfileResponseFields]):
+    """
+    ```proto
+    message LibreSVIP.GetProfileResponse
+    ```
+
+    Attributes:
+        group_id:
+            ```proto
+            string group_id = 1;
+            ```
+        target_id:
+            ```proto
+            string target_id = 2;
+            ```
+        found:
+            ```proto
+            bool found = 3;
+            ```
+        pstats:
+            cProfile statistics as written by pstats.Stats.dump_stats
+
+            ```proto
+            bytes pstats = 4;
+            ```
+        report:
+            functions sorted by cumulative time
+
+            ```proto
+            string report = 5;
+            ```
+        allocations:
+            largest allocations traced at the peak memory usage
+
+            ```proto
+            string allocations = 6;
+            ```
+    """
+
+    __slots__ = ("group_id", "target_id", "found", "pstats", "report", "allocations")
+
+    if TYPE_CHECKING:
+
+        def __init__(
+            self,
+            *,
+            group_id: str = "",
+            target_id: str = "",
+            found: bool = False,
+            pstats: bytes = b"",
+            report: str = "",
+            allocations: str = "",
+        ) -> None:
+            pass
+
+        group_id: str
+        target_id: str
+        found: bool
+        pstats: bytes
+        report: str
+        allocations: str
 
 class PluginCategory(Enum):
     """
@@ -675,6 +1205,31 @@ class ConflictPolicy(Enum):
     OVERWRITE = 2
     RENAME = 3
 
+class ConversionPriority(Enum):
+    """
+    ```proto
+    enum LibreSVIP.ConversionPriority
+    ```
+
+    Attributes:
+        NORMAL:
+            ```proto
+            NORMAL = 0
+            ```
+        LOW:
+            ```proto
+            LOW = 1
+            ```
+        HIGH:
+            ```proto
+            HIGH = 2
+            ```
+    """
+
+    NORMAL = 0
+    LOW = 1
+    HIGH = 2
+
 class LyricsReplaceMode(Enum):
     """
     ```proto
@@ -707,7 +1262,7 @@ class LyricsReplaceMode(Enum):
 
 
 _DESC = file_desc(
-    b'\n\x15libresvip_tauri.proto\x12\tLibreSVIP"\xee\x01\n\x11LyricsReplacement\x120\n\x04mode\x18\x01 \x01(\x0e2\x1c.LibreSVIP.LyricsReplaceModeR\x04mode\x12 \n\x0breplacement\x18\x02 \x01(\tR\x0breplacement\x12!\n\x0cpattern_main\x18\x03 \x01(\tR\x0bpatternMain\x12%\n\x0epattern_prefix\x18\x04 \x01(\tR\rpatternPrefix\x12%\n\x0epattern_suffix\x18\x05 \x01(\tR\rpatternSuffix\x12\x14\n\x05flags\x18\x06 \x01(\x05R\x05flags"m\n\x16LyricsReplacementGroup\x12\x1f\n\x0bpreset_name\x18\x01 \x01(\tR\npresetName\x122\n\x05rules\x18\x02 \x03(\x0b2\x1c.LibreSVIP.LyricsReplacementR\x05rules"\x81\x03\n\nPluginInfo\x12\x1e\n\nidentifier\x18\x01 \x01(\tR\nidentifier\x12\x12\n\x04name\x18\x02 \x01(\tR\x04name\x12\x18\n\x07version\x18\x03 \x01(\tR\x07version\x12 \n\x0bdescription\x18\x04 \x01(\tR\x0bdescription\x12\x16\n\x06author\x18\x05 \x01(\tR\x06author\x12\x18\n\x07website\x18\x06 \x01(\tR\x07website\x12\x1f\n\x0bjson_schema\x18\x07 \x01(\tR\njsonSchema\x12\x1f\n\x0bfile_format\x18\x08 \x01(\tR\nfileFormat\x12\x1a\n\x08suffixes\x18\t \x03(\tR\x08suffixes\x12\x1f\n\x0bicon_base64\x18\n \x01(\tR\niconBase64\x12$\n\x0eui_json_schema\x18\x0b \x01(\tR\x0cuiJsonSchema\x12,\n\x12default_json_value\x18\x0c \x01(\tR\x10defaultJsonValue"g\n\x12PluginInfosRequest\x125\n\x08category\x18\x01 \x01(\x0e2\x19.LibreSVIP.PluginCategoryR\x08category\x12\x1a\n\x08language\x18\x02 \x01(\tR\x08language"D\n\x13PluginInfosResponse\x12-\n\x06values\x18\x01 \x03(\x0b2\x15.LibreSVIP.PluginInfoR\x06values"K\n\x0fConversionGroup\x12\x19\n\x08group_id\x18\x01 \x01(\tR\x07groupId\x12\x1d\n\nfile_paths\x18\x02 \x03(\tR\tfilePaths"\xcb\x04\n\x11ConversionRequest\x12!\n\x0cinput_format\x18\x01 \x01(\tR\x0binputFormat\x12#\n\routput_format\x18\x02 \x01(\tR\x0coutputFormat\x12-\n\x04mode\x18\x03 \x01(\x0e2\x19.LibreSVIP.ConversionModeR\x04mode\x12&\n\x0fmax_track_count\x18\x04 \x01(\x05R\rmaxTrackCount\x122\n\x06groups\x18\x05 \x03(\x0b2\x1a.LibreSVIP.ConversionGroupR\x06groups\x12#\n\rinput_options\x18\x06 \x01(\tR\x0cinputOptions\x12%\n\x0eoutput_options\x18\x07 \x01(\tR\routputOptions\x12b\n\x12middleware_options\x18\x08 \x03(\x0b23.LibreSVIP.ConversionRequest.MiddlewareOptionsEntryR\x11middlewareOptions\x12\x1a\n\x08language\x18\t \x01(\tR\x08language\x12Q\n\x13lyric_replace_rules\x18\n \x03(\x0b2!.LibreSVIP.LyricsReplacementGroupR\x11lyricReplaceRules\x1aD\n\x16MiddlewareOptionsEntry\x12\x10\n\x03key\x18\x01 \x01(\tR\x03key\x12\x14\n\x05value\x18\x02 \x01(\tR\x05value:\x028\x01"\xbb\x01\n\x16SingleConversionResult\x12\x19\n\x08group_id\x18\x01 \x01(\tR\x07groupId\x12\x18\n\x07running\x18\x02 \x01(\x08R\x07running\x12\x1c\n\tcompleted\x18\x03 \x01(\x08R\tcompleted\x12#\n\rerror_message\x18\x04 \x01(\tR\x0cerrorMessage\x12)\n\x10warning_messages\x18\x05 \x03(\tR\x0fwarningMessages"\x10\n\x0eVersionRequest"+\n\x0fVersionResponse\x12\x18\n\x07version\x18\x01 \x01(\tR\x07version"\xf1\x01\n\x0fMoveFileRequest\x12\x19\n\x08group_id\x18\x01 \x01(\tR\x07groupId\x12\x1d\n\noutput_dir\x18\x02 \x01(\tR\toutputDir\x12\x12\n\x04stem\x18\x03 \x01(\tR\x04stem\x12#\n\routput_format\x18\x04 \x01(\tR\x0coutputFormat\x12B\n\x0fconflict_policy\x18\x05 \x01(\x0e2\x19.LibreSVIP.ConflictPolicyR\x0econflictPolicy\x12\'\n\x0fforce_overwrite\x18\x06 \x01(\x08R\x0eforceOverwrite"\xef\x01\n\x10MoveFileResponse\x12\x19\n\x08group_id\x18\x01 \x01(\tR\x07groupId\x12\x1f\n\x0boutput_path\x18\x02 \x01(\tR\noutputPath\x12B\n\x0fconflict_policy\x18\x03 \x01(\x0e2\x19.LibreSVIP.ConflictPolicyR\x0econflictPolicy\x12\x1c\n\tcompleted\x18\x04 \x01(\x08R\tcompleted\x12\x18\n\x07success\x18\x05 \x01(\x08R\x07success\x12#\n\rerror_message\x18\x06 \x01(\tR\x0cerrorMessage*7\n\x0ePluginCategory\x12\t\n\x05INPUT\x10\x00\x12\n\n\x06OUTPUT\x10\x01\x12\x0e\n\nMIDDLEWARE\x10\x02*2\n\x0eConversionMode\x12\n\n\x06DIRECT\x10\x00\x12\t\n\x05SPLIT\x10\x01\x12\t\n\x05MERGE\x10\x02*A\n\x0eConflictPolicy\x12\x08\n\x04SKIP\x10\x00\x12\n\n\x06PROMPT\x10\x01\x12\r\n\tOVERWRITE\x10\x02\x12\n\n\x06RENAME\x10\x03*L\n\x11LyricsReplaceMode\x12\x08\n\x04FULL\x10\x00\x12\x0e\n\nALPHABETIC\x10\x01\x12\x12\n\x0eNON_ALPHABETIC\x10\x02\x12\t\n\x05REGEX\x10\x032\xb1\x02\n\nConversion\x12L\n\x0bPluginInfos\x12\x1d.LibreSVIP.PluginInfosRequest\x1a\x1e.LibreSVIP.PluginInfosResponse\x12L\n\x07Convert\x12\x1c.LibreSVIP.ConversionRequest\x1a!.LibreSVIP.SingleConversionResult0\x01\x12@\n\x07Version\x12\x19.LibreSVIP.VersionRequest\x1a\x1a.LibreSVIP.VersionResponse\x12E\n\x08MoveFile\x12\x1a.LibreSVIP.MoveFileRequest\x1a\x1b.LibreSVIP.MoveFileResponse0\x01b\x06proto3',
+    b'\n\x15libresvip_tauri.proto\x12\tLibreSVIP"\xee\x01\n\x11LyricsReplacement\x120\n\x04mode\x18\x01 \x01(\x0e2\x1c.LibreSVIP.LyricsReplaceModeR\x04mode\x12 \n\x0breplacement\x18\x02 \x01(\tR\x0breplacement\x12!\n\x0cpattern_main\x18\x03 \x01(\tR\x0bpatternMain\x12%\n\x0epattern_prefix\x18\x04 \x01(\tR\rpatternPrefix\x12%\n\x0epattern_suffix\x18\x05 \x01(\tR\rpatternSuffix\x12\x14\n\x05flags\x18\x06 \x01(\x05R\x05flags"m\n\x16LyricsReplacementGroup\x12\x1f\n\x0bpreset_name\x18\x01 \x01(\tR\npresetName\x122\n\x05rules\x18\x02 \x03(\x0b2\x1c.LibreSVIP.LyricsReplacementR\x05rules"\x81\x03\n\nPluginInfo\x12\x1e\n\nidentifier\x18\x01 \x01(\tR\nidentifier\x12\x12\n\x04name\x18\x02 \x01(\tR\x04name\x12\x18\n\x07version\x18\x03 \x01(\tR\x07version\x12 \n\x0bdescription\x18\x04 \x01(\tR\x0bdescription\x12\x16\n\x06author\x18\x05 \x01(\tR\x06author\x12\x18\n\x07website\x18\x06 \x01(\tR\x07website\x12\x1f\n\x0bjson_schema\x18\x07 \x01(\tR\njsonSchema\x12\x1f\n\x0bfile_format\x18\x08 \x01(\tR\nfileFormat\x12\x1a\n\x08suffixes\x18\t \x03(\tR\x08suffixes\x12\x1f\n\x0bicon_base64\x18\n \x01(\tR\niconBase64\x12$\n\x0eui_json_schema\x18\x0b \x01(\tR\x0cuiJsonSchema\x12,\n\x12default_json_value\x18\x0c \x01(\tR\x10defaultJsonValue"\x89\x01\n\x12PluginInfosRequest\x125\n\x08category\x18\x01 \x01(\x0e2\x19.LibreSVIP.PluginCategoryR\x08category\x12\x1a\n\x08language\x18\x02 \x01(\tR\x08language\x12 \n\x0bidentifiers\x18\x03 \x03(\tR\x0bidentifiers"D\n\x13PluginInfosResponse\x12-\n\x06values\x18\x01 \x03(\x0b2\x15.LibreSVIP.PluginInfoR\x06values"_\n\x0fConversionGroup\x12\x19\n\x08group_id\x18\x01 \x01(\tR\x07groupId\x12\x1d\n\nfile_paths\x18\x02 \x03(\tR\tfilePaths\x12\x12\n\x04stem\x18\x03 \x01(\tR\x04stem"w\n\x0cOutputTarget\x12\x1b\n\ttarget_id\x18\x01 \x01(\tR\x08targetId\x12#\n\routput_format\x18\x02 \x01(\tR\x0coutputFormat\x12%\n\x0eoutput_options\x18\x03 \x01(\tR\routputOptions"\xdb\x06\n\x11ConversionRequest\x12!\n\x0cinput_format\x18\x01 \x01(\tR\x0binputFormat\x12#\n\routput_format\x18\x02 \x01(\tR\x0coutputFormat\x12-\n\x04mode\x18\x03 \x01(\x0e2\x19.LibreSVIP.ConversionModeR\x04mode\x12&\n\x0fmax_track_count\x18\x04 \x01(\x05R\rmaxTrackCount\x122\n\x06groups\x18\x05 \x03(\x0b2\x1a.LibreSVIP.ConversionGroupR\x06groups\x12#\n\rinput_options\x18\x06 \x01(\tR\x0cinputOptions\x12%\n\x0eoutput_options\x18\x07 \x01(\tR\routputOptions\x12b\n\x12middleware_options\x18\x08 \x03(\x0b23.LibreSVIP.ConversionRequest.MiddlewareOptionsEntryR\x11middlewareOptions\x12\x1a\n\x08language\x18\t \x01(\tR\x08language\x12Q\n\x13lyric_replace_rules\x18\n \x03(\x0b2!.LibreSVIP.LyricsReplacementGroupR\x11lyricReplaceRules\x12#\n\rconversion_id\x18\x0b \x01(\tR\x0cconversionId\x121\n\x07outputs\x18\x0c \x03(\x0b2\x17.LibreSVIP.OutputTargetR\x07outputs\x12\x18\n\x07profile\x18\r \x01(\x08R\x07profile\x129\n\x08priority\x18\x0e \x01(\x0e2\x1d.LibreSVIP.ConversionPriorityR\x08priority\x12\x1d\n\noutput_dir\x18\x0f \x01(\tR\toutputDir\x12B\n\x0fconflict_policy\x18\x10 \x01(\x0e2\x19.LibreSVIP.ConflictPolicyR\x0econflictPolicy\x1aD\n\x16MiddlewareOptionsEntry\x12\x10\n\x03key\x18\x01 \x01(\tR\x03key\x12\x14\n\x05value\x18\x02 \x01(\tR\x05value:\x028\x01"g\n\x0bStageTiming\x12\x14\n\x05stage\x18\x01 \x01(\tR\x05stage\x12!\n\x0cwall_seconds\x18\x02 \x01(\x01R\x0bwallSeconds\x12\x1f\n\x0bcpu_seconds\x18\x03 \x01(\x01R\ncpuSeconds"\xc0\x04\n\x16SingleConversionResult\x12\x19\n\x08group_id\x18\x01 \x01(\tR\x07groupId\x12\x18\n\x07running\x18\x02 \x01(\x08R\x07running\x12\x1c\n\tcompleted\x18\x03 \x01(\x08R\tcompleted\x12#\n\rerror_message\x18\x04 \x01(\tR\x0cerrorMessage\x12)\n\x10warning_messages\x18\x05 \x03(\tR\x0fwarningMessages\x12\x1c\n\tcancelled\x18\x06 \x01(\x08R\tcancelled\x12\x1b\n\ttarget_id\x18\x07 \x01(\tR\x08targetId\x12\x1d\n\npart_count\x18\x08 \x01(\x05R\tpartCount\x12\x1d\n\npart_index\x18\t \x01(\x05R\tpartIndex\x120\n\x07timings\x18\n \x03(\x0b2\x16.LibreSVIP.StageTimingR\x07timings\x12\x1f\n\x0binput_bytes\x18\x0b \x01(\x03R\ninputBytes\x12!\n\x0coutput_bytes\x18\x0c \x01(\x03R\x0boutputBytes\x12\x1a\n\x08progress\x18\r \x01(\x01R\x08progress\x12\'\n\x0felapsed_seconds\x18\x0e \x01(\x01R\x0eelapsedSeconds\x12\x14\n\x05stage\x18\x0f \x01(\tR\x05stage\x12\x1f\n\x0boutput_path\x18\x10 \x01(\tR\noutputPath\x12\x18\n\x07skipped\x18\x11 \x01(\x08R\x07skipped"\x10\n\x0eVersionRequest"R\n\x0fVersionResponse\x12\x18\n\x07version\x18\x01 \x01(\tR\x07version\x12%\n\x0eplugins_loaded\x18\x02 \x01(\x08R\rpluginsLoaded"\xa4\x02\n\x0fMoveFileRequest\x12\x19\n\x08group_id\x18\x01 \x01(\tR\x07groupId\x12\x1d\n\noutput_dir\x18\x02 \x01(\tR\toutputDir\x12\x12\n\x04stem\x18\x03 \x01(\tR\x04stem\x12#\n\routput_format\x18\x04 \x01(\tR\x0coutputFormat\x12B\n\x0fconflict_policy\x18\x05 \x01(\x0e2\x19.LibreSVIP.ConflictPolicyR\x0econflictPolicy\x12\'\n\x0fforce_overwrite\x18\x06 \x01(\x08R\x0eforceOverwrite\x12\x1b\n\ttarget_id\x18\x07 \x01(\tR\x08targetId\x12\x14\n\x05parts\x18\x08 \x03(\x05R\x05parts"\xbe\x02\n\x10MoveFileResponse\x12\x19\n\x08group_id\x18\x01 \x01(\tR\x07groupId\x12\x1f\n\x0boutput_path\x18\x02 \x01(\tR\noutputPath\x12B\n\x0fconflict_policy\x18\x03 \x01(\x0e2\x19.LibreSVIP.ConflictPolicyR\x0econflictPolicy\x12\x1c\n\tcompleted\x18\x04 \x01(\x08R\tcompleted\x12\x18\n\x07success\x18\x05 \x01(\x08R\x07success\x12#\n\rerror_message\x18\x06 \x01(\tR\x0cerrorMessage\x12\x1b\n\ttarget_id\x18\x07 \x01(\tR\x08targetId\x120\n\x07timings\x18\x08 \x03(\x0b2\x16.LibreSVIP.StageTimingR\x07timings"\x97\x01\n\x0eMoveFilesEntry\x12\x19\n\x08group_id\x18\x01 \x01(\tR\x07groupId\x12\x12\n\x04stem\x18\x02 \x01(\tR\x04stem\x12#\n\routput_format\x18\x03 \x01(\tR\x0coutputFormat\x12\x1b\n\ttarget_id\x18\x04 \x01(\tR\x08targetId\x12\x14\n\x05parts\x18\x05 \x03(\x05R\x05parts"\xd3\x01\n\x10MoveFilesRequest\x123\n\x07entries\x18\x01 \x03(\x0b2\x19.LibreSVIP.MoveFilesEntryR\x07entries\x12\x1d\n\noutput_dir\x18\x02 \x01(\tR\toutputDir\x12B\n\x0fconflict_policy\x18\x03 \x01(\x0e2\x19.LibreSVIP.ConflictPolicyR\x0econflictPolicy\x12\'\n\x0fforce_overwrite\x18\x04 \x01(\x08R\x0eforceOverwrite"[\n\x17CancelConversionRequest\x12#\n\rconversion_id\x18\x01 \x01(\tR\x0cconversionId\x12\x1b\n\tgroup_ids\x18\x02 \x03(\tR\x08groupIds"7\n\x18CancelConversionResponse\x12\x1b\n\tgroup_ids\x18\x01 \x03(\tR\x08groupIds"K\n\x11GetProfileRequest\x12\x19\n\x08group_id\x18\x01 \x01(\tR\x07groupId\x12\x1b\n\ttarget_id\x18\x02 \x01(\tR\x08targetId"\xb4\x01\n\x12GetProfileResponse\x12\x19\n\x08group_id\x18\x01 \x01(\tR\x07groupId\x12\x1b\n\ttarget_id\x18\x02 \x01(\tR\x08targetId\x12\x14\n\x05found\x18\x03 \x01(\x08R\x05found\x12\x16\n\x06pstats\x18\x04 \x01(\x0cR\x06pstats\x12\x16\n\x06report\x18\x05 \x01(\tR\x06report\x12 \n\x0ballocations\x18\x06 \x01(\tR\x0ballocations*7\n\x0ePluginCategory\x12\t\n\x05INPUT\x10\x00\x12\n\n\x06OUTPUT\x10\x01\x12\x0e\n\nMIDDLEWARE\x10\x02*2\n\x0eConversionMode\x12\n\n\x06DIRECT\x10\x00\x12\t\n\x05SPLIT\x10\x01\x12\t\n\x05MERGE\x10\x02*A\n\x0eConflictPolicy\x12\x08\n\x04SKIP\x10\x00\x12\n\n\x06PROMPT\x10\x01\x12\r\n\tOVERWRITE\x10\x02\x12\n\n\x06RENAME\x10\x03*3\n\x12ConversionPriority\x12\n\n\x06NORMAL\x10\x00\x12\x07\n\x03LOW\x10\x01\x12\x08\n\x04HIGH\x10\x02*L\n\x11LyricsReplaceMode\x12\x08\n\x04FULL\x10\x00\x12\x0e\n\nALPHABETIC\x10\x01\x12\x12\n\x0eNON_ALPHABETIC\x10\x02\x12\t\n\x05REGEX\x10\x032\xa2\x04\n\nConversion\x12L\n\x0bPluginInfos\x12\x1d.LibreSVIP.PluginInfosRequest\x1a\x1e.LibreSVIP.PluginInfosResponse\x12L\n\x07Convert\x12\x1c.LibreSVIP.ConversionRequest\x1a!.LibreSVIP.SingleConversionResult0\x01\x12@\n\x07Version\x12\x19.LibreSVIP.VersionRequest\x1a\x1a.LibreSVIP.VersionResponse\x12E\n\x08MoveFile\x12\x1a.LibreSVIP.MoveFileRequest\x1a\x1b.LibreSVIP.MoveFileResponse0\x01\x12[\n\x10CancelConversion\x12".LibreSVIP.CancelConversionRequest\x1a#.LibreSVIP.CancelConversionResponse\x12G\n\tMoveFiles\x12\x1b.LibreSVIP.MoveFilesRequest\x1a\x1b.LibreSVIP.MoveFileResponse0\x01\x12I\n\nGetProfile\x12\x1c.LibreSVIP.GetProfileRequest\x1a\x1d.LibreSVIP.GetProfileResponseb\x06proto3',
     [],
     {
         "LyricsReplacement": LyricsReplacement,
@@ -716,15 +1271,24 @@ _DESC = file_desc(
         "PluginInfosRequest": PluginInfosRequest,
         "PluginInfosResponse": PluginInfosResponse,
         "ConversionGroup": ConversionGroup,
+        "OutputTarget": OutputTarget,
         "ConversionRequest": ConversionRequest,
+        "StageTiming": StageTiming,
         "SingleConversionResult": SingleConversionResult,
         "VersionRequest": VersionRequest,
         "VersionResponse": VersionResponse,
         "MoveFileRequest": MoveFileRequest,
         "MoveFileResponse": MoveFileResponse,
+        "MoveFilesEntry": MoveFilesEntry,
+        "MoveFilesRequest": MoveFilesRequest,
+        "CancelConversionRequest": CancelConversionRequest,
+        "CancelConversionResponse": CancelConversionResponse,
+        "GetProfileRequest": GetProfileRequest,
+        "GetProfileResponse": GetProfileResponse,
         "PluginCategory": PluginCategory,
         "ConversionMode": ConversionMode,
         "ConflictPolicy": ConflictPolicy,
+        "ConversionPriority": ConversionPriority,
         "LyricsReplaceMode": LyricsReplaceMode,
     },
 )
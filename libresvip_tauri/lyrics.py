@@ -0,0 +1,45 @@
+import contextlib
+import re
+from functools import cached_property
+
+from libresvip.core.config import LYRIC_REPLACE_MODE_PREFIX_SUFFIX, LyricsReplacement, LyricsReplaceMode
+
+from . import libresvip_tauri_pb
+
+# rules travel to process workers pickled with the request settings, so
+# this module must stay importable there without side effects
+
+_PROTO_MODE_TO_ENUM = {
+    0: LyricsReplaceMode.FULL,
+    1: LyricsReplaceMode.ALPHABETIC,
+    2: LyricsReplaceMode.NON_ALPHABETIC,
+    3: LyricsReplaceMode.REGEX,
+}
+
+
+class CompiledLyricsReplacement(LyricsReplacement):
+    """Compiles its pattern once instead of every time it is applied."""
+
+    @cached_property
+    def compiled_pattern(self) -> re.Pattern[str]:
+        return re.compile(self._pattern, self.flags)
+
+
+def compile_rule(message: libresvip_tauri_pb.LyricsReplacement) -> CompiledLyricsReplacement:
+    mode = _PROTO_MODE_TO_ENUM.get(message.mode, LyricsReplaceMode.FULL)
+    prefix = message.pattern_prefix
+    suffix = message.pattern_suffix
+    if not prefix and not suffix and mode.value in LYRIC_REPLACE_MODE_PREFIX_SUFFIX:
+        prefix, suffix = LYRIC_REPLACE_MODE_PREFIX_SUFFIX[mode.value]
+    rule = CompiledLyricsReplacement(
+        mode=mode,
+        replacement=message.replacement,
+        pattern_main=message.pattern_main,
+        pattern_prefix=prefix,
+        pattern_suffix=suffix,
+        flags=re.RegexFlag(message.flags) if message.flags else re.IGNORECASE,
+    )
+    # an invalid pattern still fails where the rule is applied
+    with contextlib.suppress(re.error):
+        rule.compiled_pattern
+    return rule
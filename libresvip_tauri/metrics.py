@@ -0,0 +1,148 @@
+import bisect
+import contextlib
+import dataclasses
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from .libresvip_tauri_pb import MoveFileResponse, SingleConversionResult, StageTiming
+
+# upper bounds in seconds, the last bucket counts everything above
+_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+@contextlib.contextmanager
+def timed(timings: list[StageTiming], stage: str) -> Iterator[None]:
+    """Append the wall and CPU time of the block to ``timings``, even if it raises.
+
+    CPU time is that of the calling thread, so blocks must not hand their
+    work over to other threads.
+    """
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        yield
+    finally:
+        timings.append(
+            StageTiming(
+                stage=stage,
+                wall_seconds=time.perf_counter() - wall_start,
+                cpu_seconds=time.thread_time() - cpu_start,
+            )
+        )
+
+
+class Histogram:
+    def __init__(self) -> None:
+        self.counts = [0] * (len(_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "buckets": [[le, count] for le, count in zip([*_BUCKETS, "+Inf"], self.counts)],
+            "count": self.count,
+            "sum": self.sum,
+        }
+
+
+@dataclasses.dataclass
+class _StageMetrics:
+    wall_seconds: Histogram = dataclasses.field(default_factory=Histogram)
+    cpu_seconds: Histogram = dataclasses.field(default_factory=Histogram)
+
+    def observe(self, timing: StageTiming) -> None:
+        self.wall_seconds.observe(timing.wall_seconds)
+        self.cpu_seconds.observe(timing.cpu_seconds)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "wall_seconds": self.wall_seconds.to_dict(),
+            "cpu_seconds": self.cpu_seconds.to_dict(),
+        }
+
+
+@dataclasses.dataclass
+class _PairMetrics:
+    completed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    stages: dict[str, _StageMetrics] = dataclasses.field(default_factory=dict)
+
+    def observe(self, timings: list[StageTiming]) -> None:
+        for timing in timings:
+            if (stage := self.stages.get(timing.stage)) is None:
+                stage = self.stages[timing.stage] = _StageMetrics()
+            stage.observe(timing)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "input_bytes": self.input_bytes,
+            "output_bytes": self.output_bytes,
+            "stages": {name: stage.to_dict() for name, stage in sorted(self.stages.items())},
+        }
+
+
+class ConversionMetrics:
+    """Aggregates the timings of finished conversions and moves.
+
+    Conversions are grouped by their pair of input and output plugin,
+    moves by their output format.
+    """
+
+    def __init__(self) -> None:
+        self._pairs: dict[tuple[str, str], _PairMetrics] = {}
+        self._moves: dict[str, _PairMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record(self, input_format: str, output_format: str, result: SingleConversionResult) -> None:
+        with self._lock:
+            if (pair := self._pairs.get((input_format, output_format))) is None:
+                pair = self._pairs[input_format, output_format] = _PairMetrics()
+            if result.cancelled:
+                pair.cancelled += 1
+            elif result.skipped:
+                pair.skipped += 1
+            elif result.completed:
+                pair.completed += 1
+            else:
+                pair.failed += 1
+            pair.input_bytes += result.input_bytes
+            pair.output_bytes += result.output_bytes
+            pair.observe(result.timings)
+
+    def record_move(self, output_format: str, response: MoveFileResponse) -> None:
+        with self._lock:
+            if (moves := self._moves.get(output_format)) is None:
+                moves = self._moves[output_format] = _PairMetrics()
+            if response.success:
+                moves.completed += 1
+            else:
+                moves.failed += 1
+            moves.observe(response.timings)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "conversions": [
+                    {"input_format": input_format, "output_format": output_format, **pair.to_dict()}
+                    for (input_format, output_format), pair in sorted(self._pairs.items())
+                ],
+                "moves": [
+                    {"output_format": output_format, **moves.to_dict()}
+                    for output_format, moves in sorted(self._moves.items())
+                ],
+            }
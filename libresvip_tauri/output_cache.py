@@ -0,0 +1,235 @@
+import collections
+import contextlib
+import dataclasses
+import hashlib
+import os
+import pathlib
+import shutil
+import threading
+import uuid
+from collections.abc import Sequence
+from typing import Any
+
+from libresvip.core.compat import json
+from upath import UPath
+
+from .project_cache import file_digest
+
+# bump when the layout of entries changes, older entries are then never hit
+_FORMAT_VERSION = 1
+_MANIFEST_NAME = "manifest.json"
+# name of the only file of an output that is not split into parts
+_SINGLE_NAME = "output"
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclasses.dataclass
+class OutputCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    corrupted: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+@dataclasses.dataclass
+class CachedOutput:
+    """What a restored entry tells about the output it held."""
+
+    warning_messages: list[str]
+    output_bytes: int
+    # only set for outputs split into parts
+    part_count: int
+
+
+class EntryWriter:
+    """Collects the files of one output, then adds them to the cache at once."""
+
+    def __init__(self, cache: "OutputCache", key: str) -> None:
+        self.cache = cache
+        self.key = key
+        self.files: dict[str, dict[str, Any]] = {}
+        self.path = cache.root / "tmp" / uuid.uuid4().hex
+        # a file failed to copy, the entry would be incomplete
+        self.broken = False
+
+    def add(self, src: UPath, name: str = _SINGLE_NAME) -> None:
+        """Copy a staged file in, as part ``name`` of a split output."""
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            with src.open("rb") as fsrc, (self.path / name).open("wb") as fdst:
+                while chunk := fsrc.read(_COPY_CHUNK_SIZE):
+                    digest.update(chunk)
+                    fdst.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            self.broken = True
+            raise
+        self.files[name] = {"sha256": digest.hexdigest(), "size": size}
+
+    def add_staged(self, src: UPath) -> None:
+        """Copy a whole staged output in, every part of it if it is a directory."""
+        if src.is_dir():
+            for child in src.iterdir():
+                self.add(child, child.name)
+        else:
+            self.add(src)
+
+    def commit(self, warning_messages: Sequence[str], split: bool = False) -> None:
+        try:
+            if not self.broken:
+                self.cache.commit(self, warning_messages, split)
+        finally:
+            self.abort()
+
+    def abort(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class OutputCache:
+    """Converted outputs kept on disk across server restarts.
+
+    Entries are keyed by the content hash of the input files together with
+    everything else that decides the output: plugins and their versions,
+    options, middlewares and lyric rules. Every file of an entry is
+    checked against the hash recorded when it was stored before it is
+    served, a mismatch drops the entry. Least recently used entries are
+    evicted while the cache holds more than ``max_bytes``.
+    """
+
+    def __init__(self, root: str, max_bytes: int) -> None:
+        self.root = pathlib.Path(root) if root else None
+        self.max_bytes = max_bytes
+        self._entries: collections.OrderedDict[str, int] | None = None
+        self._bytes = 0
+        self._stats = OutputCacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None and self.max_bytes > 0
+
+    @property
+    def stats(self) -> OutputCacheStats:
+        with self._lock:
+            return dataclasses.replace(self._stats, entries=len(self._entries or ()), bytes=self._bytes)
+
+    def _entry_path(self, key: str) -> pathlib.Path:
+        return self.root / key[:2] / key
+
+    def _index(self) -> collections.OrderedDict[str, int]:
+        # read on first use rather than at startup, a large cache takes a while
+        if self._entries is None:
+            shutil.rmtree(self.root / "tmp", ignore_errors=True)
+            found: list[tuple[float, str, int]] = []
+            for manifest_path in self.root.glob(f"*/*/{_MANIFEST_NAME}"):
+                try:
+                    manifest = json.loads(manifest_path.read_bytes())
+                    size = sum(file["size"] for file in manifest["files"].values())
+                    found.append((manifest_path.stat().st_mtime, manifest_path.parent.name, size))
+                except (OSError, ValueError, KeyError, TypeError):
+                    shutil.rmtree(manifest_path.parent, ignore_errors=True)
+            self._entries = collections.OrderedDict(
+                (key, size) for _, key, size in sorted(found)
+            )
+            self._bytes = sum(self._entries.values())
+            # the cap may have been lowered since the last run
+            self._evict()
+        return self._entries
+
+    def key(self, input_digests: Sequence[str], *parts: Any) -> str:
+        """Key of an output of inputs with ``input_digests``, converted as described by ``parts``."""
+        return hashlib.sha256(
+            json.dumps([_FORMAT_VERSION, list(input_digests), parts], sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    @staticmethod
+    def digests(file_paths: Sequence[str]) -> tuple[list[str], int]:
+        """Content hashes of the input files and their total size."""
+        paths = [pathlib.Path(file_path) for file_path in file_paths]
+        return [file_digest(path) for path in paths], sum(path.stat().st_size for path in paths)
+
+    def _drop(self, key: str) -> None:
+        # called with the lock held
+        self._bytes -= self._index().pop(key, 0)
+        shutil.rmtree(self._entry_path(key), ignore_errors=True)
+
+    def _evict(self) -> None:
+        # called with the lock held
+        while self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self._stats.evictions += 1
+
+    def restore(self, key: str, dst: UPath) -> CachedOutput | None:
+        """Stage the output cached under ``key`` as ``dst``, or return ``None`` on a miss."""
+        with self._lock:
+            if key not in self._index():
+                self._stats.misses += 1
+                return None
+            entry_path = self._entry_path(key)
+            try:
+                manifest = json.loads((entry_path / _MANIFEST_NAME).read_bytes())
+                contents = {}
+                for name, file in manifest["files"].items():
+                    data = (entry_path / name).read_bytes()
+                    if hashlib.sha256(data).hexdigest() != file["sha256"]:
+                        raise ValueError(f"{name} does not match its hash")
+                    contents[name] = data
+            except (OSError, ValueError, KeyError, TypeError):
+                self._stats.corrupted += 1
+                self._stats.misses += 1
+                self._drop(key)
+                return None
+            self._stats.hits += 1
+            self._index().move_to_end(key)
+            # the modification time of the manifest orders entries after a restart
+            with contextlib.suppress(OSError):
+                os.utime(entry_path / _MANIFEST_NAME)
+        if manifest["split"]:
+            dst.mkdir(parents=True, exist_ok=True)
+            for name, data in contents.items():
+                (dst / name).write_bytes(data)
+        else:
+            dst.write_bytes(contents[_SINGLE_NAME])
+        return CachedOutput(
+            list(manifest["warning_messages"]),
+            sum(len(data) for data in contents.values()),
+            len(contents) if manifest["split"] else 0,
+        )
+
+    def writer(self, key: str) -> EntryWriter:
+        with self._lock:
+            # reading the index clears the temporary directory writers use
+            self._index()
+        return EntryWriter(self, key)
+
+    def commit(self, writer: EntryWriter, warning_messages: Sequence[str], split: bool) -> None:
+        size = sum(file["size"] for file in writer.files.values())
+        if size > self.max_bytes:
+            return
+        manifest = {
+            "version": _FORMAT_VERSION,
+            "files": writer.files,
+            "split": split,
+            "warning_messages": list(warning_messages),
+        }
+        writer.path.mkdir(parents=True, exist_ok=True)
+        (writer.path / _MANIFEST_NAME).write_text(json.dumps(manifest))
+        entry_path = self._entry_path(writer.key)
+        with self._lock:
+            entries = self._index()
+            if writer.key in entries:
+                return
+            # left behind by an entry that was found broken
+            shutil.rmtree(entry_path, ignore_errors=True)
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            # the entry appears whole or not at all
+            os.replace(writer.path, entry_path)
+            entries[writer.key] = size
+            self._bytes += size
+            self._stats.stores += 1
+            self._evict()
@@ -0,0 +1,65 @@
+import copy
+import dataclasses
+import functools
+from collections.abc import Mapping
+from typing import Any
+
+from libresvip.extension.base import Middleware
+from libresvip.model.base import Project
+from pydantic import ValidationError
+
+from .registry import plugin_registry
+
+
+@dataclasses.dataclass(frozen=True)
+class MiddlewareStep:
+    identifier: str
+    middleware: type[Middleware]
+    options: dict[str, Any]
+
+    def process(self, project: Project) -> Project:
+        # middlewares get their own copy, the step is shared by every group
+        return self.middleware.process(project, copy.deepcopy(self.options))
+
+
+@dataclasses.dataclass(frozen=True)
+class MiddlewarePipeline:
+    """Middlewares of a request, resolved and with validated options.
+
+    Built once per distinct set of middleware options and shared by every
+    group of every request using it.
+    """
+
+    steps: tuple[MiddlewareStep, ...] = ()
+    # identifiers of requested middlewares that are not installed
+    unknown: tuple[str, ...] = ()
+
+    @property
+    def warning_messages(self) -> list[str]:
+        return [f"Unknown middleware {identifier} was skipped" for identifier in self.unknown]
+
+
+@functools.lru_cache(maxsize=64)
+def _build_pipeline(middleware_options: tuple[tuple[str, str], ...]) -> MiddlewarePipeline:
+    steps = []
+    unknown = []
+    for middleware_id, middleware_option_str in middleware_options:
+        if (middleware := plugin_registry.middleware(middleware_id)) is None:
+            unknown.append(middleware_id)
+            continue
+        try:
+            process_options = middleware.process_option_cls.model_validate_json(middleware_option_str)
+        except ValidationError:
+            process_options = middleware.process_option_cls()
+        steps.append(MiddlewareStep(middleware_id, middleware, process_options.model_dump()))
+    return MiddlewarePipeline(tuple(steps), tuple(unknown))
+
+
+def build_pipeline(middleware_options: Mapping[str, str]) -> MiddlewarePipeline:
+    """Resolve the ``middleware_options`` of a request, in request order.
+
+    Unknown middlewares are skipped, each group converted warns about
+    them; options that do not validate fall back to the defaults, as input
+    and output options do.
+    """
+    return _build_pipeline(tuple(middleware_options.items()))
@@ -0,0 +1,205 @@
+import enum
+import gettext
+import importlib.metadata
+import threading
+from collections.abc import Iterable, Sequence
+from functools import partial
+from typing import Any, get_args, get_type_hints
+
+from libresvip.core.compat import json
+from libresvip.extension.base import (
+    ReadOnlyConverterMixin,
+    WriteOnlyConverterMixin,
+)
+from pydantic._internal._core_utils import CoreSchemaOrField
+from pydantic.json_schema import GenerateJsonSchema, JsonSchemaValue
+from typing_extensions import override
+
+from .libresvip_tauri_pb import PluginCategory, PluginInfo, PluginInfosResponse
+from .registry import plugin_registry
+
+
+class GettextGenerateJsonSchema(GenerateJsonSchema):
+    def __init__(self, translator: gettext.NullTranslations, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.translator = translator
+
+    @override
+    def generate_inner(self, schema: CoreSchemaOrField) -> JsonSchemaValue:
+        json_schema = super().generate_inner(schema)
+        if "title" in json_schema:
+            json_schema["title"] = self.translator.gettext(json_schema["title"])
+        if "description" in json_schema:
+            json_schema["description"] = self.translator.gettext(json_schema["description"])
+        return json_schema
+
+
+def option_schema(option_cls, translator: gettext.NullTranslations) -> tuple[str, str, str]:
+    json_schema = option_cls.model_json_schema(
+        schema_generator=partial(GettextGenerateJsonSchema, translator=translator),
+    )
+    json_schema.pop("title", None)
+    json_schema["required"] = list(
+        json_schema["properties"].keys()
+    )
+    ui_schema = {
+        "ui:submitButtonOptions": {
+            "norender": True
+        }
+    }
+    for field_name, field_info in option_cls.model_fields.items():
+        if issubclass(field_info.annotation, enum.Enum):
+            enum_names = []
+            type_hints = get_type_hints(field_info.annotation, include_extras=True)
+            annotations = None
+            if "_value_" in type_hints:
+                value_args = get_args(type_hints["_value_"])
+                if len(value_args) >= 2:
+                    model = value_args[1]
+                    if hasattr(model, "model_fields"):
+                        annotations = model.model_fields
+            if annotations is None:
+                continue
+            for enum_item in field_info.annotation:
+                if enum_item.name in annotations:
+                    enum_field = annotations[enum_item.name]
+                    enum_names.append(translator.gettext(enum_field.title))
+            ui_schema[field_name] = {
+                "ui:enumNames": enum_names
+            }
+
+    return (
+        json.dumps(json_schema),
+        json.dumps(ui_schema),
+        option_cls().model_dump_json(),
+    )
+
+
+def _in_category(category: PluginCategory, plugin: Any) -> bool:
+    match category:
+        case PluginCategory.MIDDLEWARE:
+            return True
+        case PluginCategory.OUTPUT:
+            return not issubclass(plugin, ReadOnlyConverterMixin)
+        case _:
+            return not issubclass(plugin, WriteOnlyConverterMixin)
+
+
+def build_plugin_info(
+    category: PluginCategory, identifier: str, plugin: Any, translator: gettext.NullTranslations
+) -> PluginInfo:
+    match category:
+        case PluginCategory.MIDDLEWARE:
+            option_cls = plugin.process_option_cls
+        case PluginCategory.OUTPUT:
+            option_cls = plugin.output_option_cls
+        case _:
+            option_cls = plugin.input_option_cls
+    json_schema, ui_schema, default_value = option_schema(option_cls, translator)
+    plugin_info = PluginInfo(
+        identifier=identifier,
+        name=plugin.info.name,
+        author=translator.gettext(plugin.info.author),
+        description=translator.gettext(plugin.info.description),
+        website=plugin.info.website,
+        version=plugin.version,
+        json_schema=json_schema,
+        ui_json_schema=ui_schema,
+        default_json_value=default_value,
+    )
+    if category != PluginCategory.MIDDLEWARE:
+        plugin_info.file_format = translator.gettext(plugin.info.file_format)
+        plugin_info.suffixes = (
+            [plugin.info.suffix] if category == PluginCategory.OUTPUT else list(plugin.info.suffixes)
+        )
+        plugin_info.icon_base64 = plugin.info.icon_base64 or ""
+    return plugin_info
+
+
+def build_plugin_infos(
+    category: PluginCategory, language: str, identifiers: Sequence[str] = ()
+) -> PluginInfosResponse:
+    """Infos of the plugins of ``category``, only of ``identifiers`` if any are given.
+
+    Plugins asked for by identifier are imported on their own. Without
+    identifiers, the plugins available so far are listed, see
+    ``PluginRegistry.available``.
+    """
+    translator = plugin_registry.translation(language)
+    kind = "middleware" if category == PluginCategory.MIDDLEWARE else "svs"
+    if identifiers:
+        plugins = {
+            identifier: plugin
+            for identifier in identifiers
+            if (plugin := plugin_registry.get(kind, identifier)) is not None
+        }
+    else:
+        plugins = plugin_registry.available(kind)
+    return PluginInfosResponse(
+        values=[
+            build_plugin_info(category, identifier, plugin, translator)
+            for identifier, plugin in plugins.items()
+            if _in_category(category, plugin)
+        ]
+    )
+
+
+class PluginInfosCache:
+    """Finished ``PluginInfos`` responses per category and language.
+
+    Responses only change with the installed libresvip, whose version is
+    part of the key. Cached responses are shared between requests and must
+    not be modified.
+    """
+
+    def __init__(self) -> None:
+        self.libresvip_version = importlib.metadata.version("libresvip")
+        self._responses: dict[tuple[PluginCategory, str, str], PluginInfosResponse] = {}
+        self._lock = threading.Lock()
+
+    def _key(
+        self, category: PluginCategory, language: str, identifiers: Sequence[str] = ()
+    ) -> tuple[PluginCategory, str, str, tuple[str, ...], bool]:
+        if category not in (PluginCategory.OUTPUT, PluginCategory.MIDDLEWARE):
+            category = PluginCategory.INPUT
+        # a whole category listed before every plugin was loaded may lack user plugins
+        complete = bool(identifiers) or plugin_registry.ready.is_set()
+        return category, language, self.libresvip_version, tuple(identifiers), complete
+
+    def cached(
+        self, category: PluginCategory, language: str, identifiers: Sequence[str] = ()
+    ) -> PluginInfosResponse | None:
+        return self._responses.get(self._key(category, language, identifiers))
+
+    def get(self, category: PluginCategory, language: str, identifiers: Sequence[str] = ()) -> PluginInfosResponse:
+        key = self._key(category, language, identifiers)
+        if (response := self._responses.get(key)) is None:
+            if identifiers:
+                # a plugin or two, not worth waiting behind a whole category being built
+                response = self._responses[key] = build_plugin_infos(key[0], language, identifiers)
+                return response
+            # concurrent misses for the same key build the response once
+            with self._lock:
+                if (response := self._responses.get(key)) is None:
+                    response = self._responses[key] = build_plugin_infos(key[0], language)
+        return response
+
+    def warm_up(self, languages: Iterable[str]) -> None:
+        """Build the responses for ``languages`` on a background thread."""
+        languages = list(languages)
+        if languages:
+            threading.Thread(
+                target=self._warm_up,
+                args=(languages,),
+                name="libresvip-plugin-infos",
+                daemon=True,
+            ).start()
+
+    def _warm_up(self, languages: list[str]) -> None:
+        # responses listing part of the plugins would be of no use later
+        plugin_registry.load_all()
+        # building the schemas does not read the settings, so this runs
+        # without overriding them under conversions that may be running
+        for language in languages:
+            for category in (PluginCategory.INPUT, PluginCategory.OUTPUT, PluginCategory.MIDDLEWARE):
+                self.get(category, language)
@@ -0,0 +1,139 @@
+import contextlib
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+import tracemalloc
+from collections.abc import Callable, Iterator
+from typing import Any, TypeVar
+
+from upath import UPath
+
+T = TypeVar("T")
+
+PSTATS_NAME = "profile.pstats"
+REPORT_NAME = "profile.txt"
+ALLOCATIONS_NAME = "allocations.txt"
+
+_REPORT_FUNCTIONS = 60
+_REPORT_ALLOCATIONS = 30
+_SAMPLE_INTERVAL = 0.05
+# a new snapshot is only taken once the traced memory grew this much
+_SAMPLE_GROWTH = 1.1
+
+# cProfile hooks every thread from Python 3.12 on and a second profiler
+# cannot be enabled meanwhile; tracemalloc is process wide on any version.
+# Profiled calls of a process therefore take turns.
+_profile_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _tracing() -> Iterator[None]:
+    # left running if something else traces allocations, PYTHONTRACEMALLOC for one
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+class _PeakSampler(threading.Thread):
+    """Snapshots the traced allocations whenever they reach a new peak.
+
+    Most of the memory of a conversion is released by the time it returns,
+    so a snapshot taken afterwards would not show where it went.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(name="libresvip-profile-sampler", daemon=True)
+        self.traced_bytes = 0
+        self.snapshot: tracemalloc.Snapshot | None = None
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.wait(_SAMPLE_INTERVAL):
+            self.sample()
+
+    def sample(self) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        if self.snapshot is None or current > self.traced_bytes * _SAMPLE_GROWTH:
+            self.traced_bytes = current
+            self.snapshot = tracemalloc.take_snapshot()
+
+    def finish(self) -> None:
+        self._done.set()
+        self.join()
+        self.sample()
+
+
+def _allocations_report(sampler: _PeakSampler, peak_bytes: int) -> str:
+    lines = [
+        f"peak traced memory: {peak_bytes / 1024:.1f} KiB",
+        f"snapshot taken at: {sampler.traced_bytes / 1024:.1f} KiB",
+        "",
+    ]
+    if sampler.snapshot is not None:
+        snapshot = sampler.snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            )
+        )
+        for i, stat in enumerate(snapshot.statistics("lineno")[:_REPORT_ALLOCATIONS], 1):
+            frame = stat.traceback[0]
+            lines.append(
+                f"#{i} {frame.filename}:{frame.lineno}: {stat.size / 1024:.1f} KiB in {stat.count} blocks"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def _write_reports(
+    profile_path: UPath, profiler: cProfile.Profile | None, error: str, sampler: _PeakSampler, peak_bytes: int
+) -> None:
+    profile_path.mkdir(parents=True, exist_ok=True)
+    if profiler is not None:
+        profiler.create_stats()
+        # the format of pstats.Stats.dump_stats
+        (profile_path / PSTATS_NAME).write_bytes(marshal.dumps(profiler.stats))
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_REPORT_FUNCTIONS)
+        (profile_path / REPORT_NAME).write_text(report.getvalue())
+    else:
+        (profile_path / REPORT_NAME).write_text(f"not profiled: {error}\n")
+    (profile_path / ALLOCATIONS_NAME).write_text(_allocations_report(sampler, peak_bytes))
+
+
+def profile_call(fs: UPath, name: str, func: Callable[..., T], *args: Any) -> T:
+    """Run ``func`` under cProfile and tracemalloc and stage the reports as ``name``.
+
+    Profiled calls run one at a time per process, calls that are not
+    profiled go on meanwhile. Their allocations are traced too, and from
+    Python 3.12 on the profile includes the calls they make, as cProfile
+    then hooks every thread. If the profiler cannot be enabled, because
+    another profiler or a debugger is active, ``func`` still runs and
+    the report says why it was not profiled.
+    """
+    with _profile_lock, _tracing():
+        profiler: cProfile.Profile | None = cProfile.Profile()
+        error = ""
+        sampler = _PeakSampler()
+        tracemalloc.reset_peak()
+        sampler.start()
+        try:
+            try:
+                profiler.enable()
+            except ValueError as e:
+                profiler, error = None, str(e)
+            try:
+                return func(*args)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+        finally:
+            sampler.finish()
+            _write_reports(fs / name, profiler, error, sampler, tracemalloc.get_traced_memory()[1])
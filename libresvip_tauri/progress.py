@@ -0,0 +1,105 @@
+import asyncio
+import time
+from collections.abc import Sequence
+
+from .conversion import Progress
+from .libresvip_tauri_pb import ConversionGroup, ConversionMode, SingleConversionResult
+from .scheduler import Emit
+
+# without progress, an event still goes out every this many intervals
+_HEARTBEAT_INTERVALS = 10
+
+
+class ProgressReporter:
+    """Sends progress events for one group while it converts.
+
+    Workers count the stages they finish in ``progress``; stages completed
+    on the event loop, parallel loads and finished outputs, are counted
+    here. Every ``interval`` seconds the reporter emits the fraction of
+    stages done and the stage in progress, unless nothing has changed for
+    less than ``_HEARTBEAT_INTERVALS`` intervals, so a stream gets at most
+    one progress event per interval and group.
+    """
+
+    def __init__(
+        self,
+        group: ConversionGroup,
+        mode: ConversionMode,
+        middleware_ids: Sequence[str],
+        target_ids: Sequence[str],
+        progress: Progress,
+        interval: float,
+        emit: Emit[SingleConversionResult],
+    ) -> None:
+        self.group_id = group.group_id
+        self.progress = progress
+        self.interval = interval
+        self._emit = emit
+        self._files = len(group.file_paths) if mode == ConversionMode.MERGE else 1
+        self._merge = mode == ConversionMode.MERGE
+        self._split = mode == ConversionMode.SPLIT
+        self._middleware_ids = list(middleware_ids)
+        self._outputs = dict.fromkeys(target_ids, 0.0)
+        self._loaded = 0
+        self._started = time.monotonic()
+        self._last: tuple[float, str] | None = None
+        self._unchanged = 0
+
+    def file_loaded(self) -> None:
+        self._loaded += 1
+
+    async def emit(self, result: SingleConversionResult) -> None:
+        """Emit a result of this group, counting the outputs it reports as written."""
+        if result.target_id in self._outputs:
+            if not result.running:
+                self._outputs[result.target_id] = 1.0
+            elif result.part_count:
+                self._outputs[result.target_id] = min(
+                    self._outputs[result.target_id] + 1 / result.part_count, 1.0
+                )
+        await self._emit(result)
+
+    def _state(self, progress: dict[str, int]) -> tuple[float, str]:
+        stages: list[tuple[str, int, float]] = [
+            ("load", self._files, max(self._loaded, progress.get("loaded", 0))),
+        ]
+        if self._merge:
+            stages.append(("merge", 1, progress.get("merged", 0)))
+        processed = progress.get("processed", 0)
+        stages.extend(
+            (f"middleware:{middleware_id}", 1, 1 if i < processed else 0)
+            for i, middleware_id in enumerate(self._middleware_ids)
+        )
+        if self._split:
+            stages.append(("split", 1, progress.get("split", 0)))
+        stages.append(("dump", len(self._outputs), sum(self._outputs.values())))
+        total = sum(units for _, units, _ in stages)
+        done = sum(min(count, units) for _, units, count in stages)
+        stage = next((name for name, units, count in stages if count < units), "dump")
+        return done / total, stage
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if all(done == 1.0 for done in self._outputs.values()):
+                return
+            if isinstance(self.progress, dict):
+                progress = self.progress.copy()
+            else:
+                # a manager proxy with a process pool, reading it is a round trip
+                progress = await asyncio.to_thread(self.progress.copy)
+            state = self._state(progress)
+            self._unchanged += 1
+            if state != self._last or self._unchanged >= _HEARTBEAT_INTERVALS:
+                self._last = state
+                self._unchanged = 0
+                fraction, stage = state
+                await self._emit(
+                    SingleConversionResult(
+                        group_id=self.group_id,
+                        running=True,
+                        progress=fraction,
+                        elapsed_seconds=time.monotonic() - self._started,
+                        stage=stage,
+                    )
+                )
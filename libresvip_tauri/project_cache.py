@@ -0,0 +1,138 @@
+import collections
+import dataclasses
+import hashlib
+import os
+import pathlib
+import threading
+from typing import Any
+
+from libresvip.core.compat import json
+from libresvip.core.warning_types import CatchWarnings
+from libresvip.extension.base import OptionsDict, SVSConverter
+from libresvip.model.base import Project
+
+from .config import server_config
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclasses.dataclass
+class ProjectCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+@dataclasses.dataclass
+class _CachedProject:
+    data: dict[str, Any]
+    warning_messages: list[str]
+    size: int
+    # keys of the files known to have this content, see ``ProjectCache._stat_key``
+    stat_keys: set[tuple[str, ...]] = dataclasses.field(default_factory=set)
+
+
+def file_digest(path: pathlib.Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ProjectCache:
+    """Least recently used cache of projects loaded by input plugins.
+
+    Entries are keyed by the input file's content hash together with the
+    plugin and its options, and bounded by the size of their input files.
+    A file whose path, modification time and size were seen before is
+    looked up without hashing it again. Projects are kept in their dumped
+    form, so every hit validates a fresh ``Project`` that the caller is
+    free to modify.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: collections.OrderedDict[tuple[str, ...], _CachedProject] = collections.OrderedDict()
+        self._stat_keys: dict[tuple[str, ...], tuple[str, ...]] = {}
+        self._bytes = 0
+        self._stats = ProjectCacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> ProjectCacheStats:
+        with self._lock:
+            return dataclasses.replace(self._stats, entries=len(self._entries), bytes=self._bytes)
+
+    @staticmethod
+    def _options_key(plugin: type[SVSConverter], options: OptionsDict) -> tuple[str, ...]:
+        return plugin.name, plugin.version or "", json.dumps(options, sort_keys=True, default=str)
+
+    @staticmethod
+    def _stat_key(path: pathlib.Path, stat: os.stat_result, options_key: tuple[str, ...]) -> tuple[str, ...]:
+        return (str(path.absolute()), str(stat.st_mtime_ns), str(stat.st_size), *options_key)
+
+    def _lookup(self, key: tuple[str, ...]) -> _CachedProject | None:
+        if (entry := self._entries.get(key)) is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def load(
+        self, plugin: type[SVSConverter], path: pathlib.Path, options: OptionsDict
+    ) -> tuple[Project, list[str]]:
+        """Load ``path`` with ``plugin``, returning the project and the warnings emitted."""
+        if self.max_bytes <= 0:
+            return self._load(plugin, path, options)
+        stat = path.stat()
+        options_key = self._options_key(plugin, options)
+        stat_key = self._stat_key(path, stat, options_key)
+        with self._lock:
+            key = self._stat_keys.get(stat_key)
+            entry = None if key is None else self._lookup(key)
+        if entry is None:
+            key = (file_digest(path), *options_key)
+            with self._lock:
+                if (entry := self._lookup(key)) is not None:
+                    # the same content under another path or modification time
+                    entry.stat_keys.add(stat_key)
+                    self._stat_keys[stat_key] = key
+        with self._lock:
+            if entry is not None:
+                self._stats.hits += 1
+            else:
+                self._stats.misses += 1
+        if entry is not None:
+            return Project.model_validate(entry.data), list(entry.warning_messages)
+        project, warning_messages = self._load(plugin, path, options)
+        if stat.st_size > self.max_bytes:
+            return project, warning_messages
+        entry = _CachedProject(project.model_dump(by_alias=True), warning_messages, stat.st_size, {stat_key})
+        with self._lock:
+            if (previous := self._entries.pop(key, None)) is not None:
+                self._forget(key, previous)
+            self._entries[key] = entry
+            self._stat_keys[stat_key] = key
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes:
+                self._forget(*self._entries.popitem(last=False))
+                self._stats.evictions += 1
+        return project, list(warning_messages)
+
+    def _forget(self, key: tuple[str, ...], entry: _CachedProject) -> None:
+        self._bytes -= entry.size
+        for stat_key in entry.stat_keys:
+            if self._stat_keys.get(stat_key) == key:
+                del self._stat_keys[stat_key]
+
+    @staticmethod
+    def _load(
+        plugin: type[SVSConverter], path: pathlib.Path, options: OptionsDict
+    ) -> tuple[Project, list[str]]:
+        with CatchWarnings() as w:
+            project = plugin.load(path, options)
+        return project, [w.output] if w.output else []
+
+
+project_cache = ProjectCache(server_config.project_cache_max_bytes)
@@ -0,0 +1,124 @@
+import copy
+import gettext
+import threading
+from importlib.resources import files
+from typing import Any
+
+from libresvip.core.config import settings
+from libresvip.core.constants import res_dir
+from libresvip.extension.vendor import pluginlib
+
+_PLUGIN_PACKAGES = {
+    "svs": "libresvip.plugins",
+    "middleware": "libresvip.middlewares",
+}
+
+
+def _merge_translation(
+    translation: gettext.NullTranslations, resource_dir: Any, language: str
+) -> gettext.NullTranslations:
+    msg_dir = resource_dir / "locales" / language / "LC_MESSAGES"
+    if msg_dir.is_dir():
+        for child_file in msg_dir.iterdir():
+            if child_file.name.endswith(".mo"):
+                with child_file.open("rb") as fp:
+                    merged = copy.copy(translation)
+                    merged.add_fallback(gettext.GNUTranslations(fp))
+                    return merged
+    return translation
+
+
+class PluginRegistry:
+    """Plugins discovered from their metadata and imported on first use.
+
+    At startup only the plugin directories shipped with libresvip are
+    listed; a plugin's modules are imported the first time it is looked up.
+    ``load_all`` imports every plugin through libresvip's own managers,
+    which also picks up plugins installed in the user config directory.
+    """
+
+    def __init__(self) -> None:
+        self._packages = {kind: self._discover(package) for kind, package in _PLUGIN_PACKAGES.items()}
+        self._loaded: dict[tuple[str, str], Any] = {}
+        self._managers: dict[str, pluginlib.PluginLoader] = {}
+        self._translations: dict[tuple[str, bool], gettext.NullTranslations] = {}
+        self._load_lock = threading.Lock()
+        self.ready = threading.Event()
+
+    @staticmethod
+    def _discover(package: str) -> dict[str, str]:
+        packages: dict[str, str] = {}
+        for child in sorted(files(package).iterdir(), key=lambda child: child.name):
+            if child.is_dir() and any(f.name.endswith(".yapsy-plugin") for f in child.iterdir()):
+                # built-in plugins are named after their directory
+                packages[child.name] = f"{package}.{child.name}"
+        return packages
+
+    def start(self) -> None:
+        threading.Thread(target=self.load_all, name="libresvip-plugin-loader", daemon=True).start()
+
+    def load_all(self) -> None:
+        with self._load_lock:
+            if not self.ready.is_set():
+                from libresvip.extension import manager
+
+                self._managers = {
+                    "svs": manager.plugin_manager,
+                    "middleware": manager.middleware_manager,
+                }
+                self.ready.set()
+
+    def plugins(self, kind: str) -> dict[str, Any]:
+        self.load_all()
+        return self._managers[kind].plugins.get(kind, {})
+
+    def available(self, kind: str) -> dict[str, Any]:
+        """Plugins of ``kind`` that can be used without waiting for ``load_all``.
+
+        Until every plugin is loaded, these are the enabled built-in
+        plugins, each imported on its own as ``get`` does.
+        """
+        if self.ready.is_set():
+            return self.plugins(kind)
+        return {
+            identifier: plugin
+            for identifier in self._packages[kind]
+            if not (kind == "svs" and identifier in settings.disabled_plugins)
+            and (plugin := self.get(kind, identifier)) is not None
+        }
+
+    def get(self, kind: str, identifier: str) -> Any:
+        if self.ready.is_set():
+            return self._managers[kind].plugins.get(kind, {}).get(identifier)
+        if (plugin := self._loaded.get((kind, identifier))) is None:
+            package = self._packages[kind].get(identifier)
+            if package is None or (kind == "svs" and identifier in settings.disabled_plugins):
+                # unknown to the metadata, possibly a user plugin
+                return self.plugins(kind).get(identifier)
+            loader = pluginlib.PluginLoader(modules=[package], type_filter=[kind], prefix_package="libresvip")
+            plugin = self._loaded[kind, identifier] = loader.get_plugin(kind, identifier)
+        return plugin
+
+    def svs(self, identifier: str) -> Any:
+        return self.get("svs", identifier)
+
+    def middleware(self, identifier: str) -> Any:
+        return self.get("middleware", identifier)
+
+    def translation(self, language: str) -> gettext.NullTranslations:
+        ready = self.ready.is_set()
+        if (translation := self._translations.get((language, ready))) is None:
+            if ready:
+                from libresvip.extension.manager import get_translation
+
+                translation = get_translation(language)
+            else:
+                translation = _merge_translation(gettext.NullTranslations(), res_dir, language)
+                for packages in self._packages.values():
+                    for package in packages.values():
+                        translation = _merge_translation(translation, files(package), language)
+            self._translations[language, ready] = translation
+        return translation
+
+
+plugin_registry = PluginRegistry()
@@ -0,0 +1,73 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from typing import Generic, TypeVar
+
+from .engine import ConversionEngine
+from .fairness import FairStream, current_stream
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+Emit = Callable[[R], Awaitable[None]]
+
+
+class _Done:
+    def __init__(self, error: BaseException | None = None) -> None:
+        self.error = error
+
+
+class BatchScheduler(Generic[T, R]):
+    """Feeds jobs to the engine as its slots free up.
+
+    At most ``engine.max_concurrency`` jobs run at once across the whole
+    server, shared between the streams by their weights, and at most
+    ``queue_size`` events wait for the consumer, so a slow stream stops new
+    jobs from being started.
+    """
+
+    def __init__(self, engine: ConversionEngine, queue_size: int) -> None:
+        self.engine = engine
+        self.queue_size = queue_size
+
+    async def run(
+        self,
+        jobs: Iterable[T],
+        process: Callable[[T, Emit[R]], Awaitable[None]],
+        stream: FairStream | None = None,
+    ) -> AsyncIterator[R]:
+        queue: asyncio.Queue[R | _Done] = asyncio.Queue(maxsize=self.queue_size)
+        pending = iter(jobs)
+
+        async def worker() -> None:
+            if stream is not None:
+                # only set in this task and those it starts
+                current_stream.set(stream)
+            for job in pending:
+                async with self.engine.slot():
+                    await process(job, queue.put)
+
+        async def drive() -> None:
+            workers = [
+                asyncio.create_task(worker()) for _ in range(self.engine.max_concurrency)
+            ]
+            try:
+                await asyncio.gather(*workers)
+            except asyncio.CancelledError:
+                for task in workers:
+                    task.cancel()
+                raise
+            except Exception as e:
+                for task in workers:
+                    task.cancel()
+                await queue.put(_Done(e))
+            else:
+                await queue.put(_Done())
+
+        driver = asyncio.create_task(drive())
+        try:
+            while not isinstance(item := await queue.get(), _Done):
+                yield item
+            if item.error is not None:
+                raise item.error
+        finally:
+            driver.cancel()
@@ -1,5 +1,6 @@
 import asyncio
 import argparse
+import multiprocessing
 import os
 import sys
 import threading
@@ -11,7 +12,7 @@ import psutil
 from hypercorn.config import Config
 from hypercorn.asyncio import serve
 
-from libresvip_tauri.service import app
+from libresvip_tauri.config import ExecutorKind, server_config
 
 
 shutdown_event = asyncio.Event()
@@ -26,9 +27,50 @@ def check_parent_pid(parent_pid: int):
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     parser = argparse.ArgumentParser(description="LibreSVIP Tauri Server")
     parser.add_argument("--parent-pid", type=int, default=0, help="Parent PID to check for")
+    parser.add_argument(
+        "--executor",
+        choices=[kind.value for kind in ExecutorKind],
+        default=server_config.executor.value,
+        help="Run conversions in a thread pool or a process pool",
+    )
+    parser.add_argument("--max-workers", type=int, default=server_config.max_workers, help="Maximum number of conversion workers")
+    parser.add_argument("--max-concurrency", type=int, default=server_config.max_concurrency, help="Maximum number of groups converted at once")
+    parser.add_argument("--queue-size", type=int, default=server_config.queue_size, help="Maximum number of results buffered per conversion stream")
+    parser.add_argument("--spill-threshold", type=int, default=server_config.spill_threshold, help="Outputs larger than this many bytes are staged on disk")
+    parser.add_argument("--memory-budget", type=int, default=server_config.memory_budget, help="Maximum number of bytes of outputs staged in memory")
+    parser.add_argument("--staging-ttl", type=int, default=server_config.staging_ttl, help="Seconds before an unclaimed output is evicted")
+    parser.add_argument("--staging-max-bytes", type=int, default=server_config.staging_max_bytes, help="Maximum number of bytes of unclaimed outputs kept")
+    parser.add_argument(
+        "--warm-languages",
+        nargs="*",
+        default=list(server_config.warm_languages),
+        help="Languages whose plugin infos are prepared in the background at startup",
+    )
+    parser.add_argument("--project-cache-max-bytes", type=int, default=server_config.project_cache_max_bytes, help="Maximum number of bytes of input files whose loaded projects are cached for repeated conversions, 0 to disable")
+    parser.add_argument("--profile", action="store_true", default=server_config.profile, help="Profile every conversion as if requested with ConversionRequest.profile")
+    parser.add_argument("--progress-interval-ms", type=int, default=server_config.progress_interval_ms, help="Milliseconds between progress events of a group, 0 to disable them")
+    parser.add_argument("--output-cache-dir", default=server_config.output_cache_dir, help="Directory caching converted outputs across restarts, disabled when empty")
+    parser.add_argument("--output-cache-max-bytes", type=int, default=server_config.output_cache_max_bytes, help="Maximum number of bytes of cached outputs kept")
     args = parser.parse_args()
+    server_config.executor = ExecutorKind(args.executor)
+    server_config.max_workers = args.max_workers
+    server_config.max_concurrency = args.max_concurrency
+    server_config.queue_size = args.queue_size
+    server_config.spill_threshold = args.spill_threshold
+    server_config.memory_budget = args.memory_budget
+    server_config.staging_ttl = args.staging_ttl
+    server_config.staging_max_bytes = args.staging_max_bytes
+    server_config.warm_languages = tuple(args.warm_languages)
+    server_config.project_cache_max_bytes = args.project_cache_max_bytes
+    server_config.profile = args.profile
+    server_config.progress_interval_ms = args.progress_interval_ms
+    server_config.output_cache_dir = args.output_cache_dir
+    server_config.output_cache_max_bytes = args.output_cache_max_bytes
+
+    from libresvip_tauri.service import app
 
     check_thread = None
     if args.parent_pid != 0 and args.parent_pid != os.getpid():
@@ -1,448 +1,1199 @@
 import asyncio
-import enum
-import gettext
-import importlib.metadata
+import collections
+import contextlib
+import dataclasses
+import hashlib
 import pathlib
-import re
+import shutil
 import traceback
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Callable, Sequence
 from functools import partial
-from typing import get_args, get_type_hints
+from typing import Any
 
 from connectrpc.request import RequestContext
-from libresvip.core.compat import json
-from libresvip.core.config import (
-    LYRIC_REPLACE_MODE_PREFIX_SUFFIX,
-    LibreSVIPSettingsContainer,
-    LibreSvipBaseUISettings,
-    LyricsReplacement,
-    LyricsReplaceMode,
-)
-from libresvip.core.warning_types import CatchWarnings
-from libresvip.extension.base import (
-    OptionsDict,
-    ReadOnlyConverterMixin,
-    SVSConverter,
-    WriteOnlyConverterMixin,
-)
-from libresvip.extension.manager import (
-    get_translation,
-    middleware_manager,
-    plugin_manager,
-)
+from libresvip.core.config import LibreSVIPSettingsContainer, LibreSvipBaseUISettings, LyricsReplacement
+from libresvip.extension.base import OptionsDict, SVSConverter
 from libresvip.model.base import Project
-from libresvip.utils.translation import lazy_translation
 from pydantic import ValidationError
-from pydantic._internal._core_utils import CoreSchemaOrField
-from pydantic.json_schema import GenerateJsonSchema, JsonSchemaValue
 from starlette.applications import Starlette
 from starlette.middleware.cors import CORSMiddleware
-from typing_extensions import override
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 from upath import UPath
 
+from .cancellation import CancelScope
+from .config import server_config
+from .conversion import (
+    CancelEvent,
+    LoadedChild,
+    Progress,
+    convert_one_group,
+    dump_target,
+    dump_part,
+    load_child,
+    prepare_group,
+    prepare_parts,
+)
+from .engine import ConversionEngine
 from .libresvip_tauri_connect import Conversion, ConversionASGIApplication
 from .libresvip_tauri_pb import (
+    CancelConversionRequest,
+    CancelConversionResponse,
     ConflictPolicy,
     ConversionGroup,
     ConversionMode,
+    ConversionPriority,
     ConversionRequest,
+    GetProfileRequest,
+    GetProfileResponse,
     MoveFileRequest,
     MoveFileResponse,
-    PluginCategory,
-    PluginInfo,
+    MoveFilesEntry,
+    MoveFilesRequest,
     PluginInfosRequest,
     PluginInfosResponse,
     SingleConversionResult,
+    StageTiming,
     VersionRequest,
     VersionResponse,
 )
+from .lyrics import compile_rule
+from .metrics import ConversionMetrics, timed
+from .output_cache import CachedOutput, EntryWriter, OutputCache
+from .pipeline import MiddlewarePipeline, build_pipeline
+from .plugin_infos import PluginInfosCache
+from .profiling import ALLOCATIONS_NAME, PSTATS_NAME, REPORT_NAME, profile_call
+from .progress import ProgressReporter
+from .project_cache import project_cache
+from .registry import plugin_registry
+from .scheduler import BatchScheduler, Emit
+from .singleflight import Flight, Follower, SingleFlight, file_identity, fingerprint
+from .staging import (
+    StagingJanitor,
+    create_direct_staging,
+    create_staging_root,
+    deliver,
+    link_staged,
+    part_destination,
+    place_output,
+    profile_name,
+    remove_staged,
+    staged_name,
+)
 
-_PROTO_MODE_TO_ENUM = {
-    0: LyricsReplaceMode.FULL,
-    1: LyricsReplaceMode.ALPHABETIC,
-    2: LyricsReplaceMode.NON_ALPHABETIC,
-    3: LyricsReplaceMode.REGEX,
+_MOVE_FILES_CONCURRENCY = 8
+
+# shares of the engine while other conversions compete for it
+_PRIORITY_WEIGHTS = {
+    ConversionPriority.LOW: 1,
+    ConversionPriority.NORMAL: 4,
+    ConversionPriority.HIGH: 16,
 }
 
+_SETTINGS_CACHE_SIZE = 64
+
 _DEFAULT_SETTINGS = LibreSvipBaseUISettings.model_construct(
     lyric_replace_rules={"default": []},
 )
 
 
+# settings only depend on the lyric replacement rules of a request
+_settings_cache: collections.OrderedDict[bytes, LibreSvipBaseUISettings] = collections.OrderedDict()
+
+
 def _request_to_settings(request: ConversionRequest) -> LibreSvipBaseUISettings:
+    key = hashlib.sha256(
+        ConversionRequest(lyric_replace_rules=request.lyric_replace_rules).to_binary()
+    ).digest()
+    if (settings := _settings_cache.get(key)) is not None:
+        _settings_cache.move_to_end(key)
+        return settings
     rules: dict[str, list[LyricsReplacement]] = {}
     for group in request.lyric_replace_rules:
-        group_rules: list[LyricsReplacement] = []
-        for r in group.rules:
-            mode = _PROTO_MODE_TO_ENUM.get(r.mode, LyricsReplaceMode.FULL)
-            prefix = r.pattern_prefix
-            suffix = r.pattern_suffix
-            if not prefix and not suffix and mode.value in LYRIC_REPLACE_MODE_PREFIX_SUFFIX:
-                prefix, suffix = LYRIC_REPLACE_MODE_PREFIX_SUFFIX[mode.value]
-            group_rules.append(
-                LyricsReplacement(
-                    mode=mode,
-                    replacement=r.replacement,
-                    pattern_main=r.pattern_main,
-                    pattern_prefix=prefix,
-                    pattern_suffix=suffix,
-                    flags=re.RegexFlag(r.flags) if r.flags else re.IGNORECASE,
-                )
-            )
-        rules[group.preset_name] = group_rules
+        rules[group.preset_name] = [compile_rule(r) for r in group.rules]
     rules.setdefault("default", [])
-    return LibreSvipBaseUISettings.model_construct(lyric_replace_rules=rules)
-
-
-class GettextGenerateJsonSchema(GenerateJsonSchema):
-    def __init__(self, translator: gettext.NullTranslations, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.translator = translator
-
-    @override
-    def generate_inner(self, schema: CoreSchemaOrField) -> JsonSchemaValue:
-        json_schema = super().generate_inner(schema)
-        if "title" in json_schema:
-            json_schema["title"] = self.translator.gettext(json_schema["title"])
-        if "description" in json_schema:
-            json_schema["description"] = self.translator.gettext(json_schema["description"])
-        return json_schema
-
-
-translators_cache: dict[str, gettext.NullTranslations] = {}
-
-
-def option_schema(option_cls, translator: gettext.NullTranslations) -> tuple[str, str, str]:
-    json_schema = option_cls.model_json_schema(
-        schema_generator=partial(GettextGenerateJsonSchema, translator=translator),
-    )
-    json_schema.pop("title", None)
-    json_schema["required"] = list(
-        json_schema["properties"].keys()
-    )
-    ui_schema = {
-        "ui:submitButtonOptions": {
-            "norender": True
-        }
-    }
-    for field_name, field_info in option_cls.model_fields.items():
-        if issubclass(field_info.annotation, enum.Enum):
-            enum_names = []
-            type_hints = get_type_hints(field_info.annotation, include_extras=True)
-            annotations = None
-            if "_value_" in type_hints:
-                value_args = get_args(type_hints["_value_"])
-                if len(value_args) >= 2:
-                    model = value_args[1]
-                    if hasattr(model, "model_fields"):
-                        annotations = model.model_fields
-            if annotations is None:
-                continue
-            for enum_item in field_info.annotation:
-                if enum_item.name in annotations:
-                    enum_field = annotations[enum_item.name]
-                    enum_names.append(translator.gettext(enum_field.title))
-            ui_schema[field_name] = {
-                "ui:enumNames": enum_names
-            }
-
-    return (
-        json.dumps(json_schema),
-        json.dumps(ui_schema),
-        option_cls().model_dump_json(),
-    )
-
-
-def convert_one_group(
-    fs: UPath,
-    mode: ConversionMode,
-    max_track_count: int,
-    group: ConversionGroup,
-    input_plugin: SVSConverter,
-    output_plugin: SVSConverter,
-    input_options: OptionsDict,
-    output_options: OptionsDict,
-    middleware_options: dict[str, str],
-    language: str,
-) -> SingleConversionResult:
-    lazy_translation.set(get_translation(language))
-    result = SingleConversionResult(group_id=group.group_id, running=False)
-    project = None
-    if mode == ConversionMode.MERGE:
-        child_projects = []
-        for file_path in group.file_paths:
-            try:
-                with CatchWarnings() as w:
-                    child_projects.append(input_plugin.load(pathlib.Path(file_path), input_options))
-                if w.output:
-                    result.warning_messages.append(w.output)
-            except Exception:
-                result.completed = False
-                result.error_message = traceback.format_exc()
-                project = None
-                break
-        else:
-            project = Project.merge_projects(child_projects)
+    settings = _settings_cache[key] = LibreSvipBaseUISettings.model_construct(lyric_replace_rules=rules)
+    if len(_settings_cache) > _SETTINGS_CACHE_SIZE:
+        _settings_cache.popitem(last=False)
+    return settings
+
+
+@dataclasses.dataclass
+class _OutputTarget:
+    target_id: str
+    output_format: str
+    plugin: SVSConverter
+    options: OptionsDict
+
+
+def _resolve_output_target(target_id: str, output_format: str, output_options: str) -> _OutputTarget:
+    if (plugin := plugin_registry.svs(output_format)) is None:
+        raise KeyError(output_format)
+    try:
+        options = plugin.output_option_cls.model_validate_json(output_options)
+    except ValidationError:
+        options = plugin.output_option_cls()
+    return _OutputTarget(target_id, output_format, plugin, options.model_dump())
+
+
+def _failed_merge(group: ConversionGroup, children: list[LoadedChild]) -> SingleConversionResult | None:
+    result = SingleConversionResult(group_id=group.group_id)
+    for child in children:
+        result.timings.extend(child.timings)
+        result.input_bytes += child.input_bytes
+        if child.error_message:
+            result.error_message = child.error_message
+            return result
+        result.warning_messages.extend(child.warning_messages)
+    if any(child.cancelled for child in children):
+        result.cancelled = True
+        return result
+    return None
+
+
+async def _emit_per_target(
+    result: SingleConversionResult, targets: list[_OutputTarget], emit: Emit[SingleConversionResult]
+) -> None:
+    for target in targets:
+        await emit(
+            SingleConversionResult(
+                group_id=result.group_id,
+                target_id=target.target_id,
+                cancelled=result.cancelled,
+                error_message=result.error_message,
+                warning_messages=list(result.warning_messages),
+                timings=list(result.timings),
+                input_bytes=result.input_bytes,
+            )
+        )
+
+
+def _deliver_timed(timings: list[StageTiming], src: UPath, dst: pathlib.Path) -> None:
+    with timed(timings, "move"):
+        deliver(src, dst)
+
+
+def _destinations(
+    output_dir: pathlib.Path, group: ConversionGroup, targets: list[_OutputTarget]
+) -> dict[str, pathlib.Path]:
+    """Paths of the outputs of a group in ``output_dir``, those of split parts are numbered from there."""
+    if group.stem:
+        stem = group.stem
+    elif group.file_paths:
+        stem = pathlib.Path(group.file_paths[0]).stem
     else:
-        file_path = group.file_paths[0]
+        stem = group.group_id
+    formats = collections.Counter(target.output_format for target in targets)
+    return {
+        # targets sharing a format would otherwise write to the same file
+        target.target_id: output_dir / (
+            f"{stem}_{target.target_id}.{target.output_format}"
+            if formats[target.output_format] > 1
+            else f"{stem}.{target.output_format}"
+        )
+        for target in targets
+    }
+
+
+def _place_timed(
+    result: SingleConversionResult,
+    src: pathlib.Path,
+    dst: pathlib.Path,
+    conflict_policy: ConflictPolicy,
+    part: bool = False,
+) -> None:
+    with timed(result.timings, "move"):
         try:
-            with CatchWarnings() as w:
-                project = input_plugin.load(pathlib.Path(file_path), input_options)
-            if w.output:
-                result.warning_messages.append(w.output)
-        except Exception:
+            output_path = place_output(src, dst, conflict_policy)
+        except OSError:
             result.completed = False
             result.error_message = traceback.format_exc()
-    if project is not None:
-        middlewares = middleware_manager.plugins.get("middleware", {})
-        for middleware_id, middleware_option_str in middleware_options.items():
-            if middleware := middlewares.get(middleware_id):
-                try:
-                    process_options = middleware.process_option_cls.model_validate_json(
-                        middleware_option_str
-                    )
-                except ValidationError:
-                    process_options = middleware.process_option_cls()
-                try:
-                    with CatchWarnings() as w:
-                        project = middleware.process(project, process_options.model_dump())
-                    if w.output:
-                        result.warning_messages.append(w.output)
-                except Exception:
-                    result.completed = False
-                    result.error_message = traceback.format_exc()
-                    project = None
-                    break
-    if project is not None:
-        group_path = fs / group.group_id
-        if mode == ConversionMode.SPLIT:
-            group_path.mkdir()
-            for i, sub_proj in enumerate(project.split_tracks(max_track_count)):
-                child_path = group_path / str(i)
-                try:
-                    with CatchWarnings() as w:
-                        output_plugin.dump(child_path, sub_proj, output_options)
-                    if w.output:
-                        result.warning_messages.append(w.output)
-                except Exception:
-                    result.completed = False
-                    result.error_message = traceback.format_exc()
-                    break
-            else:
-                result.completed = True
-        else:
-            child_path = group_path
-            try:
-                output_plugin.dump(child_path, project, output_options)
-                result.completed = True
-            except Exception:
-                result.completed = False
-                result.error_message = traceback.format_exc()
-    return result
+            return
+    if output_path is None and not part:
+        # kept like MoveFile does; a kept part still lets the other parts be written
+        result.skipped = True
+    result.output_path = str(output_path or dst)
+
+
+def _place_parts(
+    result: SingleConversionResult, staged_path: UPath, destination: pathlib.Path, conflict_policy: ConflictPolicy
+) -> None:
+    # parts not placed as they were written, such as those of a cached output
+    for child in sorted(staged_path.iterdir(), key=lambda child: int(child.name)):
+        _place_timed(
+            result, pathlib.Path(child.path), part_destination(destination, child.name), conflict_policy, True
+        )
+        if not result.completed:
+            break
+    remove_staged(staged_path)
 
 
 class ConversionService(Conversion):
     def __init__(self) -> None:
-        self._fs = UPath("memory://")
+        self._engine = ConversionEngine(
+            server_config.executor,
+            server_config.max_workers,
+            server_config.max_concurrency,
+        )
+        self._scheduler = BatchScheduler(self._engine, server_config.queue_size)
+        self._cancel_scopes: dict[str, CancelScope] = {}
+        self._fs = create_staging_root(server_config, self._engine.is_process)
+        self._janitor = StagingJanitor(self._fs, server_config.staging_ttl, server_config.staging_max_bytes)
+        self._janitor.start()
+        plugin_registry.start()
+        self._plugin_infos = PluginInfosCache()
+        self._plugin_infos.warm_up(server_config.warm_languages)
+        self.metrics = ConversionMetrics()
+        self._flights = SingleFlight()
+        self.coalesced_groups = 0
+        self._output_cache = OutputCache(server_config.output_cache_dir, server_config.output_cache_max_bytes)
 
     async def plugin_infos(self, request: PluginInfosRequest, ctx: RequestContext) -> PluginInfosResponse:
+        identifiers = list(request.identifiers)
+        if (response := self._plugin_infos.cached(request.category, request.language, identifiers)) is not None:
+            return response
         async with LibreSVIPSettingsContainer.state.override_context(_DEFAULT_SETTINGS):
-            if request.language not in translators_cache:
-                translator = get_translation(request.language)
-                translators_cache[request.language] = translator
-            translator = translators_cache[request.language]
-            plugin_infos: list[PluginInfo] = []
-            match request.category:
-                case PluginCategory.MIDDLEWARE:
-                    plugins = middleware_manager.plugins.get("middleware", {})
-                    for identifier, plugin in plugins.items():
-                        json_schema, ui_schema, default_value = option_schema(plugin.process_option_cls, translator)
-                        plugin_infos.append(
-                            PluginInfo(
-                                identifier=identifier,
-                                name=plugin.info.name,
-                                author=translator.gettext(plugin.info.author),
-                                description=translator.gettext(plugin.info.description),
-                                website=plugin.info.website,
-                                version=plugin.version,
-                                json_schema=json_schema,
-                                ui_json_schema=ui_schema,
-                                default_json_value=default_value,
-                            )
-                        )
-                case PluginCategory.OUTPUT:
-                    plugins = {
-                        identifier: plugin
-                        for identifier, plugin in plugin_manager.plugins.get("svs", {}).items()
-                        if not issubclass(plugin, ReadOnlyConverterMixin)
-                    }
-                    for identifier, plugin in plugins.items():
-                        json_schema, ui_schema, default_value = option_schema(plugin.output_option_cls, translator)
-                        plugin_infos.append(
-                            PluginInfo(
-                                identifier=identifier,
-                                name=plugin.info.name,
-                                author=translator.gettext(plugin.info.author),
-                                description=translator.gettext(plugin.info.description),
-                                website=plugin.info.website,
-                                version=plugin.version,
-                                file_format=translator.gettext(plugin.info.file_format),
-                                suffixes=[plugin.info.suffix],
-                                icon_base64=plugin.info.icon_base64 or "",
-                                json_schema=json_schema,
-                                ui_json_schema=ui_schema,
-                                default_json_value=default_value,
-                            )
-                        )
-                case _:
-                    plugins = {
-                        identifier: plugin
-                        for identifier, plugin in plugin_manager.plugins.get("svs", {}).items()
-                        if not issubclass(plugin, WriteOnlyConverterMixin)
-                    }
-                    for identifier, plugin in plugins.items():
-                        json_schema, ui_schema, default_value = option_schema(plugin.input_option_cls, translator)
-                        plugin_infos.append(
-                            PluginInfo(
-                                identifier=identifier,
-                                name=plugin.info.name,
-                                author=translator.gettext(plugin.info.author),
-                                description=translator.gettext(plugin.info.description),
-                                website=plugin.info.website,
-                                version=plugin.version,
-                                file_format=translator.gettext(plugin.info.file_format),
-                                suffixes=plugin.info.suffixes,
-                                icon_base64=plugin.info.icon_base64 or "",
-                                json_schema=json_schema,
-                                ui_json_schema=ui_schema,
-                                default_json_value=default_value,
-                            )
-                        )
-            return PluginInfosResponse(values=plugin_infos)
+            return await asyncio.to_thread(
+                self._plugin_infos.get, request.category, request.language, identifiers
+            )
 
     async def version(self, request: VersionRequest, ctx: RequestContext) -> VersionResponse:
-        return VersionResponse(version=importlib.metadata.version("libresvip"))
+        return VersionResponse(
+            version=self._plugin_infos.libresvip_version,
+            plugins_loaded=plugin_registry.ready.is_set(),
+        )
 
     async def convert(self, request: ConversionRequest, ctx: RequestContext) -> AsyncIterator[SingleConversionResult]:
-        async with LibreSVIPSettingsContainer.state.override_context(_request_to_settings(request)):
-            futures = []
-            input_plugin = plugin_manager.plugins.get("svs", {})[request.input_format]
-            output_plugin = plugin_manager.plugins.get("svs", {})[request.output_format]
+        settings = _request_to_settings(request)
+        async with LibreSVIPSettingsContainer.state.override_context(settings):
+            # the first use of a plugin imports its modules
+            input_plugin = await asyncio.to_thread(plugin_registry.svs, request.input_format)
+            if input_plugin is None:
+                raise KeyError(request.input_format)
             try:
                 input_options = input_plugin.input_option_cls.model_validate_json(
                     request.input_options
                 )
             except ValidationError:
                 input_options = input_plugin.input_option_cls()
+            input_option_dict = input_options.model_dump()
+            pipeline = await asyncio.to_thread(build_pipeline, request.middleware_options)
+            if request.outputs:
+                targets = [
+                    await asyncio.to_thread(
+                        _resolve_output_target,
+                        output.target_id or output.output_format,
+                        output.output_format,
+                        output.output_options,
+                    )
+                    for output in request.outputs
+                ]
+                if len({target.target_id for target in targets}) != len(targets):
+                    raise ValueError("duplicate output target ids")
+            else:
+                targets = [
+                    await asyncio.to_thread(
+                        _resolve_output_target, "", request.output_format, request.output_options
+                    )
+                ]
+
+            fs = self._fs
+            output_dir = None
+            if request.output_dir:
+                if request.conflict_policy == ConflictPolicy.PROMPT:
+                    raise ValueError("outputs written to output_dir cannot prompt for conflicts")
+                output_dir = pathlib.Path(request.output_dir).absolute()
+                # written next to their destination, so they are renamed into place
+                fs = UPath(await asyncio.to_thread(create_direct_staging, output_dir))
+            profile = request.profile or server_config.profile
+            stream = self._engine.stream(_PRIORITY_WEIGHTS.get(request.priority, _PRIORITY_WEIGHTS[ConversionPriority.NORMAL]))
+            scope = CancelScope(self._engine)
+            if request.conversion_id:
+                self._cancel_scopes[request.conversion_id] = scope
+
+            # what makes two groups the same work, apart from their files
+            work_key = [
+                request.mode,
+                request.max_track_count,
+                request.input_format,
+                input_option_dict,
+                [[step.identifier, step.options] for step in pipeline.steps],
+                request.language,
+                ConversionRequest(lyric_replace_rules=request.lyric_replace_rules).to_binary().hex(),
+            ]
+
+            # what else decides the outputs kept in the output cache
+            cache_parts = [
+                work_key,
+                self._plugin_infos.libresvip_version,
+                input_plugin.version or "",
+                [step.middleware.version or "" for step in pipeline.steps],
+            ]
+
+            def group_key(group: ConversionGroup, group_targets: list[_OutputTarget]) -> str | None:
+                try:
+                    files = [file_identity(file_path) for file_path in group.file_paths]
+                except OSError:
+                    return None
+                return fingerprint(
+                    work_key, files, [[target.output_format, target.options] for target in group_targets]
+                )
+
+            async def convert_group(
+                group: ConversionGroup,
+                group_targets: list[_OutputTarget],
+                cancel_event: CancelEvent,
+                emit: Emit[SingleConversionResult],
+            ) -> None:
+                writers: dict[str, EntryWriter] = {}
+                if self._output_cache.enabled and not profile:
+                    group_targets, cache_keys = await self._restore_cached(fs, group, group_targets, cache_parts, emit)
+                    if not group_targets:
+                        return
+                    emit = partial(
+                        self._store_cached, fs, cache_keys, writers, request.mode == ConversionMode.SPLIT, emit
+                    )
+                progress = None
+                reporting = None
+                on_loaded = None
+                if server_config.progress_interval_ms > 0:
+                    progress = await self._engine.create_progress()
+                    reporter = ProgressReporter(
+                        group,
+                        request.mode,
+                        [step.identifier for step in pipeline.steps],
+                        [target.target_id for target in group_targets],
+                        progress,
+                        server_config.progress_interval_ms / 1000,
+                        emit,
+                    )
+                    reporting = asyncio.create_task(reporter.run())
+                    emit = reporter.emit
+                    on_loaded = reporter.file_loaded
+                try:
+                    if profile:
+                        # one call per target, so each profile covers a whole conversion
+                        for target in group_targets:
+                            try:
+                                result = await self._engine.run(
+                                    settings,
+                                    profile_call,
+                                    self._fs,
+                                    profile_name(group.group_id, target.target_id),
+                                    convert_one_group,
+                                    fs,
+                                    request.mode,
+                                    request.max_track_count,
+                                    group,
+                                    input_plugin,
+                                    target.plugin,
+                                    input_option_dict,
+                                    target.options,
+                                    pipeline,
+                                    request.language,
+                                    cancel_event,
+                                    target.target_id,
+                                    None,
+                                    progress,
+                                    cancel_event=cancel_event,
+                                    on_cancel=partial(
+                                        remove_staged, fs / staged_name(group.group_id, target.target_id)
+                                    ),
+                                )
+                            except Exception:
+                                # a profile that cannot be taken only fails its own target
+                                result = SingleConversionResult(
+                                    group_id=group.group_id,
+                                    target_id=target.target_id,
+                                    error_message=traceback.format_exc(),
+                                )
+                            await emit(result)
+                        return
+                    children = None
+                    if request.mode == ConversionMode.MERGE and len(group.file_paths) > 1:
+                        children = await self._load_children(
+                            settings, group, input_plugin, input_option_dict, request.language, cancel_event, on_loaded
+                        )
+                        if (failed := _failed_merge(group, children)) is not None:
+                            await _emit_per_target(failed, group_targets, emit)
+                            return
+                    if request.mode == ConversionMode.SPLIT:
+                        await self._split(
+                            request, settings, fs, group, input_plugin, input_option_dict, pipeline, group_targets, cancel_event, progress, emit
+                        )
+                    elif len(group_targets) == 1:
+                        result = await self._engine.run(
+                            settings,
+                            convert_one_group,
+                            fs,
+                            request.mode,
+                            request.max_track_count,
+                            group,
+                            input_plugin,
+                            group_targets[0].plugin,
+                            input_option_dict,
+                            group_targets[0].options,
+                            pipeline,
+                            request.language,
+                            cancel_event,
+                            group_targets[0].target_id,
+                            children,
+                            progress,
+                            cancel_event=cancel_event,
+                            on_cancel=partial(
+                                remove_staged, fs / staged_name(group.group_id, group_targets[0].target_id)
+                            ),
+                        )
+                        await emit(result)
+                    else:
+                        await self._fan_out(
+                            request, settings, fs, group, input_plugin, input_option_dict, pipeline, group_targets, cancel_event, children, progress, emit
+                        )
+                finally:
+                    if reporting is not None:
+                        reporting.cancel()
+                    for writer in writers.values():
+                        await asyncio.to_thread(writer.abort)
+
+            async def process(group: ConversionGroup, emit: Emit[SingleConversionResult]) -> None:
+                if scope.is_cancelled(group.group_id):
+                    for target in targets:
+                        await emit(SingleConversionResult(group_id=group.group_id, target_id=target.target_id, cancelled=True))
+                    return
+                for target in targets:
+                    await emit(SingleConversionResult(group_id=group.group_id, target_id=target.target_id, running=True, error_message="", warning_messages=[]))
+                cancel_event = await scope.event(group.group_id)
+                names = [staged_name(group.group_id, target.target_id) for target in targets]
+                if profile:
+                    names += [profile_name(group.group_id, target.target_id) for target in targets]
+                for name in names:
+                    self._janitor.pin(name)
+                try:
+                    if output_dir is not None:
+                        destinations = _destinations(output_dir, group, targets)
+                        group_targets = targets
+                        if request.conflict_policy == ConflictPolicy.SKIP and request.mode != ConversionMode.SPLIT:
+                            group_targets = await self._skip_existing(group, targets, destinations, emit)
+                        if group_targets:
+                            # written files would be renamed away from under followers
+                            await convert_group(
+                                group,
+                                group_targets,
+                                cancel_event,
+                                partial(
+                                    self._write_direct,
+                                    fs,
+                                    destinations,
+                                    request.conflict_policy,
+                                    request.mode == ConversionMode.SPLIT,
+                                    emit,
+                                ),
+                            )
+                        return
+                    if profile:
+                        # profiles are per group and cannot be shared
+                        await convert_group(group, targets, cancel_event, emit)
+                        return
+                    group_targets = targets
+                    target_ids = [target.target_id for target in targets]
+                    key = await asyncio.to_thread(group_key, group, targets)
+                    if key is not None and (
+                        follower := self._flights.follow(key, group.group_id, target_ids)
+                    ) is not None:
+                        self.coalesced_groups += 1
+                        # whatever the leader did not deliver is converted here
+                        group_targets = await self._follow(follower, targets, scope, emit)
+                        if not group_targets:
+                            return
+                        key = await asyncio.to_thread(group_key, group, group_targets)
+                    if key is None:
+                        await convert_group(group, group_targets, cancel_event, emit)
+                        return
+                    with self._flights.lead(
+                        key, group.group_id, [target.target_id for target in group_targets]
+                    ) as flight:
+                        await convert_group(group, group_targets, cancel_event, partial(self._publish, flight, emit))
+                finally:
+                    scope.release(group.group_id)
+                    if output_dir is None:
+                        # reported as converted, they wait for MoveFile
+                        for target in targets:
+                            self._janitor.hold(staged_name(group.group_id, target.target_id))
+                    for name in names:
+                        self._janitor.unpin(name)
+
             try:
-                output_options = output_plugin.output_option_cls.model_validate_json(
-                    request.output_options
+                output_formats = {target.target_id: target.output_format for target in targets}
+                async with contextlib.aclosing(self._scheduler.run(request.groups, process, stream)) as results:
+                    async for result in results:
+                        if not result.running:
+                            self.metrics.record(
+                                request.input_format, output_formats[result.target_id], result
+                            )
+                        yield result
+            finally:
+                # a dropped stream stops whatever is still queued or running
+                scope.cancel()
+                if self._cancel_scopes.get(request.conversion_id) is scope:
+                    del self._cancel_scopes[request.conversion_id]
+                if output_dir is not None:
+                    await asyncio.to_thread(shutil.rmtree, fs.path, True)
+
+    async def _skip_existing(
+        self,
+        group: ConversionGroup,
+        targets: list[_OutputTarget],
+        destinations: dict[str, pathlib.Path],
+        emit: Emit[SingleConversionResult],
+    ) -> list[_OutputTarget]:
+        """Emit the targets whose destination exists as skipped, and return the others."""
+        remaining = []
+        for target in targets:
+            destination = destinations[target.target_id]
+            if await asyncio.to_thread(destination.exists):
+                await emit(
+                    SingleConversionResult(
+                        group_id=group.group_id,
+                        target_id=target.target_id,
+                        completed=True,
+                        skipped=True,
+                        output_path=str(destination),
+                    )
                 )
-            except ValidationError:
-                output_options = output_plugin.output_option_cls()
-            for group in request.groups:
-                yield SingleConversionResult(group_id=group.group_id, running=True, error_message="", warning_messages=[])
-                coro = asyncio.to_thread(
-                    convert_one_group,
-                    self._fs,
+            else:
+                remaining.append(target)
+        return remaining
+
+    async def _write_direct(
+        self,
+        fs: UPath,
+        destinations: dict[str, pathlib.Path],
+        conflict_policy: ConflictPolicy,
+        split: bool,
+        emit: Emit[SingleConversionResult],
+        result: SingleConversionResult,
+    ) -> None:
+        """Emit a result, first renaming the output it reports as written to its destination."""
+        if result.target_id in destinations and not (result.running and not result.part_count):
+            staged_path = fs / staged_name(result.group_id, result.target_id)
+            destination = destinations[result.target_id]
+            if result.running:
+                if result.completed:
+                    await asyncio.to_thread(
+                        _place_timed,
+                        result,
+                        pathlib.Path((staged_path / str(result.part_index)).path),
+                        part_destination(destination, str(result.part_index)),
+                        conflict_policy,
+                        True,
+                    )
+            elif split:
+                if result.completed:
+                    await asyncio.to_thread(_place_parts, result, staged_path, destination, conflict_policy)
+                else:
+                    await asyncio.to_thread(remove_staged, staged_path)
+            elif result.completed:
+                await asyncio.to_thread(
+                    _place_timed, result, pathlib.Path(staged_path.path), destination, conflict_policy
+                )
+        await emit(result)
+
+    async def _restore_cached(
+        self,
+        fs: UPath,
+        group: ConversionGroup,
+        targets: list[_OutputTarget],
+        cache_parts: list[Any],
+        emit: Emit[SingleConversionResult],
+    ) -> tuple[list[_OutputTarget], dict[str, str]]:
+        """Emit the outputs of a group found in the output cache.
+
+        Returns the targets left to convert and the cache keys of their outputs.
+        """
+        try:
+            digests, input_bytes = await asyncio.to_thread(OutputCache.digests, group.file_paths)
+        except OSError:
+            # the conversion reports what is wrong with the inputs
+            return targets, {}
+        keys = {
+            target.target_id: self._output_cache.key(
+                digests, cache_parts, target.output_format, target.plugin.version or "", target.options
+            )
+            for target in targets
+        }
+        remaining = []
+        for target in targets:
+            result = SingleConversionResult(group_id=group.group_id, target_id=target.target_id)
+            cached = await asyncio.to_thread(
+                self._restore_timed,
+                keys[target.target_id],
+                fs / staged_name(group.group_id, target.target_id),
+                result.timings,
+            )
+            if cached is None:
+                remaining.append(target)
+                continue
+            result.completed = True
+            result.warning_messages.extend(cached.warning_messages)
+            result.input_bytes = input_bytes
+            result.output_bytes = cached.output_bytes
+            result.part_count = cached.part_count
+            await emit(result)
+        return remaining, keys
+
+    def _restore_timed(self, key: str, dst: UPath, timings: list[StageTiming]) -> CachedOutput | None:
+        with timed(timings, "cache"):
+            return self._output_cache.restore(key, dst)
+
+    async def _store_cached(
+        self,
+        fs: UPath,
+        keys: dict[str, str],
+        writers: dict[str, EntryWriter],
+        split: bool,
+        emit: Emit[SingleConversionResult],
+        result: SingleConversionResult,
+    ) -> None:
+        """Emit a result, adding the output it reports as written to the output cache first.
+
+        Parts of a split output are copied as they are written, since the
+        client may take them out of staging before the group is done.
+        """
+        key = keys.get(result.target_id)
+        if key is not None and not result.cancelled and (not result.running or result.part_count):
+            staged_path = fs / staged_name(result.group_id, result.target_id)
+            if result.running:
+                if result.completed:
+                    if (writer := writers.get(result.target_id)) is None:
+                        writer = writers[result.target_id] = self._output_cache.writer(key)
+                    await asyncio.to_thread(
+                        self._cache_file, writer, staged_path / str(result.part_index), str(result.part_index)
+                    )
+            elif result.completed:
+                await asyncio.to_thread(
+                    self._cache_output,
+                    writers.pop(result.target_id, None) or self._output_cache.writer(key),
+                    None if split else staged_path,
+                    result.warning_messages,
+                    split,
+                )
+            elif (writer := writers.pop(result.target_id, None)) is not None:
+                await asyncio.to_thread(writer.abort)
+        await emit(result)
+
+    @staticmethod
+    def _cache_file(writer: EntryWriter, src: UPath, name: str) -> None:
+        # an output that cannot be cached is still delivered
+        with contextlib.suppress(OSError):
+            writer.add(src, name)
+
+    @staticmethod
+    def _cache_output(writer: EntryWriter, src: UPath | None, warning_messages: Sequence[str], split: bool) -> None:
+        try:
+            if src is not None:
+                writer.add_staged(src)
+            writer.commit(warning_messages, split)
+        except OSError:
+            writer.abort()
+
+    async def _publish(
+        self, flight: Flight, emit: Emit[SingleConversionResult], result: SingleConversionResult
+    ) -> None:
+        """Emit a result of a leading group, and a copy of it to each group following it.
+
+        Written outputs are staged for the followers before the leader's
+        client can take them. Cancelled outputs are left for the followers
+        to convert themselves.
+        """
+        followers = flight.publish(result)
+        if followers and not result.cancelled:
+            if result.completed and (not result.running or result.part_count):
+                followers = await asyncio.to_thread(self._share_output, result, followers)
+            for follower in followers:
+                follower.results.put_nowait(follower.relabel(result))
+        await emit(result)
+
+    def _share_output(self, result: SingleConversionResult, followers: list[Follower]) -> list[Follower]:
+        src = self._fs / staged_name(result.group_id, result.target_id)
+        if result.running:
+            src = src / str(result.part_index)
+        shared = []
+        for follower in followers:
+            dst = self._fs / staged_name(follower.group_id, follower.target_ids.get(result.target_id, ""))
+            try:
+                if result.running:
+                    dst.mkdir(parents=True, exist_ok=True)
+                    dst = dst / str(result.part_index)
+                link_staged(src, dst)
+            except OSError:
+                continue
+            shared.append(follower)
+        return shared
+
+    async def _follow(
+        self,
+        follower: Follower,
+        targets: list[_OutputTarget],
+        scope: CancelScope,
+        emit: Emit[SingleConversionResult],
+    ) -> list[_OutputTarget]:
+        """Emit the results of the flight ``follower`` waits for, returning the targets it left out."""
+        done: set[str] = set()
+        cancelled = asyncio.ensure_future(scope.wait(follower.group_id))
+        get: asyncio.Future[SingleConversionResult | None] | None = None
+        try:
+            while True:
+                get = asyncio.ensure_future(follower.results.get())
+                await asyncio.wait((get, cancelled), return_when=asyncio.FIRST_COMPLETED)
+                if not get.done():
+                    for target in targets:
+                        if target.target_id not in done:
+                            await asyncio.to_thread(
+                                remove_staged, self._fs / staged_name(follower.group_id, target.target_id)
+                            )
+                            await emit(
+                                SingleConversionResult(
+                                    group_id=follower.group_id, target_id=target.target_id, cancelled=True
+                                )
+                            )
+                    return []
+                if (result := get.result()) is None:
+                    break
+                if not result.running:
+                    done.add(result.target_id)
+                await emit(result)
+        finally:
+            cancelled.cancel()
+            if get is not None:
+                get.cancel()
+            follower.leave()
+        return [target for target in targets if target.target_id not in done]
+
+    async def _load_children(
+        self,
+        settings: LibreSvipBaseUISettings,
+        group: ConversionGroup,
+        input_plugin: SVSConverter,
+        input_option_dict: OptionsDict,
+        language: str,
+        cancel_event: CancelEvent,
+        on_loaded: Callable[[], None] | None = None,
+    ) -> list[LoadedChild]:
+        loads = [
+            asyncio.ensure_future(
+                self._engine.run(settings, load_child, input_plugin, file_path, input_option_dict, language, cancel_event)
+            )
+            for file_path in group.file_paths
+        ]
+        try:
+            for load in asyncio.as_completed(loads):
+                child = await load
+                if child.error_message:
+                    # the merge cannot succeed anymore
+                    break
+                if on_loaded is not None and not child.cancelled:
+                    on_loaded()
+        finally:
+            for load in loads:
+                load.cancel()
+        return [
+            load.result() if load.done() and not load.cancelled() else LoadedChild(cancelled=True)
+            for load in loads
+        ]
+
+    async def _split(
+        self,
+        request: ConversionRequest,
+        settings: LibreSvipBaseUISettings,
+        fs: UPath,
+        group: ConversionGroup,
+        input_plugin: SVSConverter,
+        input_option_dict: OptionsDict,
+        pipeline: MiddlewarePipeline,
+        targets: list[_OutputTarget],
+        cancel_event: CancelEvent,
+        progress: Progress | None,
+        emit: Emit[SingleConversionResult],
+    ) -> None:
+        parts, prepared = await self._engine.run(
+            settings,
+            prepare_parts,
+            request.mode,
+            request.max_track_count,
+            group,
+            input_plugin,
+            input_option_dict,
+            pipeline,
+            request.language,
+            cancel_event,
+            progress,
+            cancel_event=cancel_event,
+        )
+        if parts is None:
+            await _emit_per_target(prepared, targets, emit)
+            return
+        dumps = [
+            asyncio.ensure_future(self._dump_parts(request, settings, fs, prepared, parts, target, cancel_event, emit))
+            for target in targets
+        ]
+        try:
+            await asyncio.gather(*dumps)
+        finally:
+            for dump in dumps:
+                dump.cancel()
+
+    async def _dump_parts(
+        self,
+        request: ConversionRequest,
+        settings: LibreSvipBaseUISettings,
+        fs: UPath,
+        prepared: SingleConversionResult,
+        parts: list[Project],
+        target: _OutputTarget,
+        cancel_event: CancelEvent,
+        emit: Emit[SingleConversionResult],
+    ) -> None:
+        staged_path = fs / staged_name(prepared.group_id, target.target_id)
+        dumps = [
+            asyncio.ensure_future(
+                self._engine.run(
+                    settings,
+                    dump_part,
+                    fs,
+                    part,
+                    target.plugin,
+                    target.options,
+                    SingleConversionResult(
+                        group_id=prepared.group_id,
+                        target_id=target.target_id,
+                        running=True,
+                        part_count=len(parts),
+                        part_index=i,
+                    ),
+                    request.language,
+                    cancel_event,
+                    # parts may share objects, so threads dump copies of them
+                    not self._engine.is_process,
+                    cancel_event=cancel_event,
+                    on_cancel=partial(remove_staged, staged_path),
+                )
+            )
+            for i, part in enumerate(parts)
+        ]
+        result = SingleConversionResult(
+            group_id=prepared.group_id,
+            target_id=target.target_id,
+            part_count=len(parts),
+            warning_messages=list(prepared.warning_messages),
+            timings=list(prepared.timings),
+            input_bytes=prepared.input_bytes,
+        )
+        try:
+            for dump in asyncio.as_completed(dumps):
+                part_result = await dump
+                if part_result.cancelled:
+                    result.cancelled = True
+                    break
+                # written parts can be delivered before the group is done
+                await emit(part_result)
+                if not part_result.completed:
+                    result.error_message = part_result.error_message
+                    break
+        finally:
+            for dump in dumps:
+                dump.cancel()
+        for dump in dumps:
+            if dump.done() and not dump.cancelled() and dump.exception() is None:
+                part_result = dump.result()
+                result.warning_messages.extend(part_result.warning_messages)
+                result.timings.extend(part_result.timings)
+                result.output_bytes += part_result.output_bytes
+        if result.cancelled:
+            await asyncio.to_thread(remove_staged, staged_path)
+        result.completed = not result.cancelled and not result.error_message
+        await emit(result)
+
+    async def _fan_out(
+        self,
+        request: ConversionRequest,
+        settings: LibreSvipBaseUISettings,
+        fs: UPath,
+        group: ConversionGroup,
+        input_plugin: SVSConverter,
+        input_option_dict: OptionsDict,
+        pipeline: MiddlewarePipeline,
+        targets: list[_OutputTarget],
+        cancel_event: CancelEvent,
+        children: list[LoadedChild] | None,
+        progress: Progress | None,
+        emit: Emit[SingleConversionResult],
+    ) -> None:
+        project, prepared = await self._engine.run(
+            settings,
+            prepare_group,
+            request.mode,
+            group,
+            input_plugin,
+            input_option_dict,
+            pipeline,
+            request.language,
+            cancel_event,
+            children,
+            progress,
+            cancel_event=cancel_event,
+        )
+        if project is None:
+            await _emit_per_target(prepared, targets, emit)
+            return
+        dumps = [
+            asyncio.ensure_future(
+                self._engine.run(
+                    settings,
+                    dump_target,
+                    fs,
                     request.mode,
                     request.max_track_count,
-                    group,
-                    input_plugin,
-                    output_plugin,
-                    input_options.model_dump(),
-                    output_options.model_dump(),
-                    request.middleware_options,
+                    project,
+                    target.plugin,
+                    target.options,
+                    SingleConversionResult(
+                        group_id=group.group_id,
+                        target_id=target.target_id,
+                        warning_messages=list(prepared.warning_messages),
+                        timings=list(prepared.timings),
+                        input_bytes=prepared.input_bytes,
+                    ),
                     request.language,
+                    cancel_event,
+                    # worker processes already get a copy of their own
+                    not self._engine.is_process,
+                    cancel_event=cancel_event,
+                    on_cancel=partial(remove_staged, fs / staged_name(group.group_id, target.target_id)),
                 )
-                futures.append(asyncio.create_task(coro))
-            for future in asyncio.as_completed(futures):
-                yield (await future)
+            )
+            for target in targets
+        ]
+        try:
+            for dump in asyncio.as_completed(dumps):
+                await emit(await dump)
+        finally:
+            for dump in dumps:
+                dump.cancel()
+
+    async def get_profile(self, request: GetProfileRequest, ctx: RequestContext) -> GetProfileResponse:
+        name = profile_name(request.group_id, request.target_id)
+        self._janitor.pin(name)
+        try:
+            return await asyncio.to_thread(self._read_profile, request, self._fs / name)
+        finally:
+            self._janitor.unpin(name)
+
+    @staticmethod
+    def _read_profile(request: GetProfileRequest, profile_path: UPath) -> GetProfileResponse:
+        response = GetProfileResponse(group_id=request.group_id, target_id=request.target_id)
+        if not profile_path.is_dir():
+            return response
+        # like outputs, profiles are handed out once
+        if (pstats_path := profile_path / PSTATS_NAME).exists():
+            # missing when the profiler could not be enabled, the report says why
+            response.pstats = pstats_path.read_bytes()
+        response.report = (profile_path / REPORT_NAME).read_text()
+        response.allocations = (profile_path / ALLOCATIONS_NAME).read_text()
+        response.found = True
+        remove_staged(profile_path)
+        return response
+
+    def metrics_snapshot(self) -> dict[str, Any]:
+        snapshot = self.metrics.snapshot()
+        # kept per process, worker processes of a process pool are not included
+        snapshot["project_cache"] = dataclasses.asdict(project_cache.stats)
+        snapshot["staging"] = {
+            "memory_bytes": getattr(self._fs.fs, "memory_bytes", 0),
+            "evicted_entries": self._janitor.evicted_entries,
+            "evicted_bytes": self._janitor.evicted_bytes,
+        }
+        snapshot["output_cache"] = dataclasses.asdict(self._output_cache.stats)
+        snapshot["single_flight"] = {
+            "in_flight": len(self._flights),
+            "coalesced_groups": self.coalesced_groups,
+        }
+        return snapshot
+
+    async def cancel_conversion(
+        self, request: CancelConversionRequest, ctx: RequestContext
+    ) -> CancelConversionResponse:
+        if scope := self._cancel_scopes.get(request.conversion_id):
+            return CancelConversionResponse(group_ids=scope.cancel(request.group_ids))
+        return CancelConversionResponse()
 
     async def move_file(self, request: MoveFileRequest, ctx: RequestContext) -> AsyncIterator[MoveFileResponse]:
         async with LibreSVIPSettingsContainer.state.override_context(_DEFAULT_SETTINGS):
             output_dir = pathlib.Path(request.output_dir).absolute()
-            output_dir.mkdir(parents=True, exist_ok=True)
-            if (tmp_path := self._fs / request.group_id).exists():
-                result = MoveFileResponse(group_id=request.group_id, completed=True, error_message="")
+            await asyncio.to_thread(output_dir.mkdir, parents=True, exist_ok=True)
+            yield await self._move_group(
+                output_dir,
+                request.group_id,
+                request.target_id,
+                request.stem,
+                request.output_format,
+                request.conflict_policy,
+                request.force_overwrite,
+                request.parts,
+            )
+
+    async def move_files(self, request: MoveFilesRequest, ctx: RequestContext) -> AsyncIterator[MoveFileResponse]:
+        async with LibreSVIPSettingsContainer.state.override_context(_DEFAULT_SETTINGS):
+            output_dir = pathlib.Path(request.output_dir).absolute()
+            await asyncio.to_thread(output_dir.mkdir, parents=True, exist_ok=True)
+            # entries that may land on the same output path are moved in order
+            lanes: dict[tuple[str, str], list[MoveFilesEntry]] = {}
+            for entry in request.entries:
+                lanes.setdefault((entry.stem, entry.output_format), []).append(entry)
+            queue: asyncio.Queue[MoveFileResponse | None] = asyncio.Queue()
+            slots = asyncio.Semaphore(_MOVE_FILES_CONCURRENCY)
+
+            async def move_lane(entries: list[MoveFilesEntry]) -> None:
+                for entry in entries:
+                    async with slots:
+                        result = await self._move_group(
+                            output_dir,
+                            entry.group_id,
+                            entry.target_id,
+                            entry.stem,
+                            entry.output_format,
+                            request.conflict_policy,
+                            request.force_overwrite,
+                            entry.parts,
+                        )
+                    await queue.put(result)
+
+            async def move_all() -> None:
                 try:
-                    if tmp_path.is_dir():
-                        for i, child in enumerate(tmp_path.iterdir()):
+                    await asyncio.gather(*(move_lane(entries) for entries in lanes.values()))
+                finally:
+                    queue.put_nowait(None)
+
+            mover = asyncio.create_task(move_all())
+            try:
+                while (result := await queue.get()) is not None:
+                    yield result
+                await mover
+            finally:
+                mover.cancel()
+
+    async def _move_group(
+        self,
+        output_dir: pathlib.Path,
+        group_id: str,
+        target_id: str,
+        stem: str,
+        output_format: str,
+        conflict_policy: ConflictPolicy,
+        force_overwrite: bool,
+        parts: Sequence[int] = (),
+    ) -> MoveFileResponse:
+        name = staged_name(group_id, target_id)
+        self._janitor.pin(name)
+        try:
+            if await asyncio.to_thread((tmp_path := self._fs / name).exists):
+                result = MoveFileResponse(group_id=group_id, target_id=target_id, completed=True, error_message="")
+                try:
+                    if await asyncio.to_thread(tmp_path.is_dir):
+                        children = await asyncio.to_thread(list, tmp_path.iterdir())
+                        if parts:
+                            part_names = {str(part) for part in parts}
+                            children = [child for child in children if child.name in part_names]
+                        for i, child in enumerate(children):
                             output_path = (
-                                output_dir / f"{request.stem}_{child.name}.{request.output_format}"
+                                output_dir / f"{stem}_{child.name}.{output_format}"
                             )
-                            if output_path.exists():
-                                if request.force_overwrite or (
-                                    request.conflict_policy == ConflictPolicy.OVERWRITE
+                            if await asyncio.to_thread(output_path.exists):
+                                if force_overwrite or (
+                                    conflict_policy == ConflictPolicy.OVERWRITE
                                 ):
-                                    output_path.write_bytes(child.read_bytes())
-                                elif request.conflict_policy == ConflictPolicy.RENAME:
+                                    await asyncio.to_thread(_deliver_timed, result.timings, child, output_path)
+                                elif conflict_policy == ConflictPolicy.RENAME:
                                     output_path = (
                                         output_dir
-                                        / f"{request.stem}_{child.name}_{i}.{request.output_format}"
+                                        / f"{stem}_{child.name}_{i}.{output_format}"
                                     )
-                                    output_path.write_bytes(child.read_bytes())
-                                elif request.conflict_policy == ConflictPolicy.PROMPT:
-                                    yield MoveFileResponse(
-                                        group_id=request.group_id,
+                                    await asyncio.to_thread(_deliver_timed, result.timings, child, output_path)
+                                elif conflict_policy == ConflictPolicy.PROMPT:
+                                    return MoveFileResponse(
+                                        group_id=group_id,
+                                        target_id=target_id,
                                         completed=False,
                                         output_path=str(output_path),
-                                        conflict_policy=request.conflict_policy,
+                                        conflict_policy=conflict_policy,
                                     )
-                                    return
                                 else:
-                                    yield MoveFileResponse(
-                                        group_id=request.group_id,
+                                    return MoveFileResponse(
+                                        group_id=group_id,
+                                        target_id=target_id,
                                         completed=False,
                                         output_path=str(output_path),
-                                        conflict_policy=request.conflict_policy,
+                                        conflict_policy=conflict_policy,
                                     )
-                                    return
                             else:
-                                output_path.write_bytes(child.read_bytes())
+                                await asyncio.to_thread(_deliver_timed, result.timings, child, output_path)
                             result.output_path = str(output_path)
-                            child.unlink()
-                        tmp_path.rmdir()
+                        # keep the directory while the conversion may still write parts to it
+                        if not parts or (
+                            self._janitor.pins(name) == 1 and not await asyncio.to_thread(any, tmp_path.iterdir())
+                        ):
+                            await asyncio.to_thread(tmp_path.rmdir)
                     else:
                         output_path = (
-                            output_dir / f"{request.stem}.{request.output_format}"
+                            output_dir / f"{stem}.{output_format}"
                         )
-                        if output_path.exists():
-                            if request.force_overwrite or (
-                                request.conflict_policy == ConflictPolicy.OVERWRITE
+                        if await asyncio.to_thread(output_path.exists):
+                            if force_overwrite or (
+                                conflict_policy == ConflictPolicy.OVERWRITE
                             ):
-                                output_path.write_bytes(tmp_path.read_bytes())
-                            elif request.conflict_policy == ConflictPolicy.RENAME:
+                                await asyncio.to_thread(_deliver_timed, result.timings, tmp_path, output_path)
+                            elif conflict_policy == ConflictPolicy.RENAME:
                                 output_path = (
                                     output_dir
-                                    / f"{request.stem}_1.{request.output_format}"
+                                    / f"{stem}_1.{output_format}"
                                 )
-                                output_path.write_bytes(tmp_path.read_bytes())
-                            elif request.conflict_policy == ConflictPolicy.PROMPT:
-                                yield MoveFileResponse(
-                                    group_id=request.group_id,
+                                await asyncio.to_thread(_deliver_timed, result.timings, tmp_path, output_path)
+                            elif conflict_policy == ConflictPolicy.PROMPT:
+                                return MoveFileResponse(
+                                    group_id=group_id,
+                                    target_id=target_id,
                                     completed=False,
                                     output_path=str(output_path),
-                                    conflict_policy=request.conflict_policy,
+                                    conflict_policy=conflict_policy,
                                 )
-                                return
                             else:
-                                yield MoveFileResponse(
-                                    group_id=request.group_id,
+                                return MoveFileResponse(
+                                    group_id=group_id,
+                                    target_id=target_id,
                                     completed=False,
                                     output_path=str(output_path),
-                                    conflict_policy=request.conflict_policy,
+                                    conflict_policy=conflict_policy,
                                 )
-                                return
                         else:
-                            output_path.write_bytes(tmp_path.read_bytes())
-                        tmp_path.unlink()
+                            await asyncio.to_thread(_deliver_timed, result.timings, tmp_path, output_path)
                         result.output_path = str(output_path)
                     result.success = True
                 except Exception:
                     result.success = False
                     result.error_message = traceback.format_exc()
-                yield result
+                self.metrics.record_move(output_format, result)
+                return result
+        finally:
+            self._janitor.unpin(name)
+        # never converted here, or evicted by the janitor after staging_ttl
+        result = MoveFileResponse(
+            group_id=group_id,
+            target_id=target_id,
+            completed=True,
+            success=False,
+            error_message="staged output expired",
+        )
+        self.metrics.record_move(output_format, result)
+        return result
 
 
 app = Starlette()
@@ -453,5 +1204,13 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-conversion_app = ConversionASGIApplication(ConversionService())
+conversion_service = ConversionService()
+conversion_app = ConversionASGIApplication(conversion_service)
+
+
+async def metrics(request: Request) -> JSONResponse:
+    return JSONResponse(conversion_service.metrics_snapshot())
+
+
+app.add_route("/metrics", metrics, methods=["GET"])
 app.mount("/", conversion_app)
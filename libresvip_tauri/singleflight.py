@@ -0,0 +1,115 @@
+import asyncio
+import contextlib
+import dataclasses
+import hashlib
+import os
+from collections.abc import Iterator, Sequence
+
+from libresvip.core.compat import json
+
+from .libresvip_tauri_pb import SingleConversionResult
+
+
+def file_identity(file_path: str) -> list[str | int]:
+    """What a fingerprint knows of an input file: where it is and which version of it."""
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    return [path, stat.st_size, stat.st_mtime_ns]
+
+
+def fingerprint(*parts: object) -> str:
+    """Canonical digest of the ``parts`` of a piece of work, options compared by value."""
+    return hashlib.sha256(
+        json.dumps(parts, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+@dataclasses.dataclass(eq=False)
+class Follower:
+    """A group of another stream waiting for the results of a ``Flight``."""
+
+    flight: "Flight"
+    group_id: str
+    # target ids of the leader mapped to those of this group
+    target_ids: dict[str, str]
+    results: asyncio.Queue[SingleConversionResult | None] = dataclasses.field(default_factory=asyncio.Queue)
+
+    def relabel(self, result: SingleConversionResult) -> SingleConversionResult:
+        """A copy of a result of the leader, as if this group had produced it."""
+        relabelled = SingleConversionResult.from_binary(result.to_binary())
+        relabelled.group_id = self.group_id
+        relabelled.target_id = self.target_ids.get(result.target_id, result.target_id)
+        return relabelled
+
+    def leave(self) -> None:
+        self.flight.unfollow(self)
+
+
+class Flight:
+    """Conversion of one group that identical groups of other streams wait for.
+
+    Followers can only join until the first output of the leader is
+    done: the leader's client may take it out of staging any time after.
+    """
+
+    def __init__(self, group_id: str, target_ids: Sequence[str]) -> None:
+        self.group_id = group_id
+        self.target_ids = list(target_ids)
+        self.followers: list[Follower] = []
+        self.joinable = True
+
+    def follow(self, group_id: str, target_ids: Sequence[str]) -> Follower:
+        follower = Follower(self, group_id, dict(zip(self.target_ids, target_ids)))
+        self.followers.append(follower)
+        return follower
+
+    def unfollow(self, follower: Follower) -> None:
+        if follower in self.followers:
+            self.followers.remove(follower)
+
+    def publish(self, result: SingleConversionResult) -> list[Follower]:
+        """The followers to hand ``result`` of the leader to.
+
+        Joining ends with the first output done, a part of a split output
+        included: a follower joining later would miss it.
+        """
+        if not result.running or result.cancelled or result.part_count:
+            self.joinable = False
+        return list(self.followers)
+
+    def finish(self) -> None:
+        self.joinable = False
+        for follower in self.followers:
+            follower.results.put_nowait(None)
+        self.followers.clear()
+
+
+class SingleFlight:
+    """Flights in progress, by the fingerprint of the work they do."""
+
+    def __init__(self) -> None:
+        self._flights: dict[str, Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def follow(self, key: str, group_id: str, target_ids: Sequence[str]) -> Follower | None:
+        """Wait for the flight doing ``key``, if one can still be joined."""
+        if (flight := self._flights.get(key)) is not None and flight.joinable:
+            return flight.follow(group_id, target_ids)
+        return None
+
+    @contextlib.contextmanager
+    def lead(self, key: str, group_id: str, target_ids: Sequence[str]) -> Iterator[Flight]:
+        """Do ``key`` for every group that follows until the block exits.
+
+        Followers get the end of their queue when it does, whether or not
+        the leader delivered every output to them.
+        """
+        flight = self._flights[key] = Flight(group_id, target_ids)
+        try:
+            yield flight
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.finish()
@@ -0,0 +1,464 @@
+import atexit
+import collections
+import contextlib
+import dataclasses
+import errno
+import itertools
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+import fsspec
+from fsspec.implementations.memory import MemoryFile, MemoryFileSystem
+from upath import UPath
+from upath.implementations.memory import MemoryPath
+from upath.registry import register_implementation
+
+from .config import ServerConfig
+from .libresvip_tauri_pb import ConflictPolicy
+
+
+@dataclasses.dataclass
+class SpilledFile:
+    """Store entry for an output that was moved out of memory."""
+
+    local_path: pathlib.Path
+    size: int
+    created: datetime
+    modified: datetime
+
+
+@dataclasses.dataclass
+class _StagingState:
+    store: dict[str, Any] = dataclasses.field(default_factory=dict)
+    pseudo_dirs: list[str] = dataclasses.field(default_factory=lambda: [""])
+    memory_bytes: int = 0
+    lock: threading.Lock = dataclasses.field(default_factory=threading.Lock)
+
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+# outputs written to an output directory are staged in a directory named so
+DIRECT_STAGING_PREFIX = ".libresvip-"
+
+# fsspec caches filesystem instances per thread, so instances staging into
+# the same directory share their state through this mapping
+_states: dict[str, _StagingState] = {}
+
+
+class StagingFile(MemoryFile):
+    def __init__(self, fs: "StagingFileSystem", path: str, data: bytes | None = None) -> None:
+        super().__init__(fs, path, data)
+        self.accounted = 0
+        self.settled = False
+        # store entries sharing this buffer, see ``StagingFileSystem.link``
+        self.links = 1
+
+    def close(self) -> None:
+        if not self.settled:
+            self.settled = True
+            self.fs.settle(self)
+
+
+class StagingFileSystem(MemoryFileSystem):
+    """Memory filesystem that moves large outputs to a directory on disk.
+
+    An output stays in memory when it is at most ``spill_threshold`` bytes
+    and fits in what is left of ``memory_budget``; otherwise it is written
+    to ``spill_dir`` once the plugin closes it.
+    """
+
+    protocol = "staging"
+
+    def __init__(
+        self,
+        *args: Any,
+        spill_dir: str,
+        spill_threshold: int,
+        memory_budget: int,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.spill_dir = pathlib.Path(spill_dir)
+        self.spill_threshold = spill_threshold
+        self.memory_budget = memory_budget
+        self.state = _states.setdefault(spill_dir, _StagingState())
+        self.store = self.state.store
+        self.pseudo_dirs = self.state.pseudo_dirs
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.state.memory_bytes
+
+    @classmethod
+    def _strip_protocol(cls, path: Any) -> str:
+        if isinstance(path, str):
+            path = path.removeprefix("staging://")
+        return super()._strip_protocol(path)
+
+    def settle(self, file: StagingFile) -> None:
+        size = file.size
+        with self.state.lock:
+            if size <= self.spill_threshold and self.state.memory_bytes + size <= self.memory_budget:
+                self.state.memory_bytes += size
+                file.accounted = size
+                return
+        local_path = self.spill_dir / uuid.uuid4().hex
+        local_path.write_bytes(file.getbuffer())
+        if self.store.get(file.path) is file:
+            self.store[file.path] = SpilledFile(
+                local_path,
+                size,
+                file.created,
+                datetime.now(tz=timezone.utc),
+            )
+        else:
+            local_path.unlink()
+        file.seek(0)
+        file.truncate()
+
+    def pipe_file(self, path: str, value: bytes, mode: str = "overwrite", **kwargs: Any) -> None:
+        with self.open(path, "xb" if mode == "create" else "wb", data=value):
+            pass
+
+    def local_path(self, path: str) -> pathlib.Path | None:
+        entry = self.store.get(self._strip_protocol(path))
+        return entry.local_path if isinstance(entry, SpilledFile) else None
+
+    def _open(
+        self,
+        path: str,
+        mode: str = "rb",
+        block_size: int | None = None,
+        autocommit: bool = True,
+        cache_options: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        path = self._strip_protocol(path)
+        entry = self.store.get(path)
+        if isinstance(entry, SpilledFile) and mode in {"rb", "ab", "r+b", "a+b"}:
+            return entry.local_path.open(mode)
+        if mode in {"wb", "w+b", "xb", "x+b"}:
+            if "x" in mode and self.exists(path):
+                raise FileExistsError(path)
+            if path in self.pseudo_dirs:
+                raise IsADirectoryError(path)
+            if entry is not None:
+                self._rm(path)
+            file = StagingFile(self, path, kwargs.get("data"))
+            if not self._intrans:
+                file.commit()
+            return file
+        return super()._open(
+            path,
+            mode=mode,
+            block_size=block_size,
+            autocommit=autocommit,
+            cache_options=cache_options,
+            **kwargs,
+        )
+
+    def cat_file(self, path: str, start: int | None = None, end: int | None = None, **kwargs: Any) -> bytes:
+        entry = self.store.get(self._strip_protocol(path))
+        if isinstance(entry, SpilledFile):
+            with entry.local_path.open("rb") as f:
+                f.seek(start or 0)
+                return f.read() if end is None else f.read(end - (start or 0))
+        return super().cat_file(path, start, end, **kwargs)
+
+    def cp_file(self, path1: str, path2: str, **kwargs: Any) -> None:
+        if local_path := self.local_path(path1):
+            with self.open(path2, "wb") as f:
+                with local_path.open("rb") as src:
+                    shutil.copyfileobj(src, f)
+        else:
+            super().cp_file(path1, path2, **kwargs)
+
+    def link(self, path1: str, path2: str) -> None:
+        """Stage the written output ``path1`` again as ``path2`` without copying it.
+
+        Outputs in memory share their buffer, which is only released with
+        the last entry using it; outputs on disk get another hard link.
+        """
+        path1 = self._strip_protocol(path1)
+        path2 = self._strip_protocol(path2)
+        entry = self.store[path1]
+        if isinstance(entry, SpilledFile):
+            local_path = self.spill_dir / uuid.uuid4().hex
+            os.link(entry.local_path, local_path)
+            self.store[path2] = dataclasses.replace(entry, local_path=local_path)
+            return
+        with self.state.lock:
+            entry.links += 1
+        self.store[path2] = entry
+
+    def _rm(self, path: str) -> None:
+        path = self._strip_protocol(path)
+        entry = self.store.get(path)
+        super()._rm(path)
+        if isinstance(entry, SpilledFile):
+            entry.local_path.unlink(missing_ok=True)
+        elif isinstance(entry, StagingFile):
+            with self.state.lock:
+                entry.links -= 1
+                if entry.links == 0:
+                    self.state.memory_bytes -= entry.accounted
+
+
+class StagingPath(MemoryPath):
+    __slots__ = ()
+
+    def __str__(self) -> str:
+        s = UPath.__str__(self)
+        if s.startswith("staging:///"):
+            s = s.replace("staging:///", "staging://", 1)
+        return s
+
+
+fsspec.register_implementation(StagingFileSystem.protocol, StagingFileSystem, clobber=True)
+register_implementation(StagingFileSystem.protocol, StagingPath, clobber=True)
+
+
+def staged_name(group_id: str, target_id: str = "") -> str:
+    """Name of the staging entry holding a group's output for one target."""
+    return f"{group_id}.{target_id}" if target_id else group_id
+
+
+def profile_name(group_id: str, target_id: str = "") -> str:
+    """Name of the staging entry holding the profile of a group's conversion for one target."""
+    return f"{staged_name(group_id, target_id)}@profile"
+
+
+def remove_staged(path: UPath) -> None:
+    if path.is_dir():
+        for child in path.iterdir():
+            child.unlink()
+        path.rmdir()
+    elif path.exists():
+        path.unlink()
+
+
+def link_staged(src: UPath, dst: UPath) -> None:
+    """Stage the output ``src`` again as ``dst``, sharing its contents.
+
+    Parts of a split output already staged as ``dst`` are kept.
+    """
+    if src.is_dir():
+        dst.mkdir(parents=True, exist_ok=True)
+        for child in src.iterdir():
+            if not (dst / child.name).exists():
+                link_staged(child, dst / child.name)
+    elif isinstance(src.fs, StagingFileSystem):
+        src.fs.link(src.path, dst.path)
+    else:
+        os.link(src.path, dst.path)
+
+
+class StagingJanitor:
+    """Evicts staged outputs that were never collected by ``MoveFile``.
+
+    Outputs are only read once before being removed, so the time an entry
+    was first seen doubles as its last use: entries older than ``ttl``
+    seconds are evicted, and while the staging area holds more than
+    ``max_bytes`` the oldest ones go first. Pinned entries are being
+    written or delivered and are left alone; held entries were reported as
+    converted and only expire with ``ttl``, outside of ``max_bytes``.
+    """
+
+    def __init__(self, root: UPath, ttl: float, max_bytes: int, interval: float = 60) -> None:
+        self.root = root
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.evicted_entries = 0
+        self.evicted_bytes = 0
+        self._seen: dict[str, float] = {}
+        self._pinned: collections.Counter[str] = collections.Counter()
+        self._held: set[str] = set()
+        # pins change on the event loop while the janitor thread sweeps
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def pin(self, name: str) -> None:
+        with self._lock:
+            self._pinned[name] += 1
+
+    def unpin(self, name: str) -> None:
+        with self._lock:
+            self._pinned[name] -= 1
+            if self._pinned[name] <= 0:
+                del self._pinned[name]
+            self._seen[name] = time.monotonic()
+
+    def hold(self, name: str) -> None:
+        """Keep ``name`` from the size limit until it is gone, as its client was told it converted."""
+        with self._lock:
+            self._held.add(name)
+
+    def pins(self, name: str) -> int:
+        with self._lock:
+            return self._pinned[name]
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, name="libresvip-staging-janitor", daemon=True).start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception:
+                # the next sweep may well succeed, a dead janitor never would
+                print("[LibreSVIP] Sweeping staged outputs failed:", file=sys.stderr)
+                traceback.print_exc()
+
+    def sweep(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            pinned = set(self._pinned)
+            held = set(self._held)
+            seen = dict(self._seen)
+        entries: list[tuple[float, str, UPath, int]] = []
+        for entry in self.root.iterdir():
+            if entry.name in pinned:
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                size = entry.fs.du(entry.path)
+                entries.append((seen.setdefault(entry.name, now), entry.name, entry, size))
+        names = {name for _, name, _, _ in entries} | pinned
+        with self._lock:
+            for name, first_seen in seen.items():
+                if name in names:
+                    self._seen.setdefault(name, first_seen)
+                elif self._seen.get(name) == first_seen:
+                    # gone from staging, unless unpinned again meanwhile
+                    del self._seen[name]
+            self._held -= held - names
+        total = sum(size for _, name, _, size in entries if name not in held)
+        for first_seen, name, entry, size in sorted(entries, key=lambda item: item[0]):
+            if now - first_seen < self.ttl and (name in held or total <= self.max_bytes):
+                continue
+            with self._lock:
+                if name in self._pinned:
+                    continue
+                with contextlib.suppress(FileNotFoundError):
+                    remove_staged(entry)
+                    self.evicted_entries += 1
+                    self.evicted_bytes += size
+                self._seen.pop(name, None)
+                self._held.discard(name)
+            if name not in held:
+                total -= size
+
+
+def _local_path(path: UPath) -> pathlib.Path | None:
+    if isinstance(path.fs, StagingFileSystem):
+        return path.fs.local_path(path.path)
+    if path.protocol in ("", "file", "local"):
+        return pathlib.Path(path.path)
+    return None
+
+
+def deliver(src: UPath, dst: pathlib.Path) -> None:
+    """Move a staged output to ``dst`` and remove it from the staging area.
+
+    Outputs on disk are renamed into place, or copied by the kernel when
+    ``dst`` is on another filesystem; outputs in memory are written from
+    their buffer without another copy.
+    """
+    if (local_path := _local_path(src)) is not None:
+        try:
+            os.replace(local_path, dst)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            tmp_path = dst.with_name(f".{dst.name}.{uuid.uuid4().hex}.tmp")
+            try:
+                # copyfile uses sendfile/copy_file_range where available
+                shutil.copyfile(local_path, tmp_path)
+                os.replace(tmp_path, dst)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            src.unlink()
+        return
+    with src.open("rb") as fsrc, dst.open("wb") as fdst:
+        if isinstance(fsrc, MemoryFile):
+            with fsrc.getbuffer() as view:
+                fdst.write(view)
+        else:
+            shutil.copyfileobj(fsrc, fdst, _COPY_CHUNK_SIZE)
+    src.unlink()
+
+
+def _link_new(src: pathlib.Path, dst: pathlib.Path) -> bool:
+    """Rename ``src`` to ``dst`` unless ``dst`` exists."""
+    try:
+        # unlike a rename, a link never replaces a file created meanwhile
+        os.link(src, dst)
+    except FileExistsError:
+        return False
+    except OSError:
+        # filesystems without hard links
+        if dst.exists():
+            return False
+        os.replace(src, dst)
+        return True
+    src.unlink()
+    return True
+
+
+def place_output(src: pathlib.Path, dst: pathlib.Path, conflict_policy: ConflictPolicy) -> pathlib.Path | None:
+    """Rename a written output to ``dst``, resolving a conflict with an existing file.
+
+    Returns where the output went, or ``None`` when the existing file was kept.
+    """
+    if conflict_policy == ConflictPolicy.OVERWRITE:
+        os.replace(src, dst)
+        return dst
+    if _link_new(src, dst):
+        return dst
+    if conflict_policy == ConflictPolicy.RENAME:
+        for i in itertools.count(1):
+            if _link_new(src, renamed := dst.with_name(f"{dst.stem}_{i}{dst.suffix}")):
+                return renamed
+    src.unlink()
+    return None
+
+
+def part_destination(destination: pathlib.Path, part_name: str) -> pathlib.Path:
+    return destination.with_name(f"{destination.stem}_{part_name}{destination.suffix}")
+
+
+def create_direct_staging(output_dir: pathlib.Path) -> str:
+    """Temporary directory in ``output_dir`` that outputs are written to before being renamed into place."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return tempfile.mkdtemp(prefix=DIRECT_STAGING_PREFIX, dir=output_dir)
+
+
+def create_staging_root(config: ServerConfig, shared_with_workers: bool) -> UPath:
+    """Create the staging area for converted outputs.
+
+    Worker processes cannot see this process's memory, so when they write
+    the outputs everything is staged on disk.
+    """
+    spill_dir = tempfile.mkdtemp(prefix="libresvip-tauri-")
+    atexit.register(shutil.rmtree, spill_dir, ignore_errors=True)
+    if shared_with_workers:
+        return UPath(spill_dir)
+    return UPath(
+        "staging:///",
+        spill_dir=spill_dir,
+        spill_threshold=config.spill_threshold,
+        memory_budget=config.memory_budget,
+    )
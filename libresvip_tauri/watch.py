@@ -0,0 +1,475 @@
+"""Keeps the converted copy of a directory tree up to date.
+
+Converts the tree like ``libresvip_tauri.batch``, then watches it and
+converts the files saved since, overwriting their previous outputs by
+default::
+
+    python -m libresvip_tauri.watch projects exports --to svp
+    python -m libresvip_tauri.watch projects exports --to mid --once
+
+Changes are picked up with inotify on Linux and by polling the tree
+elsewhere. Bursts of changes are converted together once the tree has
+been quiet for ``--debounce-ms``. The content hash of every converted
+file is kept in a state file, so only files whose contents changed are
+converted again, in this run or the next.
+"""
+
+import argparse
+import asyncio
+import ctypes
+import ctypes.util
+import dataclasses
+import errno
+import importlib.metadata
+import os
+import pathlib
+import struct
+import sys
+from collections.abc import Callable, Iterable, Mapping
+
+os.environ.setdefault("LIBRESVIP_SETTINGS_BACKEND", "remote")
+
+from libresvip.core.compat import json
+from libresvip.core.config import LibreSVIPSettingsContainer
+
+from .batch import (
+    BatchConverter,
+    BatchResult,
+    BatchSummary,
+    add_arguments,
+    build_converter,
+    convert_tree,
+    create_engine,
+    find_inputs,
+    input_formats,
+    plan_jobs,
+    suffix_format,
+)
+from .project_cache import file_digest
+from .singleflight import fingerprint
+from .staging import DIRECT_STAGING_PREFIX
+
+_STATE_VERSION = 1
+_STATE_NAME = f"{DIRECT_STAGING_PREFIX}watch.json"
+
+# see inotify(7)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_ONLYDIR
+_EVENT = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+@dataclasses.dataclass
+class FileState:
+    size: int
+    mtime_ns: int
+    digest: str
+    # a file that failed is only tried again once its contents change
+    completed: bool
+
+
+class WatchState:
+    """Content hashes of the files converted so far, by their path relative to the source.
+
+    The state is only kept while ``key``, the fingerprint of the output
+    format, options and middlewares, stays the same; otherwise every
+    file is converted again.
+    """
+
+    def __init__(self, path: pathlib.Path, key: str) -> None:
+        self.path = path
+        self.key = key
+        self.files: dict[str, FileState] = {}
+        self.dirty = False
+        try:
+            state = json.loads(path.read_bytes())
+            if state["version"] == _STATE_VERSION and state["key"] == key:
+                self.files = {name: FileState(*entry) for name, entry in state["files"].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def update(self, name: str, file_state: FileState) -> None:
+        if self.files.get(name) != file_state:
+            self.files[name] = file_state
+            self.dirty = True
+
+    def forget(self, name: str) -> None:
+        """Drop the file ``name`` and every file under it."""
+        prefix = f"{name}/"
+        for removed in [key for key in self.files if key == name or key.startswith(prefix)]:
+            del self.files[removed]
+            self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        state = {
+            "version": _STATE_VERSION,
+            "key": self.key,
+            "files": {name: dataclasses.astuple(file_state) for name, file_state in self.files.items()},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        tmp_path.write_text(json.dumps(state))
+        # a run stopped while saving finds the previous state
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def _excluded(path: pathlib.Path, exclude: pathlib.Path | None) -> bool:
+    return path.name.startswith(DIRECT_STAGING_PREFIX) or (
+        exclude is not None and (path == exclude or exclude in path.parents)
+    )
+
+
+class InotifyWatcher:
+    """Reports paths changed under ``root`` with Linux inotify.
+
+    Every directory has a watch of its own. Directories created or moved
+    into the tree are watched as they appear and reported whole, as files
+    may have been written to them before their watch was added.
+    """
+
+    def __init__(
+        self, root: pathlib.Path, exclude: pathlib.Path | None, notify: Callable[[pathlib.Path], None]
+    ) -> None:
+        self.root = root
+        self.exclude = exclude
+        self._notify = notify
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths: dict[int, pathlib.Path] = {}
+        self._watches: dict[pathlib.Path, int] = {}
+        try:
+            self._add_tree(root)
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def _add_tree(self, path: pathlib.Path) -> None:
+        for dir_path, dir_names, _ in os.walk(path):
+            parent = pathlib.Path(dir_path)
+            dir_names[:] = [name for name in dir_names if not _excluded(parent / name, self.exclude)]
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(parent), _WATCH_MASK)
+            if wd < 0:
+                if (error := ctypes.get_errno()) in (errno.ENOENT, errno.ENOTDIR):
+                    # removed while being walked
+                    continue
+                raise OSError(error, os.strerror(error), str(parent))
+            self._paths[wd] = parent
+            self._watches[parent] = wd
+
+    def _remove_tree(self, path: pathlib.Path) -> None:
+        # watches of a directory moved away would report its old paths
+        for watched in [watched for watched in self._watches if watched == path or path in watched.parents]:
+            wd = self._watches.pop(watched)
+            del self._paths[wd]
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def start(self) -> None:
+        asyncio.get_running_loop().add_reader(self._fd, self._read)
+
+    def close(self) -> None:
+        asyncio.get_running_loop().remove_reader(self._fd)
+        os.close(self._fd)
+
+    def _read(self) -> None:
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                self._handle(wd, mask, name)
+
+    def _handle(self, wd: int, mask: int, name: str) -> None:
+        if mask & _IN_Q_OVERFLOW:
+            # events were dropped, anything may have changed
+            self._notify(self.root)
+            return
+        if mask & _IN_IGNORED:
+            if (path := self._paths.pop(wd, None)) is not None and self._watches.get(path) == wd:
+                del self._watches[path]
+            return
+        if (parent := self._paths.get(wd)) is None or not name:
+            return
+        path = parent / name
+        if _excluded(path, self.exclude):
+            return
+        if mask & _IN_ISDIR:
+            if mask & (_IN_MOVED_FROM | _IN_DELETE):
+                self._remove_tree(path)
+            elif mask & (_IN_CREATE | _IN_MOVED_TO):
+                try:
+                    self._add_tree(path)
+                except OSError as e:
+                    print(f"not watching {path}: {e}", file=sys.stderr)
+        self._notify(path)
+
+
+class PollingWatcher:
+    """Reports input files under ``root`` whose size or modification time changed every ``interval`` seconds."""
+
+    def __init__(
+        self,
+        root: pathlib.Path,
+        exclude: pathlib.Path | None,
+        formats: Mapping[str, str],
+        interval: float,
+        notify: Callable[[pathlib.Path], None],
+    ) -> None:
+        self.root = root
+        self.exclude = exclude
+        self.formats = formats
+        self.interval = interval
+        self._notify = notify
+        # taken before the tree is first synced, so nothing changed in between is missed
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[pathlib.Path, tuple[int, int]]:
+        snapshot = {}
+        for path, _ in find_inputs(self.root, self.formats, self.exclude):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            snapshot = await asyncio.to_thread(self._scan)
+            for path in snapshot.keys() | self._snapshot.keys():
+                if snapshot.get(path) != self._snapshot.get(path):
+                    self._notify(path)
+            self._snapshot = snapshot
+
+
+class FolderWatcher:
+    """Converts the input files under ``source`` whose contents changed since they were last converted."""
+
+    def __init__(
+        self,
+        converter: BatchConverter,
+        source: pathlib.Path,
+        formats: Mapping[str, str],
+        output_format: str,
+        state: WatchState,
+        debounce: float,
+        max_delay: float,
+        quiet: bool = False,
+    ) -> None:
+        self.converter = converter
+        self.source = source
+        self.formats = formats
+        self.output_format = output_format
+        self.state = state
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.quiet = quiet
+        self.exclude = converter.output_dir
+        self._pending: set[pathlib.Path] = set()
+        self._changed = asyncio.Event()
+
+    def notify(self, path: pathlib.Path) -> None:
+        self._pending.add(path)
+        self._changed.set()
+
+    async def changes(self) -> set[pathlib.Path]:
+        """Paths changed since the last call, once none changed for ``debounce`` seconds.
+
+        Paths that keep changing are returned after ``max_delay`` seconds
+        at the latest.
+        """
+        await self._changed.wait()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        while (remaining := deadline - loop.time()) > 0:
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), min(self.debounce, remaining))
+            except asyncio.TimeoutError:
+                break
+        self._changed.clear()
+        pending, self._pending = self._pending, set()
+        return pending
+
+    def _name(self, path: pathlib.Path) -> str:
+        return path.relative_to(self.source).as_posix()
+
+    def _changed_files(
+        self, paths: Iterable[pathlib.Path]
+    ) -> tuple[dict[pathlib.Path, FileState], set[str]]:
+        # runs in a thread, only reads the state
+        files: set[pathlib.Path] = set()
+        removed: set[str] = set()
+        for path in paths:
+            if path.is_dir():
+                found = {found for found, _ in find_inputs(path, self.formats, self.exclude)}
+                files |= found
+                names = {self._name(found) for found in found}
+                prefix = "" if path == self.source else f"{self._name(path)}/"
+                removed.update(name for name in self.state.files if name.startswith(prefix) and name not in names)
+            elif path.is_file() and suffix_format(path, self.formats) is not None:
+                files.add(path)
+            else:
+                removed.add(self._name(path))
+        changed = {}
+        for path in files:
+            try:
+                stat = path.stat()
+                previous = self.state.files.get(self._name(path))
+                if previous is not None and (previous.size, previous.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                    continue
+                changed[path] = FileState(stat.st_size, stat.st_mtime_ns, file_digest(path), False)
+            except OSError:
+                removed.add(self._name(path))
+        return changed, removed
+
+    async def sync(self, paths: Iterable[pathlib.Path]) -> BatchSummary:
+        """Convert the files at or under ``paths`` whose contents changed."""
+        changed, removed = await asyncio.to_thread(self._changed_files, paths)
+        for name in removed:
+            self.state.forget(name)
+        names = {path: self._name(path) for path in changed}
+        for path, file_state in list(changed.items()):
+            previous = self.state.files.get(names[path])
+            if previous is not None and previous.digest == file_state.digest:
+                # saved again without changes, or touched
+                self.state.update(names[path], dataclasses.replace(file_state, completed=previous.completed))
+                del changed[path]
+
+        def on_result(result: BatchResult) -> None:
+            file_state = changed[result.job.source]
+            self.state.update(names[result.job.source], dataclasses.replace(file_state, completed=result.completed))
+
+        # destinations depend on the other inputs sharing a stem with a changed file
+        parents = {path.parent for path in changed}
+        siblings = {path for name in self.state.files if (path := self.source / name).parent in parents}
+        inputs = sorted(
+            (path, input_format)
+            for path in siblings | changed.keys()
+            if (input_format := suffix_format(path, self.formats)) is not None
+        )
+        jobs = [
+            job
+            for job in plan_jobs(self.source, self.converter.output_dir, inputs, self.output_format)
+            if job.source in changed
+        ]
+        try:
+            summary = await convert_tree(self.converter, jobs, self.quiet, on_result)
+        finally:
+            await asyncio.to_thread(self.state.save)
+        return summary
+
+    async def run(self, polling: bool, poll_interval: float) -> None:
+        poller = None
+        inotify = None
+        if not polling:
+            try:
+                inotify = InotifyWatcher(self.source, self.exclude, self.notify)
+            except OSError as e:
+                print(f"inotify unavailable, polling instead: {e}", file=sys.stderr)
+        if inotify is None:
+            poller = await asyncio.to_thread(
+                PollingWatcher, self.source, self.exclude, self.formats, poll_interval, self.notify
+            )
+        poll_task = None
+        try:
+            if inotify is not None:
+                inotify.start()
+            else:
+                poll_task = asyncio.create_task(poller.run())
+            self._report(await self.sync([self.source]))
+            while True:
+                self._report(await self.sync(await self.changes()))
+        finally:
+            if poll_task is not None:
+                poll_task.cancel()
+            if inotify is not None:
+                inotify.close()
+
+    def _report(self, summary: BatchSummary) -> None:
+        if summary.converted or summary.skipped or summary.failed:
+            print(summary.report(), flush=True)
+
+
+def state_key(converter: BatchConverter) -> str:
+    """Fingerprint of what the outputs depend on besides the contents of their inputs."""
+    return fingerprint(
+        importlib.metadata.version("libresvip"),
+        converter.output_plugin.info.suffix,
+        converter.output_plugin.version,
+        converter.output_options,
+        converter.input_options,
+        [[step.identifier, step.options] for step in converter.pipeline.steps],
+        converter.max_track_count,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="LibreSVIP Tauri watch folder")
+    add_arguments(parser)
+    # outputs of files changed since are replaced
+    parser.set_defaults(conflict_policy="overwrite")
+    parser.add_argument("--state", type=pathlib.Path, help=f"File keeping the content hashes of converted files, {_STATE_NAME} in the output directory by default")
+    parser.add_argument("--debounce-ms", type=int, default=500, help="Milliseconds without changes before changed files are converted")
+    parser.add_argument("--max-delay-ms", type=int, default=5000, help="Milliseconds after which files that keep changing are converted anyway")
+    parser.add_argument("--poll-interval-ms", type=int, default=2000, help="Milliseconds between scans of the tree when polling")
+    parser.add_argument("--polling", action="store_true", help="Poll the tree even where inotify is available")
+    parser.add_argument("--once", action="store_true", help="Convert the files changed since the last run, then exit")
+    args = parser.parse_args(argv)
+    if not args.source.is_dir():
+        parser.error(f"{args.source} is not a directory")
+    try:
+        formats = input_formats(args.inputs)
+    except KeyError as e:
+        parser.error(f"{e.args[0]} cannot be read")
+    source = args.source.absolute()
+    engine = create_engine(args)
+    try:
+        converter = build_converter(args, parser, engine)
+        state = WatchState(args.state or converter.output_dir / _STATE_NAME, state_key(converter))
+        watcher = FolderWatcher(
+            converter,
+            source,
+            formats,
+            args.to,
+            state,
+            args.debounce_ms / 1000,
+            args.max_delay_ms / 1000,
+            args.quiet,
+        )
+        with LibreSVIPSettingsContainer.state.override_context_sync(converter.settings):
+            if args.once:
+                summary = asyncio.run(watcher.sync([source]))
+                print(summary.report())
+                return 1 if summary.failed else 0
+            asyncio.run(watcher.run(args.polling, args.poll_interval_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+import asyncio
+import unittest
+
+from libresvip_tauri.cancellation import CancelScope
+from libresvip_tauri.config import ExecutorKind
+from libresvip_tauri.engine import ConversionEngine
+
+
+class CancelScopeTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.engine = ConversionEngine(ExecutorKind.THREAD, 1)
+        self.addCleanup(self.engine.shutdown)
+
+    async def test_cancel_sets_the_events_of_groups(self) -> None:
+        scope = CancelScope(self.engine)
+        first = await scope.event("a")
+        second = await scope.event("b")
+        self.assertEqual(scope.cancel(["a"]), ["a"])
+        self.assertTrue(first.is_set())
+        self.assertFalse(second.is_set())
+        self.assertEqual(scope.cancel(), ["a", "b"])
+        self.assertTrue(second.is_set())
+
+    async def test_event_of_a_cancelled_group_starts_set(self) -> None:
+        scope = CancelScope(self.engine)
+        scope.cancel(["a"])
+        self.assertTrue((await scope.event("a")).is_set())
+        self.assertFalse((await scope.event("b")).is_set())
+
+    async def test_wait_returns_once_cancelled(self) -> None:
+        scope = CancelScope(self.engine)
+        waiter = asyncio.create_task(scope.wait("a"))
+        scope.cancel(["b"])
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+        scope.cancel()
+        await asyncio.wait_for(waiter, 1)
+
+    async def test_running_call_is_told_to_stop(self) -> None:
+        scope = CancelScope(self.engine)
+        event = await scope.event("a")
+        call = asyncio.create_task(self.engine.run(None, event.wait, 5, cancel_event=event))
+        await asyncio.sleep(0.05)
+        call.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await call
+        self.assertTrue(event.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
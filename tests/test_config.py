@@ -0,0 +1,35 @@
+import os
+import unittest
+from unittest import mock
+
+from libresvip_tauri.config import ExecutorKind, ServerConfig
+
+
+class ServerConfigTest(unittest.TestCase):
+    def from_env(self, **environ: str) -> ServerConfig:
+        with mock.patch.dict(os.environ, environ):
+            return ServerConfig.from_env()
+
+    def test_defaults(self) -> None:
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertEqual(ServerConfig.from_env(), ServerConfig())
+
+    def test_integers(self) -> None:
+        config = self.from_env(LIBRESVIP_TAURI_QUEUE_SIZE="8", LIBRESVIP_TAURI_EXECUTOR="process")
+        self.assertEqual((config.queue_size, config.executor), (8, ExecutorKind.PROCESS))
+
+    def test_zero_is_not_the_default(self) -> None:
+        config = self.from_env(
+            LIBRESVIP_TAURI_PROGRESS_INTERVAL_MS="0", LIBRESVIP_TAURI_PROJECT_CACHE_MAX_BYTES="0"
+        )
+        self.assertEqual((config.progress_interval_ms, config.project_cache_max_bytes), (0, 0))
+
+    def test_empty_is_the_default(self) -> None:
+        self.assertEqual(self.from_env(LIBRESVIP_TAURI_STAGING_TTL="").staging_ttl, ServerConfig.staging_ttl)
+
+    def test_empty_list(self) -> None:
+        self.assertEqual(self.from_env(LIBRESVIP_TAURI_WARM_LANGUAGES="").warm_languages, ())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import asyncio
+import unittest
+
+from libresvip_tauri.fairness import FairQueue, FairStream
+
+
+class FairQueueTest(unittest.IsolatedAsyncioTestCase):
+    async def grants(self, queue: FairQueue, streams: dict[str, FairStream], count: int) -> list[str]:
+        """Queue ``count`` acquires per stream behind a held slot, then return the order they are granted in."""
+        order: list[str] = []
+
+        async def acquire(name: str) -> None:
+            await queue.acquire(streams[name])
+            order.append(name)
+
+        blocker = FairStream(1)
+        await queue.acquire(blocker)
+        tasks = [asyncio.create_task(acquire(name)) for name in streams for _ in range(count)]
+        await asyncio.sleep(0)
+        for _ in range(len(tasks) + 1):
+            queue.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return order
+
+    async def test_shares_follow_weights(self) -> None:
+        streams = {"low": FairStream(1), "high": FairStream(3)}
+        order = await self.grants(FairQueue(1), streams, 12)
+        # while both wait, the heavier stream gets three slots for each one of the other
+        self.assertEqual(order[:8].count("high"), 6)
+
+    async def test_backlog_does_not_starve_a_new_stream(self) -> None:
+        queue = FairQueue(1)
+        batch = FairStream(1)
+        await queue.acquire(batch)
+        waiters = [asyncio.create_task(queue.acquire(batch)) for _ in range(10)]
+        await asyncio.sleep(0)
+        late = asyncio.create_task(queue.acquire(FairStream(1)))
+        await asyncio.sleep(0)
+        queue.release()
+        await asyncio.sleep(0)
+        queue.release()
+        await asyncio.sleep(0)
+        self.assertTrue(late.done())
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+
+    async def test_cancelled_waiter_gives_up_its_turn(self) -> None:
+        queue = FairQueue(1)
+        stream = FairStream(1)
+        await queue.acquire(stream)
+        waiter = asyncio.create_task(queue.acquire(stream))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        queue.release()
+        await asyncio.wait_for(queue.acquire(stream), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
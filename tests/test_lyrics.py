@@ -0,0 +1,46 @@
+import os
+import pathlib
+import pickle
+import subprocess
+import sys
+import unittest
+
+from libresvip.core.config import LibreSvipBaseUISettings
+
+from libresvip_tauri.libresvip_tauri_pb import LyricsReplacement
+from libresvip_tauri.lyrics import CompiledLyricsReplacement, compile_rule
+
+_UNPICKLE = """
+import pickle, sys
+settings = pickle.load(sys.stdin.buffer)
+print(type(settings.lyric_replace_rules["default"][0]).__module__)
+print("libresvip_tauri.service" in sys.modules)
+"""
+
+
+class CompiledLyricsReplacementTest(unittest.TestCase):
+    def test_compile_rule(self) -> None:
+        rule = compile_rule(LyricsReplacement(pattern_main="a+", replacement="b"))
+        self.assertIsInstance(rule, CompiledLyricsReplacement)
+        self.assertIs(rule.compiled_pattern, rule.compiled_pattern)
+        self.assertTrue(rule.compiled_pattern.fullmatch("AA"))
+
+    def test_unpickled_by_workers_without_the_service(self) -> None:
+        # process workers unpickle the request settings with their rules
+        settings = LibreSvipBaseUISettings.model_construct(
+            lyric_replace_rules={"default": [compile_rule(LyricsReplacement(pattern_main="a"))]}
+        )
+        root = pathlib.Path(__file__).resolve().parent.parent
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(root), os.environ.get("PYTHONPATH")])))
+        output = subprocess.run(
+            [sys.executable, "-c", _UNPICKLE],
+            input=pickle.dumps(settings),
+            capture_output=True,
+            check=True,
+            env=env,
+        ).stdout.decode().split()
+        self.assertEqual(output, ["libresvip_tauri.lyrics", "False"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import pathlib
+import tempfile
+import unittest
+
+from upath import UPath
+
+from libresvip_tauri.output_cache import OutputCache
+
+
+class OutputCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = pathlib.Path(tmp.name)
+        self.root = str(self.dir / "cache")
+        (self.dir / "staged").mkdir()
+
+    def staged(self, name: str, data: bytes) -> UPath:
+        path = UPath(self.dir / "staged" / name)
+        path.write_bytes(data)
+        return path
+
+    def store(self, cache: OutputCache, key: str, data: bytes) -> None:
+        writer = cache.writer(key)
+        writer.add_staged(self.staged(key, data))
+        writer.commit(["warned"])
+
+    def test_restore_stored_output(self) -> None:
+        cache = OutputCache(self.root, 1024)
+        key = cache.key(["digest"], "svp", "{}")
+        self.assertIsNone(cache.restore(key, UPath(self.dir / "miss")))
+        self.store(cache, key, b"output")
+        dst = UPath(self.dir / "restored")
+        cached = cache.restore(key, dst)
+        self.assertEqual((cached.warning_messages, cached.output_bytes, cached.part_count), (["warned"], 6, 0))
+        self.assertEqual(dst.read_bytes(), b"output")
+        self.assertEqual((cache.stats.hits, cache.stats.misses, cache.stats.stores), (1, 1, 1))
+
+    def test_keys_depend_on_inputs_and_options(self) -> None:
+        cache = OutputCache(self.root, 1024)
+        key = cache.key(["digest"], "svp", "{}")
+        self.assertEqual(key, cache.key(["digest"], "svp", "{}"))
+        self.assertNotEqual(key, cache.key(["other"], "svp", "{}"))
+        self.assertNotEqual(key, cache.key(["digest"], "svp", '{"a": 1}'))
+
+    def test_restore_split_output(self) -> None:
+        cache = OutputCache(self.root, 1024)
+        src = UPath(self.dir / "staged" / "split")
+        src.mkdir()
+        for i in range(2):
+            (src / str(i)).write_bytes(b"part")
+        writer = cache.writer("split")
+        writer.add_staged(src)
+        writer.commit([], split=True)
+        dst = UPath(self.dir / "restored")
+        self.assertEqual(cache.restore("split", dst).part_count, 2)
+        self.assertEqual(sorted(path.name for path in dst.iterdir()), ["0", "1"])
+
+    def test_corrupted_entry_is_dropped(self) -> None:
+        cache = OutputCache(self.root, 1024)
+        self.store(cache, "key", b"output")
+        (cache._entry_path("key") / "output").write_bytes(b"tampered")
+        self.assertIsNone(cache.restore("key", UPath(self.dir / "restored")))
+        self.assertEqual((cache.stats.corrupted, cache.stats.entries), (1, 0))
+
+    def test_least_recently_used_evicted(self) -> None:
+        cache = OutputCache(self.root, 10)
+        self.store(cache, "a", b"aaaa")
+        self.store(cache, "b", b"bbbb")
+        cache.restore("a", UPath(self.dir / "restored"))
+        self.store(cache, "c", b"cccc")
+        self.assertIsNone(cache.restore("b", UPath(self.dir / "b")))
+        self.assertIsNotNone(cache.restore("a", UPath(self.dir / "a")))
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_entries_survive_a_restart(self) -> None:
+        self.store(OutputCache(self.root, 1024), "key", b"output")
+        cache = OutputCache(self.root, 1024)
+        self.assertIsNotNone(cache.restore("key", UPath(self.dir / "restored")))
+        # a lower cap applies to what an earlier run left
+        cache = OutputCache(self.root, 1)
+        self.assertIsNone(cache.restore("key", UPath(self.dir / "again")))
+        self.assertEqual(cache.stats.evictions, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
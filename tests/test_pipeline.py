@@ -0,0 +1,16 @@
+import unittest
+
+from libresvip_tauri.pipeline import build_pipeline
+
+
+class BuildPipelineTest(unittest.TestCase):
+    def test_unknown_middleware_is_skipped_with_a_warning(self) -> None:
+        pipeline = build_pipeline({"no_such_middleware": "{}"})
+        self.assertEqual(pipeline.steps, ())
+        self.assertEqual(pipeline.unknown, ("no_such_middleware",))
+        self.assertEqual(len(pipeline.warning_messages), 1)
+        self.assertIn("no_such_middleware", pipeline.warning_messages[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
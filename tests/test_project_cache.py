@@ -0,0 +1,99 @@
+import pathlib
+import tempfile
+import unittest
+from typing import Any
+from unittest import mock
+
+from libresvip.model.base import Project, SingingTrack
+
+from libresvip_tauri import project_cache
+from libresvip_tauri.project_cache import ProjectCache
+
+
+class _Plugin:
+    name = "test"
+    version = "1.0"
+    loads: list[pathlib.Path] = []
+
+    @classmethod
+    def load(cls, path: pathlib.Path, options: dict[str, Any]) -> Project:
+        cls.loads.append(path)
+        return Project(track_list=[SingingTrack(title=path.read_bytes().decode())])
+
+
+class ProjectCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = pathlib.Path(tmp.name)
+        _Plugin.loads = []
+
+    def write(self, name: str, content: str) -> pathlib.Path:
+        path = self.dir / name
+        path.write_text(content)
+        return path
+
+    def test_hit_returns_a_fresh_project(self) -> None:
+        cache = ProjectCache(1024)
+        path = self.write("a", "song")
+        project, _ = cache.load(_Plugin, path, {})
+        project.track_list.clear()
+        project, _ = cache.load(_Plugin, path, {})
+        self.assertEqual(project.track_list[0].title, "song")
+        self.assertEqual(len(_Plugin.loads), 1)
+        self.assertEqual((cache.stats.hits, cache.stats.misses, cache.stats.bytes), (1, 1, 4))
+
+    def test_unchanged_file_is_not_hashed_again(self) -> None:
+        cache = ProjectCache(1024)
+        path = self.write("a", "song")
+        with mock.patch.object(project_cache, "file_digest", wraps=project_cache.file_digest) as digest:
+            cache.load(_Plugin, path, {})
+            cache.load(_Plugin, path, {})
+        self.assertEqual(digest.call_count, 1)
+
+    def test_copy_shares_the_entry(self) -> None:
+        cache = ProjectCache(1024)
+        cache.load(_Plugin, self.write("a", "song"), {})
+        cache.load(_Plugin, self.write("b", "song"), {})
+        self.assertEqual(len(_Plugin.loads), 1)
+
+    def test_modified_file_is_loaded_again(self) -> None:
+        cache = ProjectCache(1024)
+        path = self.write("a", "song")
+        cache.load(_Plugin, path, {})
+        path.write_text("other song")
+        project, _ = cache.load(_Plugin, path, {})
+        self.assertEqual(project.track_list[0].title, "other song")
+        self.assertEqual(len(_Plugin.loads), 2)
+
+    def test_other_options_miss(self) -> None:
+        cache = ProjectCache(1024)
+        path = self.write("a", "song")
+        cache.load(_Plugin, path, {})
+        cache.load(_Plugin, path, {"option": 1})
+        self.assertEqual(len(_Plugin.loads), 2)
+
+    def test_bounded_by_input_bytes(self) -> None:
+        cache = ProjectCache(10)
+        first = self.write("a", "aaaaaa")
+        cache.load(_Plugin, first, {})
+        cache.load(_Plugin, self.write("b", "bbbbbb"), {})
+        self.assertEqual((cache.stats.entries, cache.stats.bytes, cache.stats.evictions), (1, 6, 1))
+        cache.load(_Plugin, first, {})
+        self.assertEqual(len(_Plugin.loads), 3)
+
+    def test_larger_inputs_are_not_cached(self) -> None:
+        cache = ProjectCache(3)
+        cache.load(_Plugin, self.write("a", "song"), {})
+        self.assertEqual(cache.stats.entries, 0)
+
+    def test_disabled(self) -> None:
+        cache = ProjectCache(0)
+        path = self.write("a", "song")
+        cache.load(_Plugin, path, {})
+        cache.load(_Plugin, path, {})
+        self.assertEqual(len(_Plugin.loads), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from libresvip_tauri.libresvip_tauri_pb import SingleConversionResult
+from libresvip_tauri.singleflight import SingleFlight
+
+
+class SingleFlightTest(unittest.IsolatedAsyncioTestCase):
+    async def test_follower_joins_before_first_output(self) -> None:
+        flights = SingleFlight()
+        with flights.lead("key", "leader", ["t"]) as flight:
+            follower = flights.follow("key", "follower", ["u"])
+            self.assertIsNotNone(follower)
+            # progress events do not end joining
+            flight.publish(SingleConversionResult(group_id="leader", running=True, progress=0.5))
+            self.assertIsNotNone(flights.follow("key", "other", ["v"]))
+            self.assertIn(follower, flight.publish(SingleConversionResult(group_id="leader", target_id="t")))
+        self.assertIsNone(await follower.results.get())
+
+    async def test_no_late_join_during_split(self) -> None:
+        flights = SingleFlight()
+        with flights.lead("key", "leader", ["t"]) as flight:
+            early = flights.follow("key", "early", ["u"])
+            part = SingleConversionResult(
+                group_id="leader", target_id="t", running=True, completed=True, part_index=0, part_count=12
+            )
+            self.assertEqual(flight.publish(part), [early])
+            # part 0 is already out, a follower joining now would never get it
+            self.assertIsNone(flights.follow("key", "late", ["v"]))
+            self.assertEqual(early.relabel(part).group_id, "early")
+            self.assertEqual(early.relabel(part).target_id, "u")
+
+    async def test_cancelled_result_ends_joining(self) -> None:
+        flights = SingleFlight()
+        with flights.lead("key", "leader", ["t"]) as flight:
+            flight.publish(SingleConversionResult(group_id="leader", running=True, cancelled=True))
+            self.assertIsNone(flights.follow("key", "late", ["u"]))
+        self.assertEqual(len(flights), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import time
+import unittest
+
+from libresvip_tauri.config import ServerConfig
+from libresvip_tauri.staging import StagingJanitor, create_staging_root, remove_staged
+
+
+class StagingFileSystemTest(unittest.TestCase):
+    def test_large_outputs_spill_to_disk(self) -> None:
+        root = create_staging_root(ServerConfig(spill_threshold=10, memory_budget=15), False)
+        (root / "small").write_bytes(b"s" * 10)
+        (root / "large").write_bytes(b"l" * 20)
+        # within the threshold, but beyond what is left of the budget
+        (root / "over").write_bytes(b"o" * 8)
+        self.assertEqual(root.fs.memory_bytes, 10)
+        self.assertEqual(len(list(root.fs.spill_dir.iterdir())), 2)
+        self.assertEqual((root / "large").read_bytes(), b"l" * 20)
+        self.assertEqual((root / "over").read_bytes(), b"o" * 8)
+        remove_staged(root / "small")
+        remove_staged(root / "large")
+        self.assertEqual(root.fs.memory_bytes, 0)
+        self.assertEqual(len(list(root.fs.spill_dir.iterdir())), 1)
+
+
+class StagingJanitorTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = create_staging_root(ServerConfig(), True)
+
+    def stage(self, name: str, size: int) -> None:
+        (self.root / name).write_bytes(b"x" * size)
+
+    def staged(self) -> list[str]:
+        return sorted(path.name for path in self.root.iterdir())
+
+    def test_oldest_evicted_over_max_bytes(self) -> None:
+        janitor = StagingJanitor(self.root, ttl=60, max_bytes=100)
+        self.stage("a", 60)
+        janitor.sweep()
+        self.stage("b", 60)
+        janitor.sweep()
+        self.assertEqual(self.staged(), ["b"])
+        self.assertEqual((janitor.evicted_entries, janitor.evicted_bytes), (1, 60))
+
+    def test_pinned_entries_are_kept(self) -> None:
+        janitor = StagingJanitor(self.root, ttl=0, max_bytes=0)
+        self.stage("a", 10)
+        janitor.pin("a")
+        janitor.pin("a")
+        janitor.unpin("a")
+        janitor.sweep()
+        self.assertEqual(self.staged(), ["a"])
+        janitor.unpin("a")
+        self.assertEqual(janitor.pins("a"), 0)
+        janitor.sweep()
+        self.assertEqual(self.staged(), [])
+
+    def test_held_entries_only_expire(self) -> None:
+        janitor = StagingJanitor(self.root, ttl=0.2, max_bytes=50)
+        self.stage("done", 60)
+        janitor.hold("done")
+        janitor.sweep()
+        self.stage("other", 60)
+        janitor.sweep()
+        # a converted output waiting for MoveFile outlives the size limit
+        self.assertEqual(self.staged(), ["done"])
+        time.sleep(0.3)
+        janitor.sweep()
+        self.assertEqual(self.staged(), [])
+
+    def test_hold_forgotten_once_gone(self) -> None:
+        janitor = StagingJanitor(self.root, ttl=60, max_bytes=50)
+        janitor.hold("done")
+        janitor.sweep()
+        self.stage("done", 60)
+        janitor.sweep()
+        self.assertEqual(self.staged(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()